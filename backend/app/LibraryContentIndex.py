@@ -0,0 +1,297 @@
+import fcntl
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.utils.worker_processes import worker_context
+from data.arabic_text import normalize_arabic
+from data.document_text import extract_pages, file_hash, is_extractable
+from data.search_index import InvertedIndex
+
+# Characters of context kept around the first match in a snippet
+SNIPPET_CHARS = 160
+
+# Matching pages returned per file
+MAX_PAGES_PER_FILE = 3
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == 'ـ' or unicodedata.category(char) == 'Mn'
+
+
+def highlight_snippet(text: str, terms: List[str], width: int = SNIPPET_CHARS) -> Dict[str, Any]:
+    """
+    Excerpt of a page around the first occurrence of any query term.
+
+    Terms are matched on the normalized text (as the index does) and mapped
+    back to the original characters, so diacritics and hamza variants in the
+    page do not break highlighting. A highlight covers the whole word the
+    term was found in (e.g. "الضمان" for the stemmed term "ضمان").
+
+    Returns:
+        {'text': excerpt, 'highlights': [[start, end], ...]} with offsets into the excerpt
+    """
+    normalized, offsets = [], []
+    for position, char in enumerate(text):
+        for folded in normalize_arabic(char):
+            normalized.append(folded)
+            offsets.append(position)
+    normalized = ''.join(normalized)
+
+    matches = []
+    for term in terms:
+        start = normalized.find(term)
+        while start != -1 and term:
+            word_start, word_end = offsets[start], offsets[start + len(term) - 1] + 1
+            while word_start > 0 and _is_word_char(text[word_start - 1]):
+                word_start -= 1
+            while word_end < len(text) and _is_word_char(text[word_end]):
+                word_end += 1
+            matches.append((word_start, word_end))
+            start = normalized.find(term, start + len(term))
+    if not matches:
+        return {'text': ' '.join(text[:width].split()), 'highlights': []}
+
+    matches.sort()
+    window_start = max(0, matches[0][0] - width // 4)
+    window_end = min(len(text), window_start + width)
+    highlights, last_end = [], -1
+    for start, end in matches:
+        if start >= window_end:
+            break
+        if start < last_end:
+            continue
+        highlights.append([start - window_start, min(end, window_end) - window_start])
+        last_end = end
+    # Newlines and tabs become spaces so the offsets stay valid
+    excerpt = ''.join(' ' if char.isspace() else char for char in text[window_start:window_end])
+    return {'text': excerpt, 'highlights': highlights}
+
+
+class LibraryContentIndex:
+    """
+    Full-text index of the text inside library PDF, DOCX and XLSX files.
+
+    A background thread follows the metadata index (LibraryIndex.version):
+    new or changed files are hashed, files whose SHA-256 has no stored text
+    are extracted in a process pool (data.document_text.extract_pages), and
+    the text is stored per page in SQLite keyed by hash, so restarts, renames
+    and moves do not extract again. Pages are indexed in an InvertedIndex
+    (Arabic-normalized BM25) that is swapped in when a sync finishes.
+
+    When several processes share the database, an exclusive lock file lets
+    one of them extract while the others only load the stored text.
+    """
+
+    def __init__(self, library_index, db_path: str, workers: int = 2, poll_interval: float = 30):
+        self.library_index = library_index
+        self.db_path = db_path
+        self.workers = max(1, workers)
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._index: Optional[InvertedIndex] = None
+        self._pages: List[Tuple[str, int, str]] = []
+        self._synced_version = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.extracted = 0
+        self.failed = 0
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS library_files ("
+                "file_id TEXT PRIMARY KEY, sha256 TEXT NOT NULL, size INTEGER, mtime REAL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS library_documents ("
+                "sha256 TEXT PRIMARY KEY, pages INTEGER, error TEXT, extracted_at REAL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS library_pages ("
+                "sha256 TEXT, page INTEGER, text TEXT, PRIMARY KEY (sha256, page))"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    @property
+    def ready(self) -> bool:
+        return self._index is not None
+
+    def start(self):
+        """Start the background sync thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='library-text-indexer', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while True:
+            if self.library_index.ready and self.library_index.version != self._synced_version:
+                try:
+                    self.sync()
+                except Exception as e:
+                    print(f"Error indexing library text: {str(e)}")
+            if self._stop.wait(self.poll_interval):
+                return
+
+    def _file_hashes(self, conn: sqlite3.Connection, files: List[Dict[str, Any]]) -> Dict[str, str]:
+        """file_id -> SHA-256, hashing only files whose size or mtime changed"""
+        known = {row[0]: row[1:] for row in conn.execute("SELECT file_id, sha256, size, mtime FROM library_files")}
+        hashes = {}
+        for record in files:
+            stored = known.get(record['id'])
+            if stored and stored[1] == record['size'] and stored[2] == record['mtime']:
+                hashes[record['id']] = stored[0]
+                continue
+            try:
+                sha256 = file_hash(os.path.join(self.library_index.root_folder_path, record['id']))
+            except OSError as e:
+                print(f"Error hashing library file {record['id']}: {str(e)}")
+                continue
+            conn.execute("INSERT OR REPLACE INTO library_files VALUES (?, ?, ?, ?)",
+                         (record['id'], sha256, record['size'], record['mtime']))
+            hashes[record['id']] = sha256
+        removed = set(known) - set(hashes)
+        conn.executemany("DELETE FROM library_files WHERE file_id = ?", [(file_id,) for file_id in removed])
+        conn.commit()
+        return hashes
+
+    def _store(self, conn: sqlite3.Connection, sha256: str, file_id: str, future):
+        try:
+            pages = future.result()
+            error = None
+            self.extracted += 1
+        except BrokenProcessPool:
+            # A crashed worker says nothing about this file: retried on the next sync
+            raise
+        except Exception as e:
+            pages, error = [], str(e)
+            self.failed += 1
+            print(f"Error extracting text from {file_id}: {error}")
+        # Failures are stored too, so a broken file is not retried on every sync
+        conn.executemany("INSERT OR REPLACE INTO library_pages VALUES (?, ?, ?)",
+                         [(sha256, number, text) for number, text in enumerate(pages, start=1) if text])
+        conn.execute("INSERT OR REPLACE INTO library_documents VALUES (?, ?, ?, ?)",
+                     (sha256, len(pages), error, time.time()))
+        conn.commit()
+
+    def _extract(self, conn: sqlite3.Connection, pending: Dict[str, str]):
+        """
+        Extract the text of files (sha256 -> file_id) in the process pool and store it.
+        At most one file per worker is in flight, so stop() (or interpreter exit)
+        only waits for the files being extracted.
+        """
+        queue = list(pending.items())
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=worker_context()) as pool:
+            running = {}
+            while queue or running:
+                while queue and len(running) < self.workers and not self._stop.is_set():
+                    sha256, file_id = queue.pop()
+                    path = os.path.join(self.library_index.root_folder_path, file_id)
+                    running[pool.submit(extract_pages, path)] = (sha256, file_id)
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    sha256, file_id = running.pop(future)
+                    self._store(conn, sha256, file_id, future)
+
+    def sync(self):
+        """Bring the stored text and the index up to date with the metadata index"""
+        started = time.perf_counter()
+        version = self.library_index.version
+        files = [record for record in self.library_index.files() if is_extractable(record['name'])]
+        with self._connect() as conn, open(self.db_path + '.lock', 'w') as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                owner = True
+            except OSError:
+                owner = False
+
+            if owner:
+                hashes = self._file_hashes(conn, files)
+                done = {row[0] for row in conn.execute("SELECT sha256 FROM library_documents")}
+                pending = {sha256: file_id for file_id, sha256 in hashes.items() if sha256 not in done}
+                if pending:
+                    # Make already extracted text searchable while the rest is extracted
+                    if not self.ready:
+                        self._build(conn)
+                    print(f"Extracting text from {len(pending)} library files with {self.workers} workers")
+                    self._extract(conn, pending)
+                conn.execute("DELETE FROM library_pages WHERE sha256 NOT IN (SELECT sha256 FROM library_files)")
+                conn.execute("DELETE FROM library_documents WHERE sha256 NOT IN (SELECT sha256 FROM library_files)")
+                conn.commit()
+            self._build(conn)
+        # Another process is extracting: load its results on the next poll
+        self._synced_version = version if owner else None
+        print(f"Library text index built: {len(self._pages)} pages in {time.perf_counter() - started:.2f}s")
+
+    def _build(self, conn: sqlite3.Connection):
+        rows = conn.execute(
+            "SELECT f.file_id, p.page, p.text FROM library_files f "
+            "JOIN library_pages p ON p.sha256 = f.sha256 ORDER BY f.file_id, p.page"
+        ).fetchall()
+        index = InvertedIndex(field_boosts={'content': 1.0})
+        for position, (file_id, page, text) in enumerate(rows):
+            index.add(position, {'content': text})
+        with self._lock:
+            self._index, self._pages = index, rows
+
+    def search(self, query: str, folder_id: Optional[str] = None, recursive: bool = True,
+               limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Files whose text contains every query term, best BM25 page first.
+
+        Returns:
+            [{'id': file_id, 'score': best page score, 'matches': [{'page', 'text', 'highlights'}]}]
+        """
+        with self._lock:
+            index, pages = self._index, self._pages
+        if index is None:
+            return []
+        candidates = index.lookup(query)
+        if not candidates:
+            return []
+
+        folder_id = folder_id or ''
+        prefix = folder_id + os.sep if folder_id else ''
+
+        def in_scope(file_id: str) -> bool:
+            if recursive:
+                return file_id.startswith(prefix)
+            return os.path.dirname(file_id) == folder_id
+
+        terms = index.query_terms(query)
+        files: Dict[str, Dict[str, Any]] = {}
+        for position, score in index.top_k(query, candidates, len(candidates)):
+            file_id, page, text = pages[position]
+            if not in_scope(file_id):
+                continue
+            result = files.get(file_id)
+            if result is None:
+                if len(files) >= limit:
+                    continue
+                result = files[file_id] = {'id': file_id, 'score': round(score, 4), 'matches': []}
+            if len(result['matches']) < MAX_PAGES_PER_FILE:
+                result['matches'].append({'page': page, **highlight_snippet(text, terms)})
+        return list(files.values())
+
+    def stats(self) -> Dict[str, Any]:
+        with self._connect() as conn:
+            documents, failed = conn.execute(
+                "SELECT COUNT(*), COUNT(error) FROM library_documents"
+            ).fetchone()
+        return {
+            'ready': self.ready,
+            'documents': documents,
+            'failedDocuments': failed,
+            'indexedPages': len(self._pages),
+            'extractedThisProcess': self.extracted
+        }
@@ -0,0 +1,350 @@
+import base64
+import bisect
+import json
+import mimetypes
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from data.arabic_text import normalize_arabic, stem_tokens
+
+FOLDER_MIME_TYPE = 'application/vnd.google-apps.folder'
+
+# Typed sort key per listing sort field; ties are broken by id so the order is total
+SORT_KEYS = {
+    'name': lambda record: record['name'].lower(),
+    'size': lambda record: record['size'],
+    'createdTime': lambda record: record['ctime'],
+    'modifiedTime': lambda record: record['mtime'],
+}
+
+
+def encode_cursor(sort_by: str, sort_order: str, folder_id: str, key: Any, entry_id: str) -> str:
+    """Opaque cursor pointing just after an entry of a sorted folder listing"""
+    payload = json.dumps([sort_by, sort_order, folder_id, key, entry_id], ensure_ascii=False)
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str, str, Any, str]:
+    """
+    Raises:
+        ValueError: When the cursor is malformed
+    """
+    try:
+        payload = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        sort_by, sort_order, folder_id, key, entry_id = json.loads(payload.decode('utf-8'))
+    except Exception:
+        raise ValueError('Invalid cursor')
+    return sort_by, sort_order, folder_id, key, entry_id
+
+
+class LibraryIndex:
+    """
+    In-memory metadata index of the library folder tree.
+
+    Every file and folder is kept with its id (path relative to the root),
+    parent folder, size, MIME type and times, and its name is indexed by
+    normalized, article-stripped tokens (data.arabic_text). Listing a folder
+    and searching names are dictionary lookups; the filesystem is only read by
+    refresh(), which a polling watcher thread calls every poll_interval
+    seconds and which swaps in the new snapshot atomically.
+
+    With db_path the snapshot is also stored in SQLite, so a restart serves
+    the previous snapshot right away and rescans in the background.
+    """
+
+    def __init__(self, root_folder_path: str, poll_interval: float = 30, db_path: Optional[str] = None):
+        self.root_folder_path = os.path.abspath(root_folder_path)
+        self.poll_interval = poll_interval
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._children: Dict[str, List[str]] = {}
+        self._tokens: Dict[str, Set[str]] = {}
+        self._vocabulary: List[str] = []
+        # (version, folder_id, sort_by) -> ascending [(sort key, id)], built on first use
+        self._sorted: Dict[Tuple[int, str, str], List[Tuple[Any, str]]] = {}
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.ready = False
+        # Incremented on every new snapshot, so dependents can tell when to resync
+        self.version = 0
+        self.last_refresh: Optional[float] = None
+        if db_path:
+            with sqlite3.connect(db_path) as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS library_entries ("
+                    "id TEXT PRIMARY KEY, parent TEXT, name TEXT, is_folder INTEGER, "
+                    "size INTEGER, mime_type TEXT, ctime REAL, mtime REAL)"
+                )
+
+    def start(self):
+        """Load (or build) the index and start the polling watcher"""
+        if self.db_path and self._load():
+            print(f"Library index loaded {len(self._records)} entries from {self.db_path}")
+            refresh_now = True
+        else:
+            self.refresh()
+            refresh_now = False
+        if self.poll_interval and self.poll_interval > 0 and self._watcher is None:
+            self._watcher = threading.Thread(target=self._watch, args=(refresh_now,),
+                                             name='library-index-watcher', daemon=True)
+            self._watcher.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _watch(self, refresh_now: bool):
+        if refresh_now:
+            self._safe_refresh()
+        while not self._stop.wait(self.poll_interval):
+            self._safe_refresh()
+
+    def _safe_refresh(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            print(f"Error refreshing library index: {str(e)}")
+
+    def _scan(self) -> Dict[str, Dict[str, Any]]:
+        records = {}
+        pending = ['']
+        while pending:
+            folder_id = pending.pop()
+            try:
+                with os.scandir(os.path.join(self.root_folder_path, folder_id)) as entries:
+                    for entry in entries:
+                        try:
+                            stats = entry.stat()
+                            is_folder = entry.is_dir()
+                        except OSError:
+                            continue
+                        entry_id = os.path.join(folder_id, entry.name) if folder_id else entry.name
+                        records[entry_id] = {
+                            'id': entry_id,
+                            'parent': folder_id,
+                            'name': entry.name,
+                            'isFolder': is_folder,
+                            'size': 0 if is_folder else stats.st_size,
+                            'mimeType': FOLDER_MIME_TYPE if is_folder
+                            else mimetypes.guess_type(entry.name)[0] or 'application/octet-stream',
+                            'ctime': stats.st_ctime,
+                            'mtime': stats.st_mtime
+                        }
+                        if is_folder:
+                            pending.append(entry_id)
+            except OSError as e:
+                if folder_id:
+                    print(f"Error scanning library folder {folder_id}: {str(e)}")
+        return records
+
+    def _install(self, records: Dict[str, Dict[str, Any]]):
+        children: Dict[str, List[str]] = {}
+        tokens: Dict[str, Set[str]] = {}
+        for entry_id, record in records.items():
+            record['normalizedName'] = normalize_arabic(record['name'])
+            children.setdefault(record['parent'], []).append(entry_id)
+            for token in stem_tokens(record['name']):
+                tokens.setdefault(token, set()).add(entry_id)
+        with self._lock:
+            self._records, self._children, self._tokens = records, children, tokens
+            self._vocabulary = sorted(tokens)
+            self._sorted = {}
+            self.ready = True
+            self.version += 1
+
+    def refresh(self) -> bool:
+        """
+        Rescan the library folder and swap in the new snapshot.
+
+        Returns:
+            bool: Whether anything changed since the previous snapshot
+        """
+        started = time.perf_counter()
+        records = self._scan()
+        changed = self._signature(records) != self._signature(self._records)
+        if changed or not self.ready:
+            self._install(records)
+            if self.db_path:
+                self._save(records)
+            print(f"Library index built: {len(records)} entries in {time.perf_counter() - started:.2f}s")
+        self.last_refresh = time.time()
+        return changed
+
+    @staticmethod
+    def _signature(records: Dict[str, Dict[str, Any]]) -> Dict[str, tuple]:
+        return {entry_id: (record['size'], record['mtime'], record['isFolder']) for entry_id, record in records.items()}
+
+    def _load(self) -> bool:
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                rows = conn.execute(
+                    "SELECT id, parent, name, is_folder, size, mime_type, ctime, mtime FROM library_entries"
+                ).fetchall()
+        except sqlite3.Error as e:
+            print(f"Error loading library index: {str(e)}")
+            return False
+        if not rows:
+            return False
+        self._install({
+            row[0]: {'id': row[0], 'parent': row[1], 'name': row[2], 'isFolder': bool(row[3]), 'size': row[4],
+                     'mimeType': row[5], 'ctime': row[6], 'mtime': row[7]}
+            for row in rows
+        })
+        return True
+
+    def _save(self, records: Dict[str, Dict[str, Any]]):
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute("DELETE FROM library_entries")
+                conn.executemany(
+                    "INSERT INTO library_entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(r['id'], r['parent'], r['name'], int(r['isFolder']), r['size'], r['mimeType'], r['ctime'],
+                      r['mtime']) for r in records.values()]
+                )
+        except sqlite3.Error as e:
+            print(f"Error saving library index: {str(e)}")
+
+    @staticmethod
+    def to_file_info(record: Dict[str, Any]) -> Dict[str, Any]:
+        """A record in the Google Drive-like format returned by LocalDriveLibrary"""
+        return {
+            'id': record['id'],
+            'name': record['name'],
+            'mimeType': record['mimeType'],
+            'size': str(record['size']),
+            'createdTime': datetime.fromtimestamp(record['ctime']).isoformat(),
+            'modifiedTime': datetime.fromtimestamp(record['mtime']).isoformat()
+        }
+
+    def get(self, entry_id: str) -> Optional[Dict[str, Any]]:
+        return self._records.get(entry_id or '')
+
+    def files(self) -> List[Dict[str, Any]]:
+        """Records of every file in the library"""
+        return [record for record in self._records.values() if not record['isFolder']]
+
+    def is_folder(self, folder_id: Optional[str]) -> bool:
+        """Whether folder_id is the root ('' or None) or an indexed folder"""
+        if not folder_id:
+            return True
+        record = self._records.get(folder_id)
+        return record is not None and record['isFolder']
+
+    def list_folder(self, folder_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Records of a folder's direct children"""
+        with self._lock:
+            records, children = self._records, self._children
+        return [records[entry_id] for entry_id in children.get(folder_id or '', [])]
+
+    def _sorted_children(self, folder_id: str, sort_by: str) -> Tuple[Dict[str, Dict[str, Any]], List[Tuple[Any, str]]]:
+        with self._lock:
+            records, children, version = self._records, self._children, self.version
+            cache_key = (version, folder_id, sort_by)
+            ordered = self._sorted.get(cache_key)
+            if ordered is None:
+                sort_key = SORT_KEYS[sort_by]
+                ordered = sorted((sort_key(records[entry_id]), entry_id) for entry_id in children.get(folder_id, []))
+                self._sorted[cache_key] = ordered
+        return records, ordered
+
+    def page(self, folder_id: Optional[str] = None, sort_by: str = 'name', sort_order: str = 'asc',
+             limit: int = 50, cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str], int]:
+        """
+        One page of a folder listing, sorted by a typed key (numeric size,
+        timestamps) with the id as tie-breaker.
+
+        The cursor holds the sort key and id of the last returned entry, so the
+        next page starts right after it even if entries were added or removed
+        in between: no entry that stays in the folder is skipped or repeated.
+
+        Returns:
+            (records, cursor of the next page or None on the last page, entries in the folder)
+
+        Raises:
+            ValueError: For an unknown sort field or a cursor of another listing
+        """
+        folder_id = folder_id or ''
+        if sort_by not in SORT_KEYS:
+            raise ValueError(f"Cannot sort by {sort_by}")
+        descending = sort_order.lower() == 'desc'
+        sort_order = 'desc' if descending else 'asc'
+        records, ordered = self._sorted_children(folder_id, sort_by)
+
+        if cursor:
+            cursor_sort_by, cursor_order, cursor_folder, key, entry_id = decode_cursor(cursor)
+            if (cursor_sort_by, cursor_order, cursor_folder) != (sort_by, sort_order, folder_id):
+                raise ValueError('Cursor belongs to another listing')
+            position = (key, entry_id)
+            start = bisect.bisect_left(ordered, position) - 1 if descending else bisect.bisect_right(ordered, position)
+        else:
+            start = len(ordered) - 1 if descending else 0
+
+        if descending:
+            selected = ordered[max(start - limit + 1, 0):start + 1][::-1] if start >= 0 else []
+            has_more = start - limit >= 0
+        else:
+            selected = ordered[start:start + limit]
+            has_more = start + limit < len(ordered)
+
+        next_cursor = None
+        if has_more and selected:
+            key, entry_id = selected[-1]
+            next_cursor = encode_cursor(sort_by, sort_order, folder_id, key, entry_id)
+        return [records[entry_id] for _, entry_id in selected], next_cursor, len(ordered)
+
+    def _token_matches(self, query: str) -> Optional[Set[str]]:
+        """Ids whose name has, for every query token, a token starting with it; None for a query without tokens"""
+        query_tokens = stem_tokens(query)
+        if not query_tokens:
+            return None
+        with self._lock:
+            vocabulary, tokens = self._vocabulary, self._tokens
+        matches: Optional[Set[str]] = None
+        for query_token in query_tokens:
+            ids: Set[str] = set()
+            start = bisect.bisect_left(vocabulary, query_token)
+            for token in vocabulary[start:]:
+                if not token.startswith(query_token):
+                    break
+                ids |= tokens[token]
+            matches = ids if matches is None else matches & ids
+            if not matches:
+                return set()
+        return matches
+
+    def search(self, query: str, folder_id: Optional[str] = None, recursive: bool = True) -> List[Dict[str, Any]]:
+        """
+        Records under a folder whose name contains the query (after Arabic
+        normalization) or whose name tokens start with every query token.
+        """
+        with self._lock:
+            records = self._records
+        folder_id = folder_id or ''
+        if recursive:
+            prefix = folder_id + os.sep if folder_id else ''
+            scope = [record for entry_id, record in records.items() if entry_id.startswith(prefix)]
+        else:
+            scope = self.list_folder(folder_id)
+
+        normalized_query = normalize_arabic(query.strip())
+        if not normalized_query:
+            return scope
+        token_matches = self._token_matches(query) or set()
+        return [
+            record for record in scope
+            if record['id'] in token_matches or normalized_query in record['normalizedName']
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        records = self._records
+        return {
+            'entries': len(records),
+            'folders': sum(1 for record in records.values() if record['isFolder']),
+            'tokens': len(self._vocabulary),
+            'lastRefresh': datetime.fromtimestamp(self.last_refresh).isoformat() if self.last_refresh else None,
+            'watching': self._watcher is not None and self._watcher.is_alive()
+        }
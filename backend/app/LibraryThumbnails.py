@@ -0,0 +1,133 @@
+import hashlib
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Optional, Set
+
+from werkzeug.security import safe_join
+
+from app.utils.worker_processes import worker_context
+from data.document_preview import has_preview, render_thumbnail
+
+
+class ThumbnailNotReady(Exception):
+    """Raised when a thumbnail is still being rendered: the client should retry"""
+
+
+class ThumbnailQueueFull(ThumbnailNotReady):
+    """Raised when too many thumbnails are waiting to be rendered"""
+
+
+class LibraryThumbnails:
+    """
+    WebP thumbnails of library PDFs (first page) and images, cached on disk.
+
+    A thumbnail is keyed by the file's path, mtime and the thumbnail size, so a
+    changed file gets a new thumbnail and a cached one never needs
+    revalidation. Missing thumbnails are rendered in a bounded process pool
+    (pdfium is not thread-safe); concurrent requests for the same thumbnail
+    share the same render, and new renders are refused once max_pending are
+    queued.
+
+    At most max_waiting request threads wait (up to timeout seconds) for a
+    render; other requests get ThumbnailNotReady right away while the render
+    goes on, so thumbnails never tie up the server's request threads.
+    """
+
+    def __init__(self, root_folder_path: str, cache_dir: str, size: int = 256, workers: int = 2,
+                 max_pending: int = 64, max_waiting: int = 2, timeout: float = 5):
+        self.root_folder_path = os.path.abspath(root_folder_path)
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.size = size
+        self.workers = max(1, workers)
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._waiting = threading.BoundedSemaphore(max(1, max_waiting))
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pending: Dict[str, object] = {}
+        # Thumbnails that failed to render; the key changes with the file's mtime
+        self._failed: Set[str] = set()
+        self.rendered = 0
+        self.failed = 0
+
+    @staticmethod
+    def supports(file_name: str) -> bool:
+        return has_preview(file_name)
+
+    def _cache_path(self, file_id: str, mtime_ns: int) -> str:
+        key = hashlib.sha1(f"{file_id}\0{mtime_ns}\0{self.size}".encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, key[:2], f"{key}.webp")
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=worker_context())
+        return self._pool
+
+    def get_thumbnail(self, file_id: str) -> Optional[str]:
+        """
+        Path of the cached thumbnail of a library file, rendered first if needed.
+
+        Returns:
+            The WebP file path, or None when the file does not exist, has no
+            preview or could not be rendered
+
+        Raises:
+            ThumbnailQueueFull: When max_pending renders are already queued
+            ThumbnailNotReady: When the render did not finish within timeout, or
+                max_waiting requests are already waiting
+        """
+        file_path = safe_join(self.root_folder_path, file_id) if file_id else None
+        if file_path is None or not self.supports(file_path) or not os.path.isfile(file_path):
+            return None
+        cache_path = self._cache_path(file_id, os.stat(file_path).st_mtime_ns)
+        if os.path.exists(cache_path):
+            return cache_path
+        if cache_path in self._failed:
+            return None
+
+        with self._lock:
+            future = self._pending.get(cache_path)
+            submitted = future is None
+            if submitted:
+                if len(self._pending) >= self.max_pending:
+                    raise ThumbnailQueueFull()
+                future = self._get_pool().submit(render_thumbnail, file_path, cache_path, self.size)
+                self._pending[cache_path] = future
+        if submitted:
+            # Outside the lock: the callback runs right away if the render already finished
+            future.add_done_callback(lambda _, key=cache_path: self._done(key))
+
+        if not future.done():
+            if not self._waiting.acquire(blocking=False):
+                raise ThumbnailNotReady()
+            try:
+                wait([future], timeout=self.timeout)
+            finally:
+                self._waiting.release()
+            if not future.done():
+                raise ThumbnailNotReady()
+        try:
+            future.result()
+        except Exception as e:
+            print(f"Error rendering thumbnail for {file_id}: {str(e)}")
+            return None
+        return cache_path
+
+    def _done(self, cache_path: str):
+        with self._lock:
+            future = self._pending.pop(cache_path, None)
+        if future is None or future.cancelled():
+            return
+        if future.exception() is None:
+            self.rendered += 1
+        elif isinstance(future.exception(), BrokenProcessPool):
+            # A crashed worker breaks the pool: the next render starts a new one
+            self._pool = None
+        else:
+            self.failed += 1
+            self._failed.add(cache_path)
+
+    def stats(self) -> Dict[str, int]:
+        return {'rendered': self.rendered, 'failed': self.failed, 'pending': len(self._pending)}
@@ -5,13 +5,32 @@ from datetime import datetime
 import io
 from pathlib import Path
 import shutil
+from werkzeug.security import safe_join
+
+# MIME types the browser can display inline
+VIEWABLE_TYPES = [
+    'application/pdf',
+    'image/jpeg',
+    'image/png',
+    'image/gif',
+    'image/svg+xml',
+    'text/plain',
+    'text/html',
+]
 
 class LocalDriveLibrary:
     """Local File System Library that mirrors Google Drive functionality"""
 
-    def __init__(self, root_folder_path):
-        """Initialize with the path to the root folder containing all files"""
+    def __init__(self, root_folder_path, index=None, content_index=None):
+        """
+        Initialize with the path to the root folder containing all files.
+        With a started LibraryIndex, listing and search are served from the index
+        instead of reading the filesystem; a LibraryContentIndex enables search
+        inside file contents.
+        """
         self.root_folder_path = os.path.abspath(root_folder_path)
+        self.index = index
+        self.content_index = content_index
         # if not os.path.exists(self.root_folder_path):
         #     raise ValueError(f"Root folder path does not exist: {self.root_folder_path}")
 
@@ -39,23 +58,42 @@ class LocalDriveLibrary:
             return self.root_folder_path
         return os.path.join(self.root_folder_path, file_id)
 
+    def resolve_file(self, file_id):
+        """Absolute path of a file inside the library, or None if missing or outside the root folder"""
+        if not file_id:
+            return None
+        file_path = safe_join(self.root_folder_path, file_id)
+        if file_path is None or not os.path.isfile(file_path):
+            return None
+        return file_path
+
+    def _indexed(self, folder_id):
+        """Whether the index can answer for this folder (unknown folders fall back to the filesystem)"""
+        return self.index is not None and self.index.ready and self.index.is_folder(folder_id)
+
     def list_folder_contents(self, folder_id=None, sort_by='name', sort_order='asc'):
         """List contents of a folder"""
         try:
-            folder_path = self._get_absolute_path(folder_id)
-            if not os.path.exists(folder_path):
-                return []
+            if self._indexed(folder_id):
+                items = [self.index.to_file_info(record) for record in self.index.list_folder(folder_id)]
+            else:
+                folder_path = self._get_absolute_path(folder_id)
+                if not os.path.exists(folder_path):
+                    return []
 
-            items = []
-            with os.scandir(folder_path) as entries:
-                for entry in entries:
-                    items.append(self._get_file_info(entry.path))
+                items = []
+                with os.scandir(folder_path) as entries:
+                    for entry in entries:
+                        items.append(self._get_file_info(entry.path))
 
             # Sort items
             reverse = sort_order.lower() == 'desc'
             if sort_by == 'name':
                 items.sort(key=lambda x: x['name'].lower(), reverse=reverse)
-            elif sort_by in ['createdTime', 'modifiedTime', 'size']:
+            elif sort_by == 'size':
+                # Sizes are strings in the response; compare them as numbers
+                items.sort(key=lambda x: int(x['size']), reverse=reverse)
+            elif sort_by in ['createdTime', 'modifiedTime']:
                 items.sort(key=lambda x: x[sort_by], reverse=reverse)
 
             return items
@@ -64,16 +102,39 @@ class LocalDriveLibrary:
             print(f"Error listing folder contents: {str(e)}")
             return []
 
-    def search_files(self, query, folder_id=None, recursive=True, file_type=None, min_size=None, max_size=None):
-        """Search for files matching criteria"""
+    def list_folder_page(self, folder_id=None, sort_by='name', sort_order='asc', limit=50, cursor=None):
+        """
+        List one page of a folder from the metadata index.
+
+        Returns:
+            {'items': [...], 'nextCursor': str or None, 'total': int}, or {'error': ...}
+
+        Raises:
+            ValueError: For an unknown sort field or an invalid cursor
+        """
+        if self.index is None or not self.index.ready:
+            return {'error': 'Library index is not available'}
+        if not self.index.is_folder(folder_id):
+            folder_path = safe_join(self.root_folder_path, folder_id)
+            if folder_path is None or not os.path.isdir(folder_path):
+                return {'error': 'Folder not found'}
+            # Created since the last index refresh
+            self.index.refresh()
+        records, next_cursor, total = self.index.page(folder_id, sort_by, sort_order, limit, cursor)
+        return {
+            'items': [self.index.to_file_info(record) for record in records],
+            'nextCursor': next_cursor,
+            'total': total
+        }
+
+    def search_files(self, query, folder_id=None, recursive=True, file_type=None, min_size=None, max_size=None,
+                     content=False):
+        """Search for files matching criteria (file names, or file contents with content=True)"""
         try:
             start_path = self._get_absolute_path(folder_id)
             results = []
 
-            def should_include_file(file_info):
-                if query.lower() not in file_info['name'].lower():
-                    return False
-                
+            def matches_filters(file_info):
                 if file_type and file_info['mimeType'] != f'application/{file_type}':
                     return False
                 
@@ -86,6 +147,34 @@ class LocalDriveLibrary:
                 
                 return True
 
+            def should_include_file(file_info):
+                return query.lower() in file_info['name'].lower() and matches_filters(file_info)
+
+            if content:
+                if self.content_index is None:
+                    return []
+                # Matching pages with highlighted snippets, best file first
+                for hit in self.content_index.search(query, folder_id, recursive):
+                    record = self.index.get(hit['id']) if self.index is not None else None
+                    file_path = self._get_absolute_path(hit['id'])
+                    if record is not None:
+                        file_info = self.index.to_file_info(record)
+                    elif os.path.isfile(file_path):
+                        file_info = self._get_file_info(file_path)
+                    else:
+                        continue
+                    if matches_filters(file_info):
+                        results.append({**file_info, 'score': hit['score'], 'matches': hit['matches']})
+                return results
+
+            if self._indexed(folder_id):
+                # Name matching (Arabic-normalized) is done by the index
+                for record in self.index.search(query, folder_id, recursive):
+                    file_info = self.index.to_file_info(record)
+                    if matches_filters(file_info):
+                        results.append(file_info)
+                return results
+
             if recursive:
                 for root, dirs, files in os.walk(start_path):
                     for item in dirs + files:
@@ -128,18 +217,7 @@ class LocalDriveLibrary:
 
             mime_type = mimetypes.guess_type(file_path)[0] or 'application/octet-stream'
             
-            # List of viewable MIME types
-            viewable_types = [
-                'application/pdf',
-                'image/jpeg',
-                'image/png',
-                'image/gif',
-                'image/svg+xml',
-                'text/plain',
-                'text/html',
-            ]
-            
-            is_viewable = mime_type in viewable_types
+            is_viewable = mime_type in VIEWABLE_TYPES
             
             # Read and encode file content
             with open(file_path, 'rb') as f:
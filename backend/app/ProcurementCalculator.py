@@ -1,13 +1,20 @@
 # app/ProcurementCalculator.py
 
+import bisect
 import datetime
+import functools
 import json
 import re
+import threading
 from dataclasses import dataclass
 from enum import Enum, auto
-from typing import List, Dict, Optional, Union, Tuple
+from typing import Callable, List, Dict, Optional, Union, Tuple
 import os
 
+import numpy as np
+
+from data.corpus import ArticleCorpus, DATA_DIR
+
 class ProcurementType(Enum):
     """Enum representing different procurement types"""
     GENERAL_COMPETITION = "منافسة عامة"
@@ -58,9 +65,16 @@ class ProcurementConfig:
     INITIAL_GUARANTEE_THRESHOLD = 25000000
     PERFORMANCE_GUARANTEE_THRESHOLD = 5000000
     
+    # General competition announcement period grows to 60 days from this budget
+    EXTENDED_ANNOUNCEMENT_THRESHOLD = 100000000
+    
     # Default values for "تطبق" (applicable)
     DEFAULT_APPLY_DAYS = 7
     
+    # Editable copy of STANDARD_STAGES (procurement types by enum name); when the
+    # file is missing or invalid, STANDARD_STAGES below is used
+    STAGE_RULES_FILE = os.path.join(DATA_DIR, 'tender_mapping', 'stage_rules.json')
+    
     # Standard holidays (official holidays)
     STANDARD_HOLIDAYS = [
         datetime.date(2022, 4, 5),
@@ -203,16 +217,21 @@ class ProcurementConfig:
     ]
 
 
-def load_articles_data(file_path: str) -> Dict[int, Dict]:
+def load_articles_data(file_path: str = None, corpus: ArticleCorpus = None) -> Dict[int, Dict]:
     """
     Load article data from JSON file and index by article number
     
     Args:
         file_path: Path to JSON file with articles data
+        corpus: Already loaded article corpus; when given, its Arabic regulation
+            shard is used instead of parsing file_path
         
     Returns:
         Dictionary mapping article numbers to article data
     """
+    if corpus is not None:
+        return corpus.articles_by_number('ar', 'اللائحة')
+
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
             data = json.load(f)
@@ -278,13 +297,257 @@ class ProcurementResult:
         
         # Try to extract number from string
         if isinstance(value, str):
-            match = re.search(r'(\d+)', value)
-            if match:
-                return int(match.group(1))
+            number = _leading_int(value)
+            if number is not None:
+                return number
         
         return default
 
 
+@functools.lru_cache(maxsize=256)
+def _leading_int(value: str) -> Optional[int]:
+    """First number in a string like '7 أيام', or None"""
+    match = re.search(r'(\d+)', value)
+    return int(match.group(1)) if match else None
+
+
+@dataclass(frozen=True)
+class CompiledStage:
+    """A stage of the timeline with its duration rule compiled for one procurement type"""
+    name: str
+    is_working_days: bool
+    # (result, input_data) -> (duration, notes)
+    duration: Callable[[ProcurementResult, ProcurementInput], Tuple[int, str]]
+
+
+class StageRules:
+    """
+    Stage definitions (the STANDARD_STAGES format) compiled into a decision table.
+    
+    Skip/apply conditions and procurement-type reductions only depend on the
+    procurement type, so they are resolved once per type: `table[procurement_type]`
+    lists the stages that apply, each with a closure computing its duration from
+    the remaining (budget / final guarantee) conditions.
+    """
+    
+    DEFAULT_REDUCE_NOTES = "تم تقليل المدة"
+    
+    def __init__(self, stages: List[Dict], version: float = 0):
+        """
+        Args:
+            stages: Stage definitions; procurement types may be enum members,
+                enum names or Arabic values
+            version: Identifies this set of rules (the rules file mtime)
+        """
+        self.stages = stages
+        self.version = version
+        self.budget_values = sorted({
+            condition["value"]
+            for stage_info in stages
+            for condition in stage_info.get("reduce_conditions", [])
+            if condition.get("key") == "budget" and "value" in condition
+        })
+        self.table: Dict[ProcurementType, Tuple[CompiledStage, ...]] = {
+            procurement_type: tuple(
+                self._compile_stage(stage_info, procurement_type)
+                for stage_info in stages
+                if self._applies(stage_info, procurement_type)
+            )
+            for procurement_type in ProcurementType
+        }
+    
+    @staticmethod
+    def _procurement_types(values: List) -> frozenset:
+        """Resolve procurement types given as members, names or values"""
+        types = set()
+        for value in values:
+            if isinstance(value, ProcurementType):
+                types.add(value)
+            elif value in ProcurementType.__members__:
+                types.add(ProcurementType[value])
+            else:
+                types.add(ProcurementType(value))  # ValueError for unknown types
+        return frozenset(types)
+    
+    def _applies(self, stage_info: Dict, procurement_type: ProcurementType) -> bool:
+        """Whether the skip/apply conditions keep a stage for a procurement type"""
+        for condition in stage_info.get("skip_conditions", []):
+            if (condition.get("key") == "procurement_type" and "values" in condition
+                    and procurement_type in self._procurement_types(condition["values"])):
+                return False
+        for condition in stage_info.get("apply_conditions", []):
+            if (condition.get("key") == "procurement_type" and "values" in condition
+                    and procurement_type not in self._procurement_types(condition["values"])):
+                return False
+        return True
+    
+    def _compile_stage(self, stage_info: Dict, procurement_type: ProcurementType) -> CompiledStage:
+        """Build the duration closure of a stage for one procurement type"""
+        base_duration = stage_info.get("duration", 0)
+        duration_key = stage_info.get("duration_key")
+        fallback_key = stage_info.get("fallback_key")
+        
+        # (predicate or None when always true, reduce_to, reduce_by, notes), in rule order
+        steps = []
+        for condition in stage_info.get("reduce_conditions", []):
+            key = condition.get("key")
+            if key == "budget" and "condition" in condition and "value" in condition:
+                if condition["condition"] != "less_than":
+                    continue
+                predicate = lambda result, input_data, value=condition["value"]: input_data.budget < value
+            elif key == "procurement_type" and "values" in condition:
+                if procurement_type not in self._procurement_types(condition["values"]):
+                    continue
+                predicate = None
+            elif key == "final_guarantee" and "values" in condition:
+                predicate = lambda result, input_data, values=tuple(condition["values"]): result.final_guarantee in values
+            else:
+                continue
+            steps.append((
+                predicate,
+                condition.get("reduce_to") if "reduce_to" in condition else None,
+                condition.get("reduce_by") if "reduce_by" in condition else None,
+                condition.get("notes", self.DEFAULT_REDUCE_NOTES)
+            ))
+        
+        def duration(result: ProcurementResult, input_data: ProcurementInput) -> Tuple[int, str]:
+            value = base_duration
+            if duration_key:
+                value = result.get_attr_as_int(duration_key)
+                if value == 0 and fallback_key:
+                    value = result.get_attr_as_int(fallback_key)
+            
+            notes = ""
+            for predicate, reduce_to, reduce_by, step_notes in steps:
+                if predicate is None or predicate(result, input_data):
+                    if reduce_to is not None:
+                        value = reduce_to
+                    elif reduce_by is not None:
+                        value -= reduce_by
+                    notes = step_notes
+            return value, notes
+        
+        return CompiledStage(
+            name=stage_info["name"],
+            is_working_days=stage_info.get("working_days", True),
+            duration=duration
+        )
+    
+    def to_json(self) -> List[Dict]:
+        """Stage definitions with procurement types replaced by their enum names"""
+        def encode(value):
+            if isinstance(value, ProcurementType):
+                return value.name
+            if isinstance(value, list):
+                return [encode(item) for item in value]
+            if isinstance(value, dict):
+                return {key: encode(item) for key, item in value.items()}
+            return value
+        return encode(self.stages)
+
+
+def load_stage_rules(file_path: str) -> StageRules:
+    """
+    Compile stage rules from a JSON file (a list in the STANDARD_STAGES format)
+    
+    Raises:
+        OSError, ValueError: If the file cannot be read or contains invalid rules
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        stages = json.load(f)
+    if not isinstance(stages, list):
+        raise ValueError("stage rules must be a list of stages")
+    return StageRules(stages, version=os.path.getmtime(file_path))
+
+
+class WorkingDayCalendar:
+    """
+    Precomputed business-day calendar: the sorted ordinals of every working day
+    between START_YEAR and END_YEAR, excluding the Friday/Saturday weekend and
+    a fixed set of holidays.
+    
+    Adding N working days is a binary search for the start date plus an index
+    offset. Extra (e.g. user-supplied) holidays are applied as a small sorted
+    overlay on top of the precomputed days.
+    """
+    
+    # date.weekday() values of the weekend (Friday and Saturday)
+    WEEKEND_DAYS = frozenset({4, 5})
+    
+    START_YEAR = 1990
+    END_YEAR = 2060
+    
+    def __init__(self, holidays: List[datetime.date] = None,
+                 start_year: int = START_YEAR, end_year: int = END_YEAR):
+        self.first_ordinal = datetime.date(start_year, 1, 1).toordinal()
+        self.last_ordinal = datetime.date(end_year, 12, 31).toordinal()
+        
+        holiday_ordinals = {day.toordinal() for day in (holidays or [])}
+        # Ordinal 1 (0001-01-01) is a Monday, so weekday == (ordinal - 1) % 7
+        self.ordinals = [
+            ordinal for ordinal in range(self.first_ordinal, self.last_ordinal + 1)
+            if (ordinal - 1) % 7 not in self.WEEKEND_DAYS and ordinal not in holiday_ordinals
+        ]
+    
+    def is_working_day(self, day: datetime.date) -> bool:
+        """Whether a date is a working day in the precomputed calendar"""
+        ordinal = day.toordinal()
+        index = bisect.bisect_left(self.ordinals, ordinal)
+        return index < len(self.ordinals) and self.ordinals[index] == ordinal
+    
+    def holiday_overlay(self, holidays: List[datetime.date] = None) -> List[int]:
+        """
+        Sorted ordinals of the given holidays that are working days in this calendar.
+        Compute it once per request and pass it to add_working_days.
+        """
+        if not holidays:
+            return []
+        return sorted({day.toordinal() for day in holidays if self.is_working_day(day)})
+    
+    def add_working_days(self, start_date: datetime.date, days: int,
+                         overlay: List[int] = None) -> Optional[datetime.date]:
+        """
+        Date of the `days`-th working day after start_date (start_date itself not counted).
+        
+        Args:
+            start_date: Date to count from
+            days: Number of working days to add; non-positive values return start_date
+            overlay: Extra holiday ordinals from holiday_overlay
+            
+        Returns:
+            The resulting date, or None if it falls outside the precomputed range
+        """
+        if days <= 0:
+            return start_date
+        
+        start_ordinal = start_date.toordinal()
+        if start_ordinal < self.first_ordinal or start_ordinal > self.last_ordinal:
+            return None
+        
+        overlay = overlay or []
+        first_index = bisect.bisect_right(self.ordinals, start_ordinal)
+        overlay_before = bisect.bisect_right(overlay, start_ordinal)
+        
+        # Every overlay holiday inside the span pushes the end one working day further;
+        # repeat until the span stops growing
+        skipped = 0
+        while True:
+            index = first_index + days - 1 + skipped
+            if index >= len(self.ordinals):
+                return None
+            end_ordinal = self.ordinals[index]
+            overlay_hits = bisect.bisect_right(overlay, end_ordinal) - overlay_before
+            if overlay_hits == skipped:
+                return datetime.date.fromordinal(end_ordinal)
+            skipped = overlay_hits
+
+
+@functools.lru_cache(maxsize=8)
+def get_working_day_calendar(holidays: Tuple[datetime.date, ...] = ()) -> WorkingDayCalendar:
+    """Shared calendar for a set of standard holidays (built once per holiday set)"""
+    return WorkingDayCalendar(list(holidays))
+
+
 class DateCalculator:
     """Handles date calculations considering working days and holidays"""
     
@@ -306,12 +569,6 @@ class DateCalculator:
         Add working days to a date, skipping weekends and holidays
         Similar to WORKDAY.INTL in Excel
         """
-        if holidays is None:
-            holidays = []
-        
-        # Convert to set for faster lookup
-        holiday_set = set(holidays)
-        
         # Convert string to int if needed
         if isinstance(days, str):
             try:
@@ -319,13 +576,21 @@ class DateCalculator:
             except ValueError:
                 return start_date  # Return original date if days is not a valid number
         
+        calendar = get_working_day_calendar(tuple(ProcurementConfig.STANDARD_HOLIDAYS))
+        end_date = calendar.add_working_days(start_date, days, calendar.holiday_overlay(holidays))
+        if end_date is not None:
+            return end_date
+        
+        # Outside the precomputed range: walk day by day, with the same holidays
+        holiday_set = set(ProcurementConfig.STANDARD_HOLIDAYS) | set(holidays or [])
         current_date = start_date
         days_added = 0
         
         while days_added < days:
             current_date += datetime.timedelta(days=1)
             # Skip weekends (Friday and Saturday in Arabic countries)
-            if current_date.weekday() < 5 and current_date not in holiday_set:
+            if (current_date.weekday() not in WorkingDayCalendar.WEEKEND_DAYS
+                    and current_date not in holiday_set):
                 days_added += 1
                 
         return current_date
@@ -336,6 +601,65 @@ class ProcurementCalculator:
     
     def __init__(self, config: ProcurementConfig = None):
         self.config = config or ProcurementConfig()
+        self._stage_rules = None
+        self._stage_rules_mtime = None
+        self._stage_rules_lock = threading.Lock()
+    
+    def _stage_rules_file_mtime(self) -> Optional[float]:
+        try:
+            return os.path.getmtime(self.config.STAGE_RULES_FILE)
+        except OSError:
+            return None
+    
+    def stage_rules(self) -> StageRules:
+        """
+        Compiled stage rules, from STAGE_RULES_FILE when it exists and otherwise
+        from STANDARD_STAGES. Recompiled only when the file's mtime changes; an
+        invalid file is reported and the previous rules are kept.
+        """
+        mtime = self._stage_rules_file_mtime()
+        if self._stage_rules is not None and mtime == self._stage_rules_mtime:
+            return self._stage_rules
+        
+        with self._stage_rules_lock:
+            if self._stage_rules is None or mtime != self._stage_rules_mtime:
+                rules = None
+                if mtime is not None:
+                    try:
+                        rules = load_stage_rules(self.config.STAGE_RULES_FILE)
+                    except Exception as e:
+                        print(f"Error loading stage rules from {self.config.STAGE_RULES_FILE}: {e}")
+                        rules = self._stage_rules
+                if rules is None:
+                    rules = StageRules(self.config.STANDARD_STAGES)
+                self._stage_rules = rules
+                self._stage_rules_mtime = mtime
+            return self._stage_rules
+    
+    def budget_thresholds(self) -> List[float]:
+        """All budget values at which any rule of the calculation changes, sorted"""
+        thresholds = {
+            self.config.DIRECT_PURCHASE_THRESHOLD,
+            self.config.LIMITED_COMPETITION_THRESHOLD,
+            self.config.CONTRACT_THRESHOLD,
+            self.config.DOUBLE_FILE_THRESHOLD,
+            self.config.INITIAL_GUARANTEE_THRESHOLD,
+            self.config.PERFORMANCE_GUARANTEE_THRESHOLD,
+            self.config.EXTENDED_ANNOUNCEMENT_THRESHOLD
+        }
+        thresholds.update(self.stage_rules().budget_values)
+        return sorted(thresholds)
+    
+    def budget_bracket(self, budget: float) -> Tuple[int, int]:
+        """
+        Map a budget to its threshold bracket.
+        
+        Budgets in the same bracket produce identical results. Both bisect sides are
+        kept so that a budget exactly on a threshold gets its own bracket (the rules
+        mix < and <= comparisons).
+        """
+        thresholds = self.budget_thresholds()
+        return bisect.bisect_left(thresholds, budget), bisect.bisect_right(thresholds, budget)
     
     def extract_numeric_value(self, value: Union[int, str]) -> Union[int, str]:
         """Extract numeric value from string like '7 أيام' -> 7"""
@@ -520,84 +844,28 @@ class ProcurementCalculator:
         """
         Check if a stage should be skipped or have its duration reduced
         
+        Compiles the single stage dictionary with StageRules; generate_timeline
+        uses the whole compiled table from stage_rules() instead.
+        
         Returns:
             Tuple of (include_stage, adjusted_duration, notes)
         """
-        # Check skip conditions
-        if "skip_conditions" in stage_info:
-            for condition in stage_info.get("skip_conditions", []):
-                if "key" in condition and "values" in condition:
-                    key = condition["key"]
-                    values = condition["values"]
-                    
-                    if key == "procurement_type" and result.procurement_type in values:
-                        return False, 0, "تم تجاوز هذه المرحلة بسبب نوع المنافسة"
-        
-        # Get base duration
-        duration = stage_info.get("duration", 0)
-        notes = ""
-        
-        # Get duration from key if specified
-        if "duration_key" in stage_info:
-            duration = result.get_attr_as_int(stage_info["duration_key"], 0)
-            
-            # If duration is still 0 and there's a fallback key, use it
-            if duration == 0 and "fallback_key" in stage_info:
-                duration = result.get_attr_as_int(stage_info["fallback_key"], 0)
-        
-        # Check apply conditions (if stage only applies to certain procurement types)
-        if "apply_conditions" in stage_info:
-            for condition in stage_info.get("apply_conditions", []):
-                if "key" in condition and "values" in condition:
-                    key = condition["key"]
-                    values = condition["values"]
-                    
-                    if key == "procurement_type" and result.procurement_type not in values:
-                        return False, 0, "تم تجاوز هذه المرحلة لأنها لا تنطبق على نوع المنافسة"
-        
-        # Check reduce conditions
-        if "reduce_conditions" in stage_info:
-            for condition in stage_info.get("reduce_conditions", []):
-                if "key" in condition:
-                    key = condition["key"]
-                    
-                    # Check budget-based conditions
-                    if key == "budget" and "condition" in condition and "value" in condition:
-                        condition_type = condition["condition"]
-                        value = condition["value"]
-                        
-                        if condition_type == "less_than" and input_data.budget < value:
-                            if "reduce_to" in condition:
-                                duration = condition["reduce_to"]
-                            elif "reduce_by" in condition:
-                                duration -= condition["reduce_by"]
-                            notes = condition.get("notes", "تم تقليل المدة")
-                    
-                    # Check procurement type conditions
-                    elif key == "procurement_type" and "values" in condition:
-                        values = condition["values"]
-                        if result.procurement_type in values:
-                            if "reduce_to" in condition:
-                                duration = condition["reduce_to"]
-                            elif "reduce_by" in condition:
-                                duration -= condition["reduce_by"]
-                            notes = condition.get("notes", "تم تقليل المدة")
-                    
-                    # Check final guarantee condition
-                    elif key == "final_guarantee" and "values" in condition:
-                        values = condition["values"]
-                        if result.final_guarantee in values:
-                            if "reduce_to" in condition:
-                                duration = condition["reduce_to"]
-                            elif "reduce_by" in condition:
-                                duration -= condition["reduce_by"]
-                            notes = condition.get("notes", "تم تقليل المدة")
+        compiled = StageRules([stage_info]).table[result.procurement_type]
+        if not compiled:
+            return False, 0, "تم تجاوز هذه المرحلة بسبب نوع المنافسة"
         
+        duration, notes = compiled[0].duration(result, input_data)
         return True, duration, notes
     
     def generate_timeline(self, input_data: ProcurementInput, 
-                          result: ProcurementResult) -> List[ProcurementStage]:
-        """Generate timeline for procurement process"""
+                          result: ProcurementResult,
+                          holiday_overlay: List[int] = None) -> List[ProcurementStage]:
+        """
+        Generate timeline for procurement process
+        
+        holiday_overlay can be passed in (see ProcurementSystem.holiday_overlay) when
+        several inputs share the same holidays, otherwise it is built from input_data.
+        """
         date_calculator = DateCalculator()
         stages = []
         
@@ -606,26 +874,27 @@ class ProcurementCalculator:
         if input_data.holidays:
             all_holidays.extend(input_data.holidays)
         
+        # Standard holidays are baked into the shared calendar; user holidays are an overlay
+        calendar = get_working_day_calendar(tuple(self.config.STANDARD_HOLIDAYS))
+        if holiday_overlay is None:
+            holiday_overlay = calendar.holiday_overlay(input_data.holidays)
+        
         current_date = input_data.start_date
         
-        # Create stages with calculated dates
-        for stage_info in self.config.STANDARD_STAGES:
-            # Check if stage should be included and get adjusted duration
-            include_stage, duration, notes = self.check_stage_conditions(
-                stage_info, result, input_data
-            )
-            
-            if not include_stage:
-                continue
+        # Create stages with calculated dates; skipped stages are already left out of the table
+        for stage in self.stage_rules().table[result.procurement_type]:
+            duration, notes = stage.duration(result, input_data)
             
             # Determine if we use working days or regular days
-            is_working_days = stage_info.get("working_days", True)
+            is_working_days = stage.is_working_days
             
             # Calculate end date
             if is_working_days:
-                end_date = date_calculator.add_working_days(
-                    current_date, duration, all_holidays
-                )
+                end_date = calendar.add_working_days(current_date, duration, holiday_overlay)
+                if end_date is None:
+                    end_date = date_calculator.add_working_days(
+                        current_date, duration, all_holidays
+                    )
             else:
                 end_date = date_calculator.add_regular_days(
                     current_date, duration
@@ -633,7 +902,7 @@ class ProcurementCalculator:
             
             # Create stage
             stages.append(ProcurementStage(
-                name=stage_info["name"],
+                name=stage.name,
                 start_date=current_date,
                 end_date=end_date,
                 duration=duration,
@@ -646,7 +915,8 @@ class ProcurementCalculator:
         
         return stages
     
-    def calculate(self, input_data: ProcurementInput, articles_data: Dict[int, Dict] = None) -> ProcurementResult:
+    def calculate(self, input_data: ProcurementInput, articles_data: Dict[int, Dict] = None,
+                  holiday_overlay: List[int] = None) -> ProcurementResult:
         """Calculate complete procurement information with article references"""
         # Calculate procurement type
         procurement_type = self.calculate_procurement_type(input_data)
@@ -704,7 +974,7 @@ class ProcurementCalculator:
         )
         
         # Generate timeline
-        result.stages = self.generate_timeline(input_data, result)
+        result.stages = self.generate_timeline(input_data, result, holiday_overlay)
         
         # Calculate total duration (calendar days between start of first stage and end of last stage)
         if result.stages:
@@ -718,21 +988,204 @@ class ProcurementCalculator:
         return result
 
 
+class ScenarioSweep:
+    """
+    Evaluates a grid of (budget, start_date) scenarios for one work type.
+    
+    Budgets are mapped to threshold brackets with numpy.searchsorted; every
+    bracket yields the same procurement type and stage plan, so the calculation
+    runs once per distinct bracket. Stage dates are then computed for all start
+    dates at once with numpy.busday_offset on a Friday/Saturday weekend.
+    """
+    
+    # numpy weekmask, Monday first: Friday and Saturday are the weekend
+    WEEKMASK = '1111001'
+    
+    def __init__(self, calculator: ProcurementCalculator):
+        self.calculator = calculator
+        self.config = calculator.config
+    
+    def budget_brackets(self, budgets: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Group budgets by threshold bracket (see ProcurementCalculator.budget_bracket)
+        
+        Returns:
+            Tuple of (index of one representative budget per bracket,
+            bracket number of each budget)
+        """
+        thresholds = np.asarray(self.calculator.budget_thresholds(), dtype=float)
+        brackets = np.stack([
+            np.searchsorted(thresholds, budgets, side='left'),
+            np.searchsorted(thresholds, budgets, side='right')
+        ], axis=1)
+        _, representatives, bracket_ids = np.unique(
+            brackets, axis=0, return_index=True, return_inverse=True
+        )
+        return representatives, bracket_ids.reshape(-1)
+    
+    def stage_end_dates(self, stages: List[ProcurementStage], start_dates: np.ndarray,
+                        holidays: np.ndarray) -> List[np.ndarray]:
+        """
+        End date of every stage of a plan for each start date (datetime64[D] arrays)
+        
+        Matches generate_timeline: a working-day stage ends on the N-th working day
+        after its start (rolling a weekend start back is equivalent), and a
+        non-positive duration ends where it starts.
+        """
+        current = start_dates
+        end_dates = []
+        for stage in stages:
+            if stage.duration <= 0:
+                end = current
+            elif stage.is_working_days:
+                end = np.busday_offset(current, stage.duration, roll='backward',
+                                       weekmask=self.WEEKMASK, holidays=holidays)
+            else:
+                end = current + np.timedelta64(stage.duration, 'D')
+            end_dates.append(end)
+            current = end
+        return end_dates
+    
+    def sweep(self, work_type: WorkType, budgets: List[float], start_dates: List[datetime.date],
+              project_duration: int, holidays: List[datetime.date] = None) -> Dict:
+        """
+        Evaluate every combination of budget and start date
+        
+        Args:
+            work_type: Work type shared by all scenarios
+            budgets: Budget amounts (grid rows)
+            start_dates: Start dates (grid columns)
+            project_duration: Project duration in months
+            holidays: Extra holidays on top of the standard ones
+            
+        Returns:
+            Dictionary with one "plans" entry per budget bracket (procurement type,
+            periods and stage durations) and "rows" of
+            [budget, start_date, plan, end_date, total_duration, stage_end_dates],
+            budget-major, with column names in "columns"
+        """
+        budget_array = np.asarray(budgets, dtype=float)
+        start_array = np.array(start_dates, dtype='datetime64[D]')
+        holiday_array = np.array(
+            list(self.config.STANDARD_HOLIDAYS) + list(holidays or []), dtype='datetime64[D]'
+        )
+        
+        representatives, bracket_ids = self.budget_brackets(budget_array)
+        
+        plans = []
+        plan_dates = []
+        for representative in representatives:
+            # Dates of the representative run are discarded; only its stage plan is used
+            result = self.calculator.calculate(ProcurementInput(
+                work_type=work_type,
+                budget=float(budget_array[representative]),
+                start_date=start_dates[0],
+                project_duration_months=project_duration,
+                holidays=holidays
+            ))
+            plans.append({
+                "procurement_type": result.procurement_type.value,
+                "announcement_period": result.announcement_period,
+                "review_period": result.review_period,
+                "required_participants": result.required_participants,
+                "performance_guarantee": result.performance_guarantee,
+                "initial_guarantee": result.initial_guarantee,
+                "final_guarantee": result.final_guarantee,
+                "file_structure": result.file_structure,
+                "stages": [
+                    {"name": stage.name, "duration": stage.duration,
+                     "is_working_days": stage.is_working_days}
+                    for stage in result.stages
+                ]
+            })
+            
+            end_dates = self.stage_end_dates(result.stages, start_array, holiday_array)
+            final_dates = end_dates[-1] if end_dates else start_array
+            total_durations = (final_dates - start_array).astype(int).tolist()
+            stage_columns = [np.datetime_as_string(dates).tolist() for dates in end_dates]
+            plan_dates.append((
+                np.datetime_as_string(final_dates).tolist(),
+                total_durations,
+                [list(stage_dates) for stage_dates in zip(*stage_columns)] or [[] for _ in start_dates]
+            ))
+        
+        start_strings = np.datetime_as_string(start_array).tolist()
+        rows = []
+        for budget, plan in zip(budget_array.tolist(), bracket_ids.tolist()):
+            final_dates, total_durations, stage_dates = plan_dates[plan]
+            for index, start in enumerate(start_strings):
+                rows.append([budget, start, plan, final_dates[index],
+                             total_durations[index], stage_dates[index]])
+        
+        return {
+            "columns": ["budget", "start_date", "plan", "end_date", "total_duration", "stage_end_dates"],
+            "plans": plans,
+            "rows": rows
+        }
+
+
 class ProcurementSystem:
     """Main interface for the procurement system"""
     
-    def __init__(self, config_file: str = None, articles_file: str = None):
+    def __init__(self, config_file: str = None, articles_file: str = None,
+                 corpus: ArticleCorpus = None):
         # Load configuration from file if provided
         self.config = ProcurementConfig()
         self.calculator = ProcurementCalculator(self.config)
         
-        # Load articles data if provided
+        # Load articles data if provided (a shared corpus avoids re-parsing the JSON)
+        self.corpus = corpus
         self.articles_data = {}
-        if articles_file:
-            self.articles_data = load_articles_data(articles_file)
+        if corpus is not None or articles_file:
+            self.articles_data = load_articles_data(articles_file, corpus=corpus)
+    
+    def cache_key(self, work_type: str, budget: float, start_date: str,
+                  project_duration: int, holidays: List[str] = None) -> Tuple:
+        """
+        Normalized key under which the result of process_input can be memoized.
+        It includes the version of the stage rules, so a rules file change
+        also changes the keys.
+        
+        The budget only matters through its threshold bracket and the project
+        duration only through the final-guarantee rule (more than 12 months).
+        """
+        try:
+            work_type_enum = WorkType(work_type)
+        except ValueError:
+            work_type_enum = WorkType.GENERAL_WORK
+        
+        start_date_obj = datetime.datetime.strptime(start_date, "%Y-%m-%d").date()
+        holiday_dates = tuple(sorted({
+            datetime.datetime.strptime(date, "%Y-%m-%d").date()
+            for date in (holidays or [])
+        }))
+        
+        return (
+            # Results computed under previous stage rules are not reused
+            self.calculator.stage_rules().version,
+            work_type_enum,
+            self.calculator.budget_bracket(budget),
+            start_date_obj,
+            project_duration > 12,
+            holiday_dates
+        )
+    
+    def holiday_overlay(self, holidays: List[str] = None) -> List[int]:
+        """
+        Working-day calendar overlay for a list of holiday dates (YYYY-MM-DD).
+        Inputs that share holidays (e.g. a batch) can compute it once and pass
+        it to process_input.
+        """
+        holiday_dates = [
+            datetime.datetime.strptime(date, "%Y-%m-%d").date()
+            for date in (holidays or [])
+        ]
+        calendar = get_working_day_calendar(tuple(self.config.STANDARD_HOLIDAYS))
+        return calendar.holiday_overlay(holiday_dates)
     
     def process_input(self, work_type: str, budget: float, start_date: str,
-                     project_duration: int, holidays: List[str] = None) -> Dict:
+                     project_duration: int, holidays: List[str] = None,
+                     holiday_overlay: List[int] = None) -> Dict:
         """
         Process user input and return procurement information
         
@@ -742,6 +1195,7 @@ class ProcurementSystem:
             start_date: Start date string (YYYY-MM-DD)
             project_duration: Project duration in months
             holidays: List of holiday dates (YYYY-MM-DD)
+            holiday_overlay: Precomputed holiday_overlay(holidays), optional
             
         Returns:
             Dictionary with procurement information
@@ -773,11 +1227,38 @@ class ProcurementSystem:
         )
         
         # Calculate result with articles data
-        result = self.calculator.calculate(input_data, self.articles_data)
+        result = self.calculator.calculate(input_data, self.articles_data, holiday_overlay)
         
         # Convert result to dictionary for easy serialization
         return self._result_to_dict(result)
     
+    def process_sweep(self, work_type: str, budgets: List[float], start_dates: List[str],
+                      project_duration: int, holidays: List[str] = None) -> Dict:
+        """
+        Evaluate a grid of budgets and start dates (see ScenarioSweep.sweep)
+        
+        Args:
+            work_type: Type of work (in Arabic)
+            budgets: Budget amounts
+            start_dates: Start date strings (YYYY-MM-DD)
+            project_duration: Project duration in months
+            holidays: List of holiday dates (YYYY-MM-DD)
+            
+        Returns:
+            Compact table with one row per (budget, start_date)
+        """
+        try:
+            work_type_enum = WorkType(work_type)
+        except ValueError:
+            work_type_enum = WorkType.GENERAL_WORK
+        
+        start_date_objs = [datetime.datetime.strptime(date, "%Y-%m-%d").date() for date in start_dates]
+        holiday_dates = [datetime.datetime.strptime(date, "%Y-%m-%d").date() for date in (holidays or [])]
+        
+        return ScenarioSweep(self.calculator).sweep(
+            work_type_enum, budgets, start_date_objs, project_duration, holiday_dates
+        )
+    
     def _result_to_dict(self, result: ProcurementResult) -> Dict:
         """Convert result to dictionary for output"""
         stages_dict = []
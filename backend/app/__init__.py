@@ -72,6 +72,8 @@ def create_app(config_class=Config):
     app.register_blueprint(calculator_bp, url_prefix='/api/calculator')
     
     app.cli.add_command(seed_data_command)
+    app.cli.add_command(reindex_vectors_command)
+    app.cli.add_command(ingest_articles_command)
 
     # This route serves the main index.html for the root URL
     @app.route('/')
@@ -221,4 +223,66 @@ def seed_data_command():
             print("Added sample user reviews.")
             
     db.session.commit()
-    print("\nDatabase seeding complete.")
\ No newline at end of file
+    print("\nDatabase seeding complete.")
+
+
+# --- VECTOR STORE RE-INDEXING ---
+@click.command('reindex-vectors')
+@click.option('--lang', type=click.Choice(['ar', 'en']), default='ar', show_default=True,
+              help="Collection to rebuild ('sa' shares the Arabic collection).")
+@click.option('--model', 'embedding_model', default=None,
+              help="Embedding model, e.g. 'local:intfloat/multilingual-e5-large'. Defaults to RAG_EMBEDDING_MODEL.")
+@click.option('--batch-size', default=64, show_default=True, help="Chunks embedded per batch.")
+def reindex_vectors_command(lang, embedding_model, batch_size):
+    """Rebuilds a Chroma collection with another embedding model, from the chunks of the original collection."""
+    from src.config import RAGConfig
+    from src.embeddings import DEFAULT_EMBEDDING_MODEL, get_embeddings
+    from src.templates import get_collection_name, get_persist_directory
+    from src.vector_store import rebuild_collection
+
+    embedding_model = embedding_model or os.getenv("RAG_EMBEDDING_MODEL", RAGConfig.embedding_model)
+    source_directory = get_persist_directory(lang, DEFAULT_EMBEDDING_MODEL)
+    target_directory = get_persist_directory(lang, embedding_model)
+    if os.path.abspath(source_directory) == os.path.abspath(target_directory):
+        print(f"Error: {embedding_model} already uses {source_directory}; pass --model or set RAG_EMBEDDING_MODEL to another model.")
+        return
+
+    print(f"Re-indexing '{get_collection_name(lang)}' from {source_directory} into {target_directory} with {embedding_model}")
+    embeddings = get_embeddings(embedding_model, os.getenv("OPENAI_API_KEY"), batch_size)
+    stats = rebuild_collection(source_directory, target_directory, get_collection_name(lang), embeddings, batch_size)
+    print(f"Indexed {stats['chunks']} chunks in {stats['seconds']}s ({stats['chunks_per_second']} chunks/s).")
+
+
+@click.command('ingest-articles')
+@click.option('--lang', type=click.Choice(['ar', 'en']), default='ar', show_default=True,
+              help="Collection to update ('sa' shares the Arabic collection).")
+@click.option('--file', 'articles_file', default=None, help="Articles JSON file. Defaults to data/final_<lang>.json.")
+@click.option('--model', 'embedding_model', default=None, help="Embedding model. Defaults to RAG_EMBEDDING_MODEL.")
+@click.option('--batch-size', default=64, show_default=True, help="Chunks embedded per batch.")
+@click.option('--dry-run', is_flag=True, help="Only report what would be embedded and deleted.")
+def ingest_articles_command(lang, articles_file, embedding_model, batch_size, dry_run):
+    """Incrementally updates a Chroma collection from the articles JSON: embeds new or changed chunks only."""
+    import json
+    from data.corpus import ARTICLE_FILES
+    from src.config import RAGConfig
+    from src.document_processor import DocumentProcessor
+    from src.embeddings import get_embeddings
+    from src.templates import get_collection_name, get_persist_directory
+    from src.vector_store import sync_collection
+
+    embedding_model = embedding_model or os.getenv("RAG_EMBEDDING_MODEL", RAGConfig.embedding_model)
+    articles_file = articles_file or ARTICLE_FILES[lang]
+    with open(articles_file, 'r', encoding='utf-8') as f:
+        articles = json.load(f)
+
+    processor = DocumentProcessor(chunk_size=RAGConfig.chunk_size, chunk_overlap=RAGConfig.chunk_overlap)
+    chunks = processor.split_articles(articles)
+    persist_directory = get_persist_directory(lang, embedding_model)
+    print(f"{len(articles)} articles -> {len(chunks)} chunks for '{get_collection_name(lang)}' in {persist_directory}")
+
+    embeddings = get_embeddings(embedding_model, os.getenv("OPENAI_API_KEY"), batch_size)
+    stats = sync_collection(persist_directory, get_collection_name(lang), embeddings, chunks, batch_size, dry_run)
+    prefix = "Would embed" if dry_run else "Embedded"
+    print(f"{prefix} {stats['embedded']} chunks, kept {stats['unchanged']} unchanged, deleted {stats['deleted']} stale.")
+    print(f"{stats['embedding_calls']} embedding calls, {stats['embedding_calls_saved']} saved; "
+          f"{stats['seconds']}s ({stats['chunks_per_second']} chunks/s).")
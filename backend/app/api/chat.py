@@ -1,14 +1,44 @@
 # app/api/chat.py
 
-from flask import Blueprint, request, jsonify
+import json
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from flask_jwt_extended import get_jwt_identity
 from app.services.chat_service import ChatService
 from app.utils.auth_decorators import permission_required, usage_limited
-from app.services.chat_service import serialize_session_list_item, serialize_message
+from app.services.chat_service import serialize_session_list_item, serialize_message, serialize_new_session
 
 chat_bp = Blueprint('chat_api', __name__)
 chat_service = ChatService()
 
+def _sse(event: str, data) -> str:
+    """One Server-Sent Events message with a JSON payload"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+def _stream_response(events, serialize_done):
+    """
+    Stream chat events as SSE: `sources` (the retrieved resources), `token` (answer
+    text as it is generated), then `done` with serialize_done(data), or `error`.
+    """
+    def generate():
+        try:
+            for event, data in events:
+                if event == 'sources':
+                    yield _sse('sources', [{'content': doc.page_content, 'metadata': doc.metadata} for doc in data])
+                elif event == 'token':
+                    yield _sse('token', {'text': data})
+                elif event == 'done':
+                    yield _sse('done', serialize_done(data))
+        except Exception as e:
+            print(f"Error streaming chat response: {str(e)}")
+            yield _sse('error', {'error': str(e)})
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        # Keep proxies (nginx) from buffering the stream
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 @chat_bp.route('/sessions', methods=['GET'])
 @permission_required('access_chat')
 def get_sessions():
@@ -64,6 +94,25 @@ def add_message(session_id):
         return jsonify({"error": error}), 404
     return jsonify(serialize_message(assistant_message)), 201
 
+@chat_bp.route('/sessions/<session_id>/message/stream', methods=['POST'])
+@permission_required('access_chat')
+@usage_limited('ai_assistant_queries_per_day')
+def add_message_stream(session_id):
+    """Same as add_message, but streams the answer as Server-Sent Events"""
+    user_id = get_jwt_identity()
+    if not user_id:
+        return jsonify({"error": "Authentication required"}), 401
+        
+    data = request.get_json()
+    user_message = data.get('message')
+    options = data.get('options', {})
+    if not user_message:
+        return jsonify({"error": "Message content is required"}), 400
+    events, error = chat_service.stream_message_to_session(session_id, user_id, user_message, options)
+    if error:
+        return jsonify({"error": error}), 404
+    return _stream_response(events, serialize_message)
+
 @chat_bp.route('/sessions/new', methods=['POST'])
 @permission_required('access_chat')
 @usage_limited('ai_assistant_queries_per_day') 
@@ -86,19 +135,34 @@ def start_new_chat():
     if error:
         return jsonify({"error": error}), 500
         
-    messages_payload = [serialize_message(user_message), serialize_message(assistant_message)]
+    # Authenticated users get the created session, guests only the messages
+    return jsonify(serialize_new_session(session, user_message, assistant_message)), 201 if session else 200
+
+@chat_bp.route('/sessions/new/stream', methods=['POST'])
+@permission_required('access_chat')
+@usage_limited('ai_assistant_queries_per_day')
+def start_new_chat_stream():
+    """Same as start_new_chat, but streams the answer as Server-Sent Events"""
+    user_id = get_jwt_identity()
+    data = request.get_json()
+    first_message = data.get('message')
+    options = data.get('options', {})
+    history = data.get('history') if not user_id else None
     
-    # --- MODIFICATION START: Differentiate response for guests vs. users ---
-    if session: # Authenticated user response
-        return jsonify({
-            'id': str(session.id), 
-            'title': session.title,
-            'updated_at': session.updated_at.isoformat() + 'Z',
-            'questionCount': 1,
-            'messages': messages_payload
-        }), 201
-    else: # Guest user response (no session created)
-        return jsonify({
-            'messages': messages_payload
-        }), 200
-    # --- MODIFICATION END ---
\ No newline at end of file
+    if not first_message:
+        return jsonify({"error": "Initial message content is required"}), 400
+    
+    events = chat_service.stream_new_session(user_id, first_message, options, history)
+    return _stream_response(events, lambda done: serialize_new_session(*done))
+
+@chat_bp.route('/answer-cache-stats', methods=['GET'])
+@permission_required('view_analytics')
+def get_answer_cache_stats():
+    """Hit rate and size of the semantic answer cache"""
+    return jsonify(chat_service.get_answer_cache_stats()), 200
+
+@chat_bp.route('/embedding-cache-stats', methods=['GET'])
+@permission_required('view_analytics')
+def get_embedding_cache_stats():
+    """Hit rate and memory use of the query embedding cache"""
+    return jsonify(chat_service.get_embedding_cache_stats()), 200
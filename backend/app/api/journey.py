@@ -2,6 +2,7 @@
 
 from flask import Blueprint, request, jsonify, send_file
 from app.services.journey_service import JourneyService
+from app.utils.file_streaming import stream_file
 
 journey_bp = Blueprint('journey', __name__)
 journey_service = JourneyService()
@@ -40,6 +41,18 @@ def view_resource(level_id, resource_id):
         print(f"Error viewing resource: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
+@journey_bp.route('/levels/<level_id>/resources/<resource_id>/content', methods=['GET'])
+def stream_resource(level_id, resource_id):
+    """Stream a resource for inline viewing (supports Range and conditional requests)"""
+    try:
+        resource_path = journey_service.get_resource_path(level_id, resource_id)
+        if resource_path is None:
+            return jsonify({"error": f"Resource {resource_id} not found in level {level_id}"}), 404
+        return stream_file(resource_path)
+    except Exception as e:
+        print(f"Error streaming resource: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
 @journey_bp.route('/levels/<level_id>/resources/<resource_id>/download', methods=['GET'])
 def download_resource(level_id, resource_id):
     """Download a specific resource"""
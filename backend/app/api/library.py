@@ -1,11 +1,24 @@
 # app/api/library.py
-from flask import Blueprint, request, jsonify, send_file
+from flask import Blueprint, request, jsonify, send_file, url_for
 from app.services.library_service import LibraryService
+from app.LibraryThumbnails import ThumbnailNotReady
+from app.config import Config
 from app.utils.auth import require_auth
+from app.utils.file_streaming import stream_file
 
 library_bp = Blueprint('library', __name__)
 library_service = LibraryService()
 
+# Thumbnail URLs carry the file's modification time, so a cached thumbnail never goes stale
+THUMBNAIL_MAX_AGE = 365 * 24 * 60 * 60
+
+def add_thumbnail_urls(items):
+    """Add thumbnailUrl to the PDFs and images of a listing"""
+    for item in items:
+        if library_service.has_thumbnail(item):
+            item['thumbnailUrl'] = url_for('library.get_thumbnail', file_id=item['id'], v=item['modifiedTime'])
+    return items
+
 @library_bp.route('/list-folder-contents', methods=['GET'])
 def list_folder_contents():
     """List contents of a folder"""
@@ -15,6 +28,34 @@ def list_folder_contents():
     sort_order = request.args.get('sort_order', 'asc')
     
     result = library_service.list_contents(folder_id, sort_by, sort_order)
+    return jsonify(add_thumbnail_urls(result))
+
+@library_bp.route('/list-folder-page', methods=['GET'])
+def list_folder_page():
+    """List one page of a folder; pass nextCursor back as cursor for the following page"""
+    folder_id = request.args.get('folder_id', None)
+    sort_by = request.args.get('sort_by', Config.LIBRARY_CONFIG['default_sort_by'])
+    sort_order = request.args.get('sort_order', Config.LIBRARY_CONFIG['default_sort_order'])
+    cursor = request.args.get('cursor', None)
+    fields = [field for field in request.args.get('fields', '').split(',') if field]
+    try:
+        limit = int(request.args.get('limit', Config.LIBRARY_CONFIG['default_page_size']))
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+    limit = max(1, min(limit, Config.LIBRARY_CONFIG['max_page_size']))
+
+    try:
+        result = library_service.list_page(folder_id, sort_by, sort_order, limit, cursor)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if 'error' in result:
+        return jsonify(result), 404 if result['error'] == 'Folder not found' else 503
+
+    items = add_thumbnail_urls(result['items'])
+    if fields:
+        # Only the requested fields, to keep large pages small
+        items = [{field: item[field] for field in fields if field in item} for item in items]
+    result['items'] = items
     return jsonify(result)
 
 @library_bp.route('/search-files', methods=['GET'])
@@ -26,7 +67,8 @@ def search_files():
         'recursive': request.args.get('recursive', 'true').lower() == 'true',
         'file_type': request.args.get('file_type', None),
         'min_size': request.args.get('min_size', None),
-        'max_size': request.args.get('max_size', None)
+        'max_size': request.args.get('max_size', None),
+        'content': request.args.get('content', 'false').lower() == 'true'
     }
     
     if params['min_size']:
@@ -35,7 +77,12 @@ def search_files():
         params['max_size'] = int(params['max_size'])
         
     result = library_service.search_files(**params)
-    return jsonify(result)
+    return jsonify(add_thumbnail_urls(result))
+
+@library_bp.route('/index-stats', methods=['GET'])
+def index_stats():
+    """Get library metadata index statistics"""
+    return jsonify(library_service.get_index_stats())
 
 @library_bp.route('/get-download-url', methods=['POST'])
 def get_download_url():
@@ -106,4 +153,40 @@ def view_file():
         
     except Exception as e:
         print(f"Error in view file endpoint: {str(e)}")
-        return jsonify({'error': str(e)}), 500
\ No newline at end of file
+        return jsonify({'error': str(e)}), 500
+
+@library_bp.route('/files/<path:file_id>', methods=['GET'])
+def stream_library_file(file_id):
+    """Stream file bytes for inline viewing (supports Range and conditional requests)"""
+    try:
+        file_path = library_service.get_file_path(file_id)
+        if file_path is None:
+            return jsonify({'error': 'File not found'}), 404
+        return stream_file(file_path)
+
+    except Exception as e:
+        print(f"Error in file stream endpoint: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@library_bp.route('/thumbnails/<path:file_id>', methods=['GET'])
+def get_thumbnail(file_id):
+    """WebP thumbnail of a PDF (first page) or image"""
+    try:
+        thumbnail_path = library_service.get_thumbnail_path(file_id)
+        if thumbnail_path is None:
+            return jsonify({'error': 'No thumbnail for this file'}), 404
+
+        response = send_file(thumbnail_path, mimetype='image/webp', conditional=True, etag=True)
+        if request.args.get('v'):
+            response.headers['Cache-Control'] = f'public, max-age={THUMBNAIL_MAX_AGE}, immutable'
+        else:
+            response.headers['Cache-Control'] = 'public, no-cache'
+        return response
+
+    except ThumbnailNotReady:
+        response = jsonify({'error': 'The thumbnail is being rendered, retry shortly'})
+        response.headers['Retry-After'] = '2'
+        return response, 503
+    except Exception as e:
+        print(f"Error in thumbnail endpoint: {str(e)}")
+        return jsonify({'error': str(e)}), 500
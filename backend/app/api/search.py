@@ -1,7 +1,8 @@
 # app/api/search.py
 from flask import Blueprint, request, jsonify
+from app.config import Config
 from app.services.search_service import SearchService
-from app.utils.validators import validate_search_params
+from app.utils.validators import validate_search_params, validate_pagination_params
 from app.utils.auth_decorators import permission_required
 
 search_bp = Blueprint('search', __name__)
@@ -16,9 +17,13 @@ def search():
     Query Parameters:
     - query (required): Search keywords
     - type (optional): Resource type filter ('System', 'Regulation', 'Both')
+    - page (optional): 1-based page number (default 1)
+    - page_size (optional): Results per page (default SEARCH_CONFIG['default_page_size'],
+      at most SEARCH_CONFIG['max_page_size'])
     
     Returns:
-    - JSON response with search results or error message
+    - JSON response with one page of BM25-ranked results, the total match count
+      and the paging parameters, or an error message
     """
     search_query = request.args.get('query', '').strip()
     search_type = request.args.get('type', 'Both')
@@ -29,10 +34,25 @@ def search():
         return jsonify({'error': validation_error}), 400
 
     try:
-        results = search_service.perform_search(search_query, search_type)
-        return jsonify({'data': results}), 200
+        page = int(request.args.get('page', 1))
+        page_size = int(request.args.get('page_size', Config.SEARCH_CONFIG['default_page_size']))
+    except ValueError:
+        return jsonify({'error': 'page and page_size must be integers'}), 400
+
+    validation_error = validate_pagination_params(page, page_size, Config.SEARCH_CONFIG['max_page_size'])
+    if validation_error:
+        return jsonify({'error': validation_error}), 400
+
+    try:
+        result = search_service.perform_ranked_search(search_query, search_type, page, page_size)
+        return jsonify({
+            'data': result['results'],
+            'total_count': result['total_count'],
+            'page': result['page'],
+            'page_size': result['page_size']
+        }), 200
     except Exception as e:
         print(f"Search error: {str(e)}")
         return jsonify({
             'error': 'An error occurred while processing your search'
-        }), 500
\ No newline at end of file
+        }), 500
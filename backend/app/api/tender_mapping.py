@@ -1,12 +1,26 @@
 # app/api/tender_mapping.py
 
 from flask import Blueprint, request, jsonify
+from app.config import Config
 from app.services.tender_mapping_service import TenderMappingService
 from app.utils.auth_decorators import permission_required, usage_limited
 
 tender_mapping_bp = Blueprint('tender_mapping', __name__)
 tender_mapping_service = TenderMappingService()
 
+REQUIRED_FIELDS = ['work_type', 'budget', 'start_date', 'project_duration']
+
+def _batch_size() -> int:
+    """Most a batch request can cost: one report generation per item"""
+    data = request.get_json(silent=True)
+    items = data.get('items') if isinstance(data, dict) else None
+    return len(items) if isinstance(items, list) and items else 1
+
+def _successful_items(response) -> int:
+    """Usage actually charged for a batch: one report generation per item that succeeded"""
+    results = response[0].get_json().get('results', [])
+    return sum(1 for result in results if 'error' not in result)
+
 @tender_mapping_bp.route('/work-types', methods=['GET'])
 def get_work_types():
     """Get all work types for dropdown menu"""
@@ -27,8 +41,7 @@ def calculate_procurement():
         if not isinstance(data, dict):
             return jsonify({"error": "Invalid input: expected dictionary"}), 400
         
-        required_fields = ['work_type', 'budget', 'start_date', 'project_duration']
-        missing_fields = [field for field in required_fields if field not in data]
+        missing_fields = [field for field in REQUIRED_FIELDS if field not in data]
         
         if missing_fields:
             return jsonify({"error": f"Missing required fields: {', '.join(missing_fields)}"}), 400
@@ -40,4 +53,86 @@ def calculate_procurement():
         return jsonify(result), 200
     except Exception as e:
         print(f"Error calculating procurement: {str(e)}")
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        return jsonify({"error": str(e)}), 500
+
+@tender_mapping_bp.route('/calculate-batch', methods=['POST'])
+@permission_required('access_report_generator')
+@usage_limited('report_generations_per_day', cost=_batch_size, charged=_successful_items)
+def calculate_procurement_batch():
+    """
+    Calculate procurement details for a list of inputs in one request.
+    Expects {"items": [...], "holidays": [...]}; the holidays apply to every
+    item that does not specify its own. Each item that succeeds counts as one
+    report generation; the whole batch must fit in the remaining daily quota.
+    """
+    try:
+        data = request.get_json()
+        if not isinstance(data, dict) or not isinstance(data.get('items'), list):
+            return jsonify({"error": "Invalid input: expected dictionary with an 'items' list"}), 400
+        
+        items = data['items']
+        holidays = data.get('holidays', [])
+        max_batch_size = Config.TENDER_MAPPING_CONFIG['max_batch_size']
+        
+        if not items:
+            return jsonify({"error": "'items' must not be empty"}), 400
+        if len(items) > max_batch_size:
+            return jsonify({"error": f"Too many items: at most {max_batch_size} per batch"}), 400
+        if not isinstance(holidays, list):
+            return jsonify({"error": "Invalid input: 'holidays' must be a list"}), 400
+        
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                return jsonify({"error": f"Invalid item {index}: expected dictionary"}), 400
+            missing_fields = [field for field in REQUIRED_FIELDS if field not in item]
+            if missing_fields:
+                return jsonify({"error": f"Item {index} is missing required fields: {', '.join(missing_fields)}"}), 400
+        
+        results = tender_mapping_service.calculate_procurement_batch(items, holidays)
+        return jsonify({"results": results, "count": len(results)}), 200
+    except Exception as e:
+        print(f"Error calculating procurement batch: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@tender_mapping_bp.route('/sweep', methods=['POST'])
+@permission_required('access_report_generator')
+@usage_limited('report_generations_per_day')
+def calculate_sweep():
+    """
+    Evaluate every combination of a list of budgets and a list of start dates.
+    Expects work_type, budgets, start_dates, project_duration and optional holidays;
+    returns a compact table with one row per scenario.
+    """
+    try:
+        data = request.get_json()
+        if not isinstance(data, dict):
+            return jsonify({"error": "Invalid input: expected dictionary"}), 400
+        
+        required_fields = ['work_type', 'budgets', 'start_dates', 'project_duration']
+        missing_fields = [field for field in required_fields if field not in data]
+        if missing_fields:
+            return jsonify({"error": f"Missing required fields: {', '.join(missing_fields)}"}), 400
+        
+        budgets = data['budgets']
+        start_dates = data['start_dates']
+        if not isinstance(budgets, list) or not budgets or not isinstance(start_dates, list) or not start_dates:
+            return jsonify({"error": "'budgets' and 'start_dates' must be non-empty lists"}), 400
+        
+        max_cells = Config.TENDER_MAPPING_CONFIG['max_sweep_cells']
+        if len(budgets) * len(start_dates) > max_cells:
+            return jsonify({"error": f"Too many scenarios: at most {max_cells} budget/start date combinations"}), 400
+        
+        result = tender_mapping_service.calculate_sweep(data)
+        if "error" in result:
+            return jsonify({"error": result["error"]}), 400
+        
+        return jsonify(result), 200
+    except Exception as e:
+        print(f"Error calculating procurement sweep: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@tender_mapping_bp.route('/cache-stats', methods=['GET'])
+@permission_required('view_analytics')
+def get_cache_stats():
+    """Hit/miss counters of the procurement calculation cache"""
+    return jsonify(tender_mapping_service.get_cache_stats()), 200
\ No newline at end of file
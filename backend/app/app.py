@@ -10,9 +10,8 @@ from functools import wraps
 from LocalDriveLibrary import LocalDriveLibrary
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from src.config import load_config
-from src.rag_system import ArabicRAGSystem
-from data.search_engine import SearchEngine
+from src.registry import get_rag_registry
+from data.search_engine import get_search_engine
 # from DriveLibrary import DriveLibrary
 
 
@@ -28,8 +27,6 @@ ADMIN_PASSWORD = '123'
 os.makedirs(os.path.dirname(CONTACTS_FILE), exist_ok=True)
 
 # Global variables
-configs = {}
-rag_systems = {}
 chat_histories = {}
 
 # Initialize Drive Library with your Google Drive folder ID
@@ -37,7 +34,7 @@ chat_histories = {}
 drive_library = LocalDriveLibrary(root_folder_path="library")
 
 
-search_engine = SearchEngine()
+search_engine = get_search_engine()
 @dataclass
 class ChatResponse:
     """Structure for chat response"""
@@ -46,10 +43,7 @@ class ChatResponse:
     error: Optional[str] = None
 
 def get_rag_system(language):
-    if language not in rag_systems:
-        configs[language] = load_config(language)
-        rag_systems[language] = ArabicRAGSystem(configs[language])
-    return rag_systems[language]
+    return get_rag_registry().get(language)
 
 def require_auth(f):
     @wraps(f)
@@ -55,7 +55,9 @@ class Config:
     # ... (rest of your config file remains unchanged) ...
     CHAT_CONFIG = {
         'default_language': 'ar',
-        'max_history_length': 100
+        'max_history_length': 100,
+        # Threads folding old turns into the session summaries, in the background
+        'summary_workers': 2
     }
     SEARCH_CONFIG = {
         'default_page_size': 10,
@@ -64,11 +66,28 @@ class Config:
         'valid_doc_types': ['System', 'Regulation', 'Both']
     }
     LIBRARY_ROOT_FOLDER = "library"
+    # Let the front proxy send streamed library/journey files (X-Sendfile header, no body)
+    USE_X_SENDFILE = os.environ.get('USE_X_SENDFILE', 'false').lower() == 'true'
     LIBRARY_CONFIG = {
         'allowed_file_types': ['pdf', 'doc', 'docx', 'txt'],
         'max_file_size': 50 * 1024 * 1024,
         'default_sort_by': 'name',
-        'default_sort_order': 'asc'
+        'default_sort_order': 'asc',
+        'default_page_size': 50,
+        'max_page_size': 200,
+        # Metadata index: rescan interval in seconds (0 disables the watcher) and optional SQLite snapshot
+        'index_poll_interval': int(os.environ.get('LIBRARY_INDEX_POLL_INTERVAL', 30)),
+        'index_db_path': os.environ.get('LIBRARY_INDEX_PATH'),
+        # Full-text index of PDF/DOCX/XLSX content, extracted in a process pool and stored per page
+        'text_index_enabled': os.environ.get('LIBRARY_TEXT_INDEX', 'true').lower() == 'true',
+        'text_db_path': os.environ.get('LIBRARY_TEXT_DB_PATH', os.path.join('app', 'library_text.sqlite3')),
+        'text_workers': int(os.environ.get('LIBRARY_TEXT_WORKERS', 2)),
+        # WebP thumbnails (longest side in pixels) rendered by a process pool and cached on disk
+        'thumbnail_cache_dir': os.environ.get('LIBRARY_THUMBNAIL_DIR', os.path.join('app', 'thumbnail_cache')),
+        'thumbnail_size': 256,
+        'thumbnail_workers': int(os.environ.get('LIBRARY_THUMBNAIL_WORKERS', 2)),
+        # Request threads that may wait for a render; keep well below ASGI_WSGI_THREADS
+        'thumbnail_max_waiting': int(os.environ.get('LIBRARY_THUMBNAIL_MAX_WAITING', 2))
     }
     ADMIN_CONFIG = {
         'allowed_email_domains': ['*'],
@@ -84,6 +103,12 @@ class Config:
     }
     Journey_DIR = os.path.join('data', 'journey')
     TENDER_MAPPING_DIR = os.path.join('data', 'tender_mapping')
+    TENDER_MAPPING_CONFIG = {
+        'result_cache_size': 2048,
+        'result_cache_ttl_seconds': 6 * 60 * 60,
+        'max_batch_size': 200,
+        'max_sweep_cells': 20000
+    }
 
     # --- Global Settings File Path ---
     SETTINGS_FILE_PATH = os.path.join(basedir, 'global_settings.json')
@@ -12,11 +12,17 @@ class ChatSession(db.Model):
     title = db.Column(db.String(255), nullable=False)
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Running summary of the turns older than the RAG history window, and how many turns it covers
+    summary = db.Column(db.Text, nullable=True)
+    summary_turns = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     user = db.relationship('User')
     messages = db.relationship('ChatMessage', back_populates='session', lazy='joined', cascade='all, delete-orphan', order_by='ChatMessage.created_at')
 
 class ChatMessage(db.Model):
     __tablename__ = 'chat_messages'
+    __table_args__ = (
+        db.Index('ix_chat_messages_session_id_created_at', 'session_id', 'created_at'),
+    )
     id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     session_id = db.Column(UUID(as_uuid=True), db.ForeignKey('chat_sessions.id', ondelete='CASCADE'), nullable=False)
     role = db.Column(db.String(50), nullable=False)
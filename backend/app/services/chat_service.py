@@ -3,31 +3,43 @@
 import uuid
 import sys
 import os
-from flask import jsonify
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app, jsonify
 from datetime import datetime
 from app.extensions import db
+from sqlalchemy import func
+from sqlalchemy.orm import lazyload
+from app.config import Config
 from app.models import ChatSession, ChatMessage, MessageResource
 
 # Correctly import the RAG system components
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
-from src.config import load_config
-from src.rag_system import ArabicRAGSystem
+from src.config import RAGConfig
+from src.registry import get_rag_registry
+from src.answer_cache import get_answer_cache
+from src.embedding_cache import get_embedding_cache
+
+# Background summary refreshes; at most one queued or running per session
+_summary_executor = ThreadPoolExecutor(max_workers=Config.CHAT_CONFIG['summary_workers'], thread_name_prefix='chat-summary')
+_pending_summaries = set()
+_pending_summaries_lock = threading.Lock()
 
 class ChatService:
     def __init__(self):
-        self.rag_systems = {}
-        self.configs = {}
+        # Shared with the legacy app and warmed up at worker start (see gunicorn.conf.py)
+        self.rag_registry = get_rag_registry()
 
     def get_rag_system(self, language: str = 'ar', reasoning: bool = False):
-        if language not in self.rag_systems:
-            self.rag_systems[language] = {}
-            self.configs[language] = {}
+        return self.rag_registry.get(language, reasoning)
 
-        if reasoning not in self.rag_systems[language]:
-            self.configs[language][reasoning] = load_config(language, reasoning)
-            self.rag_systems[language][reasoning] = ArabicRAGSystem(self.configs[language][reasoning])
+    def get_answer_cache_stats(self):
+        """Hit/miss counters of the semantic answer cache shared by the RAG systems"""
+        return get_answer_cache(RAGConfig.answer_cache_path).stats()
 
-        return self.rag_systems[language][reasoning]
+    def get_embedding_cache_stats(self):
+        """Hit rate and memory use of the query embedding cache shared by the RAG systems"""
+        return get_embedding_cache(os.getenv("RAG_EMBEDDING_CACHE_PATH", RAGConfig.embedding_cache_path)).stats()
 
     def get_sessions_for_user(self, user_id: str):
         user_uuid = uuid.UUID(user_id)
@@ -37,7 +49,10 @@ class ChatService:
     def get_session_by_id(self, session_id: str, user_id: str):
         session_uuid = uuid.UUID(session_id)
         user_uuid = uuid.UUID(user_id)
-        session = ChatSession.query.filter_by(id=session_uuid, user_id=user_uuid).first()
+        # Messages are loaded on access only: the RAG history comes from a bounded query
+        session = ChatSession.query.options(lazyload(ChatSession.messages)).filter_by(
+            id=session_uuid, user_id=user_uuid
+        ).first()
         return session
 
     def delete_session_by_id(self, session_id: str, user_id: str) -> bool:
@@ -48,50 +63,250 @@ class ChatService:
             return True
         return False
 
-    def _get_history_for_rag(self, session: ChatSession):
+    def _history_window(self, rag_system) -> int:
+        """Number of recent turns passed to the RAG system, capped by CHAT_CONFIG['max_history_length']"""
+        return min(rag_system.config.history_window, Config.CHAT_CONFIG['max_history_length'])
+
+    @staticmethod
+    def _pair_turns(rows) -> list:
+        """
+        (question, answer) turns from (role, content) rows in chronological order.
+        An answer belongs to the question before it; a question without an answer
+        gets '' and an answer without a question is dropped.
+        """
         history = []
-        user_msgs = [msg for msg in session.messages if msg.role == 'user']
-        assistant_msgs = [msg for msg in session.messages if msg.role == 'assistant']
-        
-        for i in range(len(user_msgs)):
-            user_msg = user_msgs[i].content
-            assistant_msg = assistant_msgs[i].content if i < len(assistant_msgs) else ""
-            history.append((user_msg, assistant_msg))
-            
+        for role, content in rows:
+            if role == 'user':
+                history.append((content, ''))
+            elif role == 'assistant' and history and not history[-1][1]:
+                history[-1] = (history[-1][0], content)
         return history
 
+    @staticmethod
+    def _question_time(session: ChatSession, offset: int, newest_first: bool = False):
+        """Scalar subquery: created_at of the question at `offset` in the session"""
+        order = ChatMessage.created_at.desc() if newest_first else ChatMessage.created_at.asc()
+        return db.session.query(ChatMessage.created_at) \
+            .filter(ChatMessage.session_id == session.id, ChatMessage.role == 'user') \
+            .order_by(order).offset(offset).limit(1).scalar_subquery()
+
+    def _get_history_for_rag(self, session: ChatSession, turns: int):
+        """The last `turns` (question, answer) pairs of a session, from one indexed query"""
+        if turns <= 0:
+            return []
+        # Starts at the turns-th newest question, or at the first one in shorter sessions
+        start = func.coalesce(
+            self._question_time(session, turns - 1, newest_first=True),
+            self._question_time(session, 0)
+        )
+        rows = db.session.query(ChatMessage.role, ChatMessage.content) \
+            .filter(ChatMessage.session_id == session.id, ChatMessage.created_at >= start) \
+            .order_by(ChatMessage.created_at.asc(), ChatMessage.role.desc()).all()
+        return self._pair_turns(rows)
+
+    def guest_history(self, history: list | None, rag_system) -> list:
+        """Last turns of the {role, content} message list a guest sends with a new chat"""
+        rows = [(message.get('role'), message.get('content') or '') for message in history or []
+                if isinstance(message, dict)]
+        return self._pair_turns(rows)[-self._history_window(rag_system):]
+
+    def get_history_for_session(self, session_id: str, user_id: str, language: str = 'ar', reasoning: bool = False):
+        """
+        Recent history and running summary of a session.
+
+        Returns:
+            (history, summary), or None if it is not the user's session
+        """
+        session = self.get_session_by_id(session_id, user_id)
+        if not session:
+            return None
+        rag_system = self.get_rag_system(language, reasoning)
+        return self._get_history_for_rag(session, self._history_window(rag_system)), session.summary
+
+    def refresh_summary(self, session: ChatSession, rag_system):
+        """
+        Fold the turns that left the history window into the session summary.
+        Usually one turn per exchange; the prompt holds the previous summary and
+        at most one window of turns, so its size does not grow with the session.
+        """
+        window = self._history_window(rag_system)
+        total_turns = ChatMessage.query.filter_by(session_id=session.id, role='user').count()
+        outside = total_turns - window
+        if outside <= session.summary_turns:
+            return
+
+        first = max(session.summary_turns, outside - window)
+        # Messages from question `first` up to question `outside`, which is still in the window
+        rows = db.session.query(ChatMessage.role, ChatMessage.content) \
+            .filter(ChatMessage.session_id == session.id,
+                    ChatMessage.created_at >= self._question_time(session, first),
+                    ChatMessage.created_at < self._question_time(session, outside)) \
+            .order_by(ChatMessage.created_at.asc(), ChatMessage.role.desc()).all()
+
+        summary = rag_system.update_summary(session.summary, self._pair_turns(rows))
+        if summary is not None:
+            session.summary = summary
+            session.summary_turns = outside
+            db.session.commit()
+
+    def refresh_summary_later(self, session: ChatSession, rag_system):
+        """
+        refresh_summary on the summary thread pool with its own app context, so the
+        response does not wait for the summary LLM call. A session with a refresh
+        already queued or running is skipped: refresh_summary folds in every turn
+        that left the window, so the next exchange catches up. Errors are only
+        logged, for the same reason.
+        """
+        app = current_app._get_current_object()
+        session_id = session.id
+        with _pending_summaries_lock:
+            if session_id in _pending_summaries:
+                return
+            _pending_summaries.add(session_id)
+
+        def refresh():
+            try:
+                with app.app_context():
+                    background_session = ChatSession.query.filter_by(id=session_id).first()
+                    if background_session:
+                        self.refresh_summary(background_session, rag_system)
+            except Exception as e:
+                print(f"Error refreshing conversation summary: {str(e)}")
+            finally:
+                with _pending_summaries_lock:
+                    _pending_summaries.discard(session_id)
+
+        _summary_executor.submit(refresh)
+
     def add_message_to_session(self, session_id: str, user_id: str, user_message_content: str, options: dict):
         session = self.get_session_by_id(session_id, user_id)
         if not session:
             return None, "Session not found or access denied"
 
-        user_message = ChatMessage(session_id=session.id, role='user', content=user_message_content)
-        db.session.add(user_message)
-        db.session.flush()
-        
-        history = self._get_history_for_rag(session)
-        history.append((user_message_content, ''))
-
         rag_system = self.get_rag_system(
             language=options.get('language', 'ar'),
             reasoning=options.get('reasoning', False)
         )
-        response_data = rag_system.query(user_message_content, history[:-1])
-        
-        assistant_message = ChatMessage(session_id=session.id, role='assistant', content=response_data['answer'])
-        db.session.add(assistant_message)
-        db.session.flush()
+        history = self._get_history_for_rag(session, self._history_window(rag_system))
 
-        for doc in response_data.get("source_documents", []):
+        response_data = rag_system.query(user_message_content, history, session.summary)
+        assistant_message = self.save_exchange(session, user_message_content, response_data)
+        self.refresh_summary_later(session, rag_system)
+        return assistant_message, None
+
+    def _add_resources(self, assistant_message: ChatMessage, source_documents: list):
+        for doc in source_documents:
             resource = MessageResource(
                 message_id=assistant_message.id,
                 content=doc.page_content,
                 resource_metadata=doc.metadata
             )
             db.session.add(resource)
-            
+
+    def save_exchange(self, session: ChatSession, user_message_content: str, response_data: dict) -> ChatMessage:
+        """Persists a question and its generated answer in an existing session; returns the assistant message."""
+        user_message = ChatMessage(session_id=session.id, role='user', content=user_message_content)
+        db.session.add(user_message)
+        db.session.flush()
+
+        assistant_message = ChatMessage(session_id=session.id, role='assistant', content=response_data['answer'])
+        db.session.add(assistant_message)
+        db.session.flush()
+        self._add_resources(assistant_message, response_data.get("source_documents", []))
+
         db.session.commit()
-        return assistant_message, None
+        return assistant_message
+
+    def save_new_session(self, user_id: str | None, first_message_content: str, response_data: dict):
+        """
+        Stores a first question and its answer: a new persisted session for users,
+        transient (non-DB) messages for guests.
+
+        Returns:
+            (session or None, user_message, assistant_message)
+        """
+        if not user_id:
+            user_message = ChatMessage(role='user', content=first_message_content, id=uuid.uuid4(), created_at=datetime.utcnow(), resources=[])
+            assistant_message = ChatMessage(role='assistant', content=response_data['answer'], id=uuid.uuid4(), created_at=datetime.utcnow())
+            assistant_message.resources = [
+                MessageResource(content=doc.page_content, resource_metadata=doc.metadata)
+                for doc in response_data.get("source_documents", [])
+            ]
+            return None, user_message, assistant_message
+
+        new_session = ChatSession(
+            user_id=uuid.UUID(user_id),
+            title=first_message_content[:120]
+        )
+        db.session.add(new_session)
+
+        user_message = ChatMessage(session=new_session, role='user', content=first_message_content)
+        db.session.add(user_message)
+
+        assistant_message = ChatMessage(session=new_session, role='assistant', content=response_data['answer'])
+        db.session.add(assistant_message)
+        db.session.flush()
+        self._add_resources(assistant_message, response_data.get("source_documents", []))
+
+        db.session.commit()
+        return new_session, user_message, assistant_message
+
+    def stream_message_to_session(self, session_id: str, user_id: str, user_message_content: str, options: dict):
+        """
+        Streaming variant of add_message_to_session.
+
+        Returns (events, error). events yields ("sources", documents) and ("token", text)
+        while the answer is generated; once it is complete the user and assistant
+        messages are saved and ("done", assistant_message) is yielded last.
+        """
+        session = self.get_session_by_id(session_id, user_id)
+        if not session:
+            return None, "Session not found or access denied"
+
+        rag_system = self.get_rag_system(
+            language=options.get('language', 'ar'),
+            reasoning=options.get('reasoning', False)
+        )
+        history = self._get_history_for_rag(session, self._history_window(rag_system))
+
+        def events():
+            response_data = None
+            for event, data in rag_system.stream_query(user_message_content, history, session.summary):
+                if event == 'done':
+                    response_data = data
+                else:
+                    yield event, data
+
+            # Persist only once the stream completed
+            yield 'done', self.save_exchange(session, user_message_content, response_data)
+            # After the answer was sent
+            self.refresh_summary_later(session, rag_system)
+
+        return events(), None
+
+    def stream_new_session(self, user_id: str | None, first_message_content: str, options: dict, history: list | None = None):
+        """
+        Streaming variant of start_new_session.
+
+        Yields ("sources", documents) and ("token", text) while the answer is generated,
+        then ("done", (session, user_message, assistant_message)). As in start_new_session,
+        only authenticated users get a persisted session; it is created once the
+        stream completed.
+        """
+        rag_system = self.get_rag_system(
+            language=options.get('language', 'ar'),
+            reasoning=options.get('reasoning', False)
+        )
+        chat_history_for_rag = [] if user_id else self.guest_history(history, rag_system)
+
+        response_data = None
+        for event, data in rag_system.stream_query(first_message_content, chat_history_for_rag):
+            if event == 'done':
+                response_data = data
+            else:
+                yield event, data
+
+        yield 'done', self.save_new_session(user_id, first_message_content, response_data)
 
     def start_new_session(self, user_id: str | None, first_message_content: str, options: dict, history: list | None = None):
         """Starts a new session for users, or handles a sessionless query for guests."""
@@ -101,55 +316,12 @@ class ChatService:
             reasoning=options.get('reasoning', False)
         )
 
-        # --- MODIFICATION START: Handle authenticated vs. guest users ---
-        if user_id:
-            # Authenticated user: Create persistent session and messages
-            user_uuid = uuid.UUID(user_id)
-            
-            new_session = ChatSession(
-                user_id=user_uuid,
-                title=first_message_content[:120]
-            )
-            db.session.add(new_session)
-            
-            user_message = ChatMessage(session=new_session, role='user', content=first_message_content)
-            db.session.add(user_message)
-            
-            response_data = rag_system.query(first_message_content, [])
-            
-            assistant_message = ChatMessage(session=new_session, role='assistant', content=response_data['answer'])
-            db.session.add(assistant_message)
-            db.session.flush()
-
-            for doc in response_data.get("source_documents", []):
-                resource = MessageResource(
-                    message_id=assistant_message.id,
-                    content=doc.page_content,
-                    resource_metadata=doc.metadata
-                )
-                db.session.add(resource)
-            
-            db.session.commit()
-            return new_session, user_message, assistant_message, None
-        else:
-            # Guest user: Perform RAG query without saving to DB
-            chat_history_for_rag = history or []
-            
-            response_data = rag_system.query(first_message_content, chat_history_for_rag)
-
-            # Create transient (non-DB) message objects to return
-            user_message = ChatMessage(role='user', content=first_message_content, id=uuid.uuid4(), created_at=datetime.utcnow(), resources=[])
-            assistant_message = ChatMessage(role='assistant', content=response_data['answer'], id=uuid.uuid4(), created_at=datetime.utcnow())
-            
-            # Populate resources for the assistant message
-            transient_resources = []
-            for doc in response_data.get("source_documents", []):
-                resource = MessageResource(content=doc.page_content, resource_metadata=doc.metadata)
-                transient_resources.append(resource)
-            assistant_message.resources = transient_resources
+        # Only guests send their history; users start a fresh session
+        chat_history_for_rag = [] if user_id else self.guest_history(history, rag_system)
+        response_data = rag_system.query(first_message_content, chat_history_for_rag)
 
-            return None, user_message, assistant_message, None
-        # --- MODIFICATION END ---
+        session, user_message, assistant_message = self.save_new_session(user_id, first_message_content, response_data)
+        return session, user_message, assistant_message, None
 
 
 # --- SERIALIZATION HELPERS ---
@@ -170,4 +342,17 @@ def serialize_message(message):
         'id': str(message.id), 'role': message.role, 'content': message.content,
         'timestamp': message.created_at.isoformat() + 'Z',
         'resources': [serialize_resource(r) for r in message.resources]
-    }
\ No newline at end of file
+    }
+
+def serialize_new_session(session, user_message, assistant_message):
+    """Response body of a new chat: the session for users, only the messages for guests"""
+    messages_payload = [serialize_message(user_message), serialize_message(assistant_message)]
+    if session:
+        return {
+            'id': str(session.id), 
+            'title': session.title,
+            'updated_at': session.updated_at.isoformat() + 'Z',
+            'questionCount': 1,
+            'messages': messages_payload
+        }
+    return {'messages': messages_payload}
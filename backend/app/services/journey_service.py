@@ -8,7 +8,9 @@ import mimetypes
 from flask import current_app, send_file
 import io
 import base64
+from werkzeug.security import safe_join
 from app.config import Config
+from app.LocalDriveLibrary import VIEWABLE_TYPES
 
 from app.models.journey import JourneyResource, JourneyLevel, Journey
 
@@ -121,18 +123,7 @@ class JourneyService:
         
         mime_type = mimetypes.guess_type(resource_path)[0] or 'application/octet-stream'
             
-        # For viewable files, encode content as base64
-        viewable_types = [
-            'application/pdf',
-            'image/jpeg',
-            'image/png',
-            'image/gif',
-            'image/svg+xml',
-            'text/plain',
-            'text/html',
-        ]
-        
-        is_viewable = mime_type in viewable_types
+        is_viewable = mime_type in VIEWABLE_TYPES
         
         try:
             with open(resource_path, 'rb') as f:
@@ -150,6 +141,13 @@ class JourneyService:
             current_app.logger.error(f"Error getting resource content: {str(e)}")
             return {"error": str(e)}
 
+    def get_resource_path(self, level_id: str, resource_id: str) -> Optional[str]:
+        """Absolute path of a resource file for streaming, None if missing or outside the journey folder"""
+        resource_path = safe_join(os.path.abspath(self.journey_root), level_id, resource_id)
+        if resource_path is None or not os.path.isfile(resource_path):
+            return None
+        return resource_path
+
     def download_resource(self, level_id: str, resource_id: str):
         """Get resource as a file for download"""
         resource_path = os.path.join(self.journey_root, level_id, resource_id)
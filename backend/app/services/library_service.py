@@ -2,27 +2,82 @@
 from typing import Dict, Any, Tuple, Optional, BinaryIO
 from app.config import Config
 from app.LocalDriveLibrary import LocalDriveLibrary
+from app.LibraryIndex import LibraryIndex
+from app.LibraryContentIndex import LibraryContentIndex
+from app.LibraryThumbnails import LibraryThumbnails
 
 class LibraryService:
     def __init__(self):
-        """Initialize library service with drive library"""
-        self.drive_library = LocalDriveLibrary(root_folder_path=Config.LIBRARY_ROOT_FOLDER)
+        """
+        Initialize library service with drive library, backed by the metadata index.
+        The indexes stay empty (listings scan the filesystem) until start() is called.
+        """
+        self.index = LibraryIndex(
+            Config.LIBRARY_ROOT_FOLDER,
+            poll_interval=Config.LIBRARY_CONFIG['index_poll_interval'],
+            db_path=Config.LIBRARY_CONFIG['index_db_path']
+        )
+        self.content_index = None
+        if Config.LIBRARY_CONFIG['text_index_enabled']:
+            try:
+                self.content_index = LibraryContentIndex(
+                    self.index,
+                    db_path=Config.LIBRARY_CONFIG['text_db_path'],
+                    workers=Config.LIBRARY_CONFIG['text_workers']
+                )
+            except Exception as e:
+                print(f"Error opening library text index: {str(e)}")
+        self.thumbnails = LibraryThumbnails(
+            Config.LIBRARY_ROOT_FOLDER,
+            cache_dir=Config.LIBRARY_CONFIG['thumbnail_cache_dir'],
+            size=Config.LIBRARY_CONFIG['thumbnail_size'],
+            workers=Config.LIBRARY_CONFIG['thumbnail_workers'],
+            max_waiting=Config.LIBRARY_CONFIG['thumbnail_max_waiting']
+        )
+        self.drive_library = LocalDriveLibrary(
+            root_folder_path=Config.LIBRARY_ROOT_FOLDER,
+            index=self.index,
+            content_index=self.content_index
+        )
+
+    def start(self):
+        """
+        Build the metadata index and start the index watchers. Called by the server
+        processes (gunicorn.conf.py, run.py), not on import, so CLI commands and
+        tests do not scan the library or extract text.
+        """
+        try:
+            self.index.start()
+        except Exception as e:
+            print(f"Error building library index, falling back to filesystem scans: {str(e)}")
+        if self.content_index is not None:
+            try:
+                self.content_index.start()
+            except Exception as e:
+                print(f"Error starting library text index: {str(e)}")
 
     def list_contents(self, folder_id: Optional[str], sort_by: str, sort_order: str) -> Dict[str, Any]:
         """List contents of a folder with sorting options"""
         return self.drive_library.list_folder_contents(folder_id, sort_by, sort_order)
 
+    def list_page(self, folder_id: Optional[str], sort_by: str, sort_order: str,
+                  limit: int, cursor: Optional[str]) -> Dict[str, Any]:
+        """List one page of a folder with a cursor for the next one"""
+        return self.drive_library.list_folder_page(folder_id, sort_by, sort_order, limit, cursor)
+
     def search_files(self, query: str, folder_id: Optional[str] = None, 
                     recursive: bool = True, file_type: Optional[str] = None,
-                    min_size: Optional[int] = None, max_size: Optional[int] = None) -> Dict[str, Any]:
-        """Search for files with various filters"""
+                    min_size: Optional[int] = None, max_size: Optional[int] = None,
+                    content: bool = False) -> Dict[str, Any]:
+        """Search for files with various filters, by name or (content=True) inside the files"""
         return self.drive_library.search_files(
             query=query,
             folder_id=folder_id,
             recursive=recursive,
             file_type=file_type,
             min_size=min_size,
-            max_size=max_size
+            max_size=max_size,
+            content=content
         )
 
     def get_download_url(self, file_id: str) -> Dict[str, Any]:
@@ -33,6 +88,25 @@ class LibraryService:
         """Download a file and return file object, name, and mime type"""
         return self.drive_library.download_file(file_id)
 
+    def get_index_stats(self) -> Dict[str, Any]:
+        """Get metadata and full-text index statistics"""
+        stats = self.index.stats()
+        stats['text'] = self.content_index.stats() if self.content_index is not None else None
+        return stats
+
+    def has_thumbnail(self, file_info: Dict[str, Any]) -> bool:
+        """Whether a listed item gets a thumbnail (PDFs and images)"""
+        return file_info['mimeType'] != 'application/vnd.google-apps.folder' and \
+            self.thumbnails.supports(file_info['name'])
+
+    def get_thumbnail_path(self, file_id: str) -> Optional[str]:
+        """Get the cached WebP thumbnail of a file, rendering it if needed; None if it has none"""
+        return self.thumbnails.get_thumbnail(file_id)
+
+    def get_file_path(self, file_id: str) -> Optional[str]:
+        """Get the absolute path of a file for streaming, None if not found"""
+        return self.drive_library.resolve_file(file_id)
+
     def get_file_content(self, file_id: str) -> Dict[str, Any]:
         """Get file content for viewing"""
         return self.drive_library.get_file_content(file_id)
\ No newline at end of file
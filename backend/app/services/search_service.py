@@ -1,11 +1,12 @@
 # app/services/search_service.py
 from typing import List, Dict, Optional
-from data.search_engine import SearchEngine
+from data.search_engine import get_search_engine
 
 class SearchService:
-    def __init__(self):
-        """Initialize search service with search engine"""
-        self.search_engine = SearchEngine()
+    @property
+    def search_engine(self):
+        """The shared search engine (rebuilt by get_search_engine when the articles change)"""
+        return get_search_engine()
 
     def perform_search(self, query: str, doc_type: str = 'Both') -> List[Dict]:
         """
@@ -21,4 +22,25 @@ class SearchService:
         return self.search_engine.search(
             query_text=query,
             doc_type=doc_type
-        )
\ No newline at end of file
+        )
+
+    def perform_ranked_search(self, query: str, doc_type: str = 'Both',
+                              page: int = 1, page_size: int = 10) -> Dict:
+        """
+        Perform a BM25-ranked search and return one page of results.
+        
+        Args:
+            query (str): Search query text
+            doc_type (str): Type of documents to search ('System', 'Regulation', 'Both')
+            page (int): 1-based page number
+            page_size (int): Number of results per page
+            
+        Returns:
+            Dict: Page of results with total_count, page and page_size
+        """
+        return self.search_engine.search_ranked(
+            query_text=query,
+            doc_type=doc_type,
+            page=page,
+            page_size=page_size
+        )
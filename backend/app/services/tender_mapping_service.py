@@ -1,15 +1,29 @@
 # app/services/tender_mapping_service.py
 
 import os
+import copy
 import json
 import datetime
+import threading
 from typing import Dict, List, Any, Optional
+from app.config import Config
+from app.utils.cache import TTLCache
+from data.corpus import get_corpus
+
+# Guards the shared ProcurementSystem between gunicorn threads
+_lock = threading.Lock()
 
 class TenderMappingService:
+    _procurement_system = None
+    # Memoized process_input results keyed on ProcurementSystem.cache_key
+    _result_cache = TTLCache(
+        maxsize=Config.TENDER_MAPPING_CONFIG['result_cache_size'],
+        ttl_seconds=Config.TENDER_MAPPING_CONFIG['result_cache_ttl_seconds']
+    )
+
     def __init__(self):
         """Initialize the tender mapping service"""
         self.data_dir = os.path.join('data', 'tender_mapping')
-        self.articles_file = os.path.join(self.data_dir, 'final_ar.json')
         
         # Create directory if it doesn't exist
         os.makedirs(self.data_dir, exist_ok=True)
@@ -26,6 +40,29 @@ class TenderMappingService:
             })
         
         return work_types
+
+    @classmethod
+    def get_procurement_system(cls):
+        """
+        Returns the long-lived ProcurementSystem shared by all requests.
+        It is rebuilt only when the article corpus was reloaded because the
+        articles file changed on disk (see data.corpus.get_corpus).
+        """
+        from app.ProcurementCalculator import ProcurementSystem
+
+        corpus = get_corpus()
+        with _lock:
+            if cls._procurement_system is None or cls._procurement_system.corpus is not corpus:
+                print(f"[{threading.get_ident()}] Building procurement system articles index.")
+                cls._procurement_system = ProcurementSystem(corpus=corpus)
+                # Cached results reference the previous articles
+                cls._result_cache.clear()
+            return cls._procurement_system
+
+    @classmethod
+    def get_cache_stats(cls) -> Dict[str, Any]:
+        """Hit/miss counters of the calculation result cache"""
+        return cls._result_cache.stats()
     
     def calculate_procurement(self, data: Dict) -> Dict:
         """
@@ -45,23 +82,101 @@ class TenderMappingService:
             project_duration = int(data.get('project_duration', 0))
             holidays = data.get('holidays', [])
             
-            # Import the necessary classes from the implementation
-            from app.ProcurementCalculator import ProcurementSystem
+            procurement_system = self.get_procurement_system()
+            
+            return self._calculate_cached(
+                procurement_system, work_type, budget, start_date_str, project_duration, holidays
+            )
+            
+        except Exception as e:
+            print(f"Error calculating procurement: {str(e)}")
+            return {"error": str(e)}
+    
+    def calculate_procurement_batch(self, items: List[Dict], holidays: List[str] = None) -> List[Dict]:
+        """
+        Calculate procurement information for several inputs at once
+        
+        The procurement system (articles index and working-day calendar) is
+        resolved once for the whole batch, and the holiday overlay is computed
+        once per distinct holiday list rather than once per item.
+        
+        Args:
+            items: List of dictionaries with work_type, budget, start_date and project_duration;
+                an item may carry its own holidays, which replace the shared ones
+            holidays: Holiday dates (YYYY-MM-DD) shared by every item
             
-            # Initialize procurement system
-            procurement_system = ProcurementSystem(articles_file=self.articles_file)
+        Returns:
+            List with one result per item, in order; failed items are {"error": ...}
+        """
+        procurement_system = self.get_procurement_system()
+        overlays = {}
+        results = []
+        
+        for item in items:
+            try:
+                item_holidays = item.get('holidays', holidays or [])
+                overlay_key = tuple(item_holidays)
+                if overlay_key not in overlays:
+                    overlays[overlay_key] = procurement_system.holiday_overlay(item_holidays)
+                
+                results.append(self._calculate_cached(
+                    procurement_system,
+                    item.get('work_type'),
+                    float(item.get('budget', 0)),
+                    item.get('start_date'),
+                    int(item.get('project_duration', 0)),
+                    item_holidays,
+                    overlays[overlay_key]
+                ))
+            except Exception as e:
+                print(f"Error calculating procurement batch item: {str(e)}")
+                results.append({"error": str(e)})
+        
+        return results
+    
+    def calculate_sweep(self, data: Dict) -> Dict:
+        """
+        Evaluate a grid of budgets and start dates for one work type
+        
+        Args:
+            data: Dictionary containing work_type, budgets, start_dates, project_duration
+                and optional holidays
             
-            # Process the input
+        Returns:
+            Compact table (see ScenarioSweep.sweep), or {"error": ...}
+        """
+        try:
+            procurement_system = self.get_procurement_system()
+            return procurement_system.process_sweep(
+                work_type=data.get('work_type'),
+                budgets=[float(budget) for budget in data.get('budgets', [])],
+                start_dates=data.get('start_dates', []),
+                project_duration=int(data.get('project_duration', 0)),
+                holidays=data.get('holidays', [])
+            )
+        except Exception as e:
+            print(f"Error calculating procurement sweep: {str(e)}")
+            return {"error": str(e)}
+    
+    def _calculate_cached(self, procurement_system, work_type: str, budget: float, start_date_str: str,
+                          project_duration: int, holidays: List[str],
+                          holiday_overlay: Optional[List[int]] = None) -> Dict:
+        """Run process_input through the result cache and return a private copy"""
+        # Inputs in the same budget bracket with the same dates share one result
+        cache_key = procurement_system.cache_key(
+            work_type, budget, start_date_str, project_duration, holidays
+        )
+        result = self._result_cache.get(cache_key)
+        if result is None:
             result = procurement_system.process_input(
                 work_type=work_type,
                 budget=budget,
                 start_date=start_date_str,
                 project_duration=project_duration,
-                holidays=holidays
+                holidays=holidays,
+                holiday_overlay=holiday_overlay
             )
-            
-            return result
-            
-        except Exception as e:
-            print(f"Error calculating procurement: {str(e)}")
-            return {"error": str(e)}
\ No newline at end of file
+            self._result_cache.set(cache_key, result)
+        
+        # Callers may modify the returned dictionary; keep the cached one intact
+        return copy.deepcopy(result)
\ No newline at end of file
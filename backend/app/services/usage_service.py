@@ -23,8 +23,8 @@ class UsageService:
             return settings.get("guest_permissions", {}).get("usage_limits", {}).get(feature, 0)
         return 0
 
-    def check_usage(self, user: User | None, guest_identifier: str | None, feature: str) -> bool:
-        """Checks if a user or guest is within their usage limit for a feature."""
+    def check_usage(self, user: User | None, guest_identifier: str | None, feature: str, amount: int = 1) -> bool:
+        """Checks if a user or guest can use a feature `amount` more times within their limit."""
         limit = self._get_limit_for_feature(user, guest_identifier, feature)
         
         if limit == -1: return True
@@ -47,10 +47,10 @@ class UsageService:
         usage_log = UserUsageLog.query.filter(and_(*query_filter)).first()
         current_usage = usage_log.count if usage_log else 0
         
-        return current_usage < limit
+        return current_usage + amount <= limit
 
-    def log_usage(self, user_id: str | None, guest_identifier: str | None, feature: str):
-        """Logs one usage instance for a user or guest for a specific feature."""
+    def log_usage(self, user_id: str | None, guest_identifier: str | None, feature: str, amount: int = 1):
+        """Logs `amount` usage instances (default one) for a user or guest in a single write."""
         if not user_id and not guest_identifier:
             return
 
@@ -68,14 +68,14 @@ class UsageService:
         usage_log = UserUsageLog.query.filter(and_(*query_filter)).first()
 
         if usage_log:
-            usage_log.count += 1
+            usage_log.count += amount
         else:
             new_log = UserUsageLog(
                 user_id=user_id,
                 guest_identifier=guest_identifier,
                 feature=feature,
                 usage_date=today,
-                count=1
+                count=amount
             )
             db.session.add(new_log)
         
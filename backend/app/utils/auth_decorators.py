@@ -2,7 +2,7 @@
 
 from functools import wraps
 from flask import jsonify, request
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, get_jwt_identity, verify_jwt_in_request
 from app.models import User
 from app.services.gatekeeper_service import GatekeeperService
 from app.services.usage_service import UsageService
@@ -34,10 +34,17 @@ def permission_required(permission_name: str):
         return wrapper
     return decorator
 
-def usage_limited(feature_name: str):
+def usage_limited(feature_name: str, cost=None, charged=None):
     """
     A decorator to rate-limit an endpoint based on daily usage.
     It checks the limit before execution and logs the usage after.
+
+    `cost` is an optional callable returning how many uses the current request
+    may count for (e.g. the number of items in a batch); it defaults to one and
+    the request is rejected up front if it would exceed the remaining quota.
+    `charged` is an optional callable taking the successful response and
+    returning how many uses to actually log (e.g. only the items that succeeded);
+    it defaults to the `cost`.
     """
     def decorator(fn):
         @wraps(fn)
@@ -46,9 +53,10 @@ def usage_limited(feature_name: str):
             user_id = get_jwt_identity()
             user = User.query.get(user_id) if user_id else None
             guest_identifier = request.remote_addr if not user else None
+            amount = cost() if cost else 1
 
             # 1. Check if the user is within their limits
-            if not usage_service.check_usage(user, guest_identifier, feature_name):
+            if not usage_service.check_usage(user, guest_identifier, feature_name, amount):
                 return jsonify({"error": "Daily usage limit for this feature has been reached."}), 429
 
             # 2. Execute the function
@@ -59,8 +67,35 @@ def usage_limited(feature_name: str):
             status_code = response[1] if isinstance(response, tuple) and len(response) > 1 else 200
             
             if 200 <= status_code < 300:
-                usage_service.log_usage(user_id, guest_identifier, feature_name)
+                used = charged(response) if charged else amount
+                if used > 0:
+                    usage_service.log_usage(user_id, guest_identifier, feature_name, used)
             
             return response
         return wrapper
-    return decorator
\ No newline at end of file
+    return decorator
+
+def check_access(permission_name: str, feature_name: str):
+    """
+    The checks of permission_required and usage_limited as a plain function, for
+    handlers that cannot be decorated (e.g. the async ASGI routes). Must run in a
+    request context; the JWT cookie is verified here.
+
+    Returns:
+        (user_id, guest_identifier, error) where error is None or an
+        (error body, status code) pair
+    """
+    verify_jwt_in_request(optional=True)
+    user_id = get_jwt_identity()
+    user = User.query.get(user_id) if user_id else None
+    guest_identifier = request.remote_addr if not user else None
+
+    if not gatekeeper.has_permission(user, permission_name):
+        if not user:
+            return user_id, guest_identifier, ({"error": "Access denied. This feature requires authentication."}, 401)
+        return user_id, guest_identifier, ({"error": "You do not have the required permission for this feature."}, 403)
+
+    if not usage_service.check_usage(user, guest_identifier, feature_name):
+        return user_id, guest_identifier, ({"error": "Daily usage limit for this feature has been reached."}, 429)
+
+    return user_id, guest_identifier, None
@@ -0,0 +1,77 @@
+# app/utils/file_streaming.py
+
+import mimetypes
+import os
+from email.utils import parsedate_to_datetime
+from typing import Optional
+from flask import send_file
+from starlette.requests import Request
+from starlette.responses import FileResponse, Response
+
+
+def guess_mime_type(file_path: str) -> str:
+    return mimetypes.guess_type(file_path)[0] or 'application/octet-stream'
+
+
+def stream_file(file_path: str, download_name: Optional[str] = None, as_attachment: bool = False):
+    """
+    Serve a file from disk without loading it into memory.
+
+    send_file() is given the path, so werkzeug answers Range requests with
+    206 partial content, sets ETag/Last-Modified from the file's stat and
+    returns 304 for matching If-None-Match/If-Modified-Since. The body is
+    read in chunks by the serving thread for the whole transfer (with
+    USE_X_SENDFILE the bytes are left to the front proxy instead). Under
+    asgi.py the library file and journey content routes are served by
+    Starlette instead, without holding a WSGI thread.
+    """
+    response = send_file(
+        file_path,
+        mimetype=guess_mime_type(file_path),
+        as_attachment=as_attachment,
+        download_name=download_name or os.path.basename(file_path),
+        conditional=True,
+        etag=True
+    )
+    # Revalidate with the ETag on every use instead of refetching the file
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def _not_modified(request: Request, response: FileResponse) -> bool:
+    """Whether the client's cached copy (If-None-Match, else If-Modified-Since) is current"""
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match:
+        tags = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+        return '*' in tags or response.headers['etag'] in tags
+    if_modified_since = request.headers.get('if-modified-since')
+    if if_modified_since:
+        try:
+            return parsedate_to_datetime(response.headers['last-modified']) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def file_response(request: Request, file_path: str, headers: Optional[dict] = None) -> Response:
+    """
+    Starlette counterpart of stream_file for the ASGI routes (asgi.py).
+
+    FileResponse answers Range requests with 206 partial content and sends
+    the file in chunks from the event loop, so a download holds no thread;
+    a matching If-None-Match/If-Modified-Since gets 304.
+    """
+    headers = {'Cache-Control': 'private, no-cache', **(headers or {})}
+    response = FileResponse(
+        file_path,
+        media_type=guess_mime_type(file_path),
+        filename=os.path.basename(file_path),
+        content_disposition_type='inline',
+        headers=headers,
+        # Stat now so ETag and Last-Modified are set before the conditional check
+        stat_result=os.stat(file_path)
+    )
+    if _not_modified(request, response):
+        headers.update({key: response.headers[key] for key in ('etag', 'last-modified')})
+        return Response(status_code=304, headers=headers)
+    return response
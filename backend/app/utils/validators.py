@@ -49,4 +49,24 @@ def validate_search_params(query: str, search_type: str) -> Optional[str]:
     if search_type not in valid_types:
         return 'Invalid search type. Must be one of: System, Regulation, Both'
 
-    return None
\ No newline at end of file
+    return None
+
+def validate_pagination_params(page: int, page_size: int, max_page_size: int) -> Optional[str]:
+    """
+    Validate pagination parameters.
+    
+    Args:
+        page (int): 1-based page number
+        page_size (int): Requested number of results per page
+        max_page_size (int): Largest page size allowed
+        
+    Returns:
+        Optional[str]: Error message if validation fails, None if validation succeeds
+    """
+    if page < 1:
+        return 'page must be a positive integer'
+
+    if page_size < 1 or page_size > max_page_size:
+        return f'page_size must be between 1 and {max_page_size}'
+
+    return None
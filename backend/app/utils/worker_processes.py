@@ -0,0 +1,21 @@
+# app/utils/worker_processes.py
+
+import multiprocessing
+
+# Modules the forkserver imports once; every worker forked from it has them loaded
+WORKER_MODULES = ['data.document_text', 'data.document_preview']
+
+
+def worker_context():
+    """
+    Multiprocessing context of the library text extraction and thumbnail pools.
+
+    Workers are forked from a single-threaded forkserver process instead of the
+    server process, whose threads (index watchers, thread pools) may hold locks
+    at fork time. Like spawn, a worker imports the entry script (e.g. run.py)
+    as __mp_main__, so entry scripts must only start services under
+    `if __name__ == '__main__'` (see LibraryService.start).
+    """
+    context = multiprocessing.get_context('forkserver')
+    context.set_forkserver_preload(WORKER_MODULES)
+    return context
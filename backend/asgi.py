@@ -0,0 +1,215 @@
+# asgi.py
+"""
+ASGI entry point.
+
+The chat question endpoints run natively on asyncio: embedding, Chroma search
+and the ChatOpenAI call are awaited, so a waiting request does not hold a
+thread and one process can serve hundreds of chats at once. The number of
+in-flight LLM calls is capped by RAG_LLM_MAX_CONCURRENCY. The short database
+steps (authentication, usage limits, saving messages) run in a thread pool
+inside a Flask request context.
+
+Library files and journey resources are streamed by Starlette FileResponse
+(Range requests, ETag revalidation), so a long download does not hold one of
+the WSGI threads.
+
+All other routes are served by the Flask app, mounted as WSGI behind the
+async routes with ASGI_WSGI_THREADS threads.
+
+    gunicorn -c gunicorn.conf.py asgi:app
+"""
+import os
+
+from a2wsgi import WSGIMiddleware
+from starlette.applications import Starlette
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Mount, Route
+
+from app import create_app
+from app.api.chat import chat_service
+from app.api.journey import journey_service
+from app.api.library import library_service
+from app.services.chat_service import serialize_message, serialize_new_session
+from app.utils.auth_decorators import check_access, usage_service
+from app.utils.file_streaming import file_response
+
+CHAT_FEATURE = 'ai_assistant_queries_per_day'
+
+flask_app = create_app()
+FRONTEND_URL = flask_app.config.get('FRONTEND_URL')
+
+
+def _cors_headers(request: Request) -> dict:
+    """The CORS headers Flask-Cors adds to the Flask routes (preflight requests of these paths are still answered by Flask)"""
+    origin = request.headers.get('origin')
+    if origin and (not FRONTEND_URL or origin == FRONTEND_URL):
+        return {
+            'Access-Control-Allow-Origin': origin,
+            'Access-Control-Allow-Credentials': 'true',
+            'Vary': 'Origin'
+        }
+    return {}
+
+
+def _json(request: Request, body, status_code: int, background: BackgroundTask = None) -> JSONResponse:
+    """JSON response with the CORS headers of the Flask routes"""
+    return JSONResponse(body, status_code=status_code, headers=_cors_headers(request), background=background)
+
+
+def _file(request: Request, file_path) -> Response:
+    if file_path is None:
+        return _json(request, {'error': 'File not found'}, 404)
+    return file_response(request, file_path, headers=_cors_headers(request))
+
+
+async def stream_library_file(request: Request):
+    """GET /api/library/files/<path>"""
+    file_path = await run_in_threadpool(library_service.get_file_path, request.path_params['file_id'])
+    return _file(request, file_path)
+
+
+async def stream_journey_resource(request: Request):
+    """GET /api/journey/levels/<level_id>/resources/<resource_id>/content"""
+    file_path = await run_in_threadpool(
+        journey_service.get_resource_path, request.path_params['level_id'], request.path_params['resource_id']
+    )
+    return _file(request, file_path)
+
+
+def _flask_context(request: Request):
+    """Flask request context carrying the ASGI request's cookies, headers and client address"""
+    return flask_app.test_request_context(
+        request.url.path,
+        method=request.method,
+        headers=list(request.headers.items()),
+        environ_base={'REMOTE_ADDR': request.client.host if request.client else None}
+    )
+
+
+def _authorize(request: Request):
+    with _flask_context(request):
+        return check_access('access_chat', CHAT_FEATURE)
+
+
+def _get_session_history(request: Request, session_id: str, user_id: str, options: dict):
+    with _flask_context(request):
+        return chat_service.get_history_for_session(
+            session_id, user_id, options.get('language', 'ar'), options.get('reasoning', False)
+        )
+
+
+def _save_message(request: Request, session_id: str, user_id: str, content: str, response_data: dict):
+    """Returns None when the session was deleted while the answer was generated"""
+    with _flask_context(request):
+        session = chat_service.get_session_by_id(session_id, user_id)
+        if not session:
+            return None
+        assistant_message = chat_service.save_exchange(session, content, response_data)
+        usage_service.log_usage(user_id, None, CHAT_FEATURE)
+        return serialize_message(assistant_message)
+
+
+def _refresh_summary(request: Request, session_id: str, user_id: str, rag_system):
+    """Runs after the response was sent (Starlette background task, in the thread pool)"""
+    with _flask_context(request):
+        try:
+            session = chat_service.get_session_by_id(session_id, user_id)
+            if session:
+                chat_service.refresh_summary(session, rag_system)
+        except Exception as e:
+            print(f"Error refreshing conversation summary: {str(e)}")
+
+
+def _save_new_session(request: Request, user_id, guest_identifier, content: str, response_data: dict):
+    with _flask_context(request):
+        session, user_message, assistant_message = chat_service.save_new_session(user_id, content, response_data)
+        usage_service.log_usage(user_id, guest_identifier, CHAT_FEATURE)
+        return serialize_new_session(session, user_message, assistant_message), 201 if session else 200
+
+
+async def _read_message(request: Request, field_error: str):
+    try:
+        data = await request.json()
+    except ValueError:
+        data = None
+    if not isinstance(data, dict) or not data.get('message'):
+        return None, _json(request, {"error": field_error}, 400)
+    return data, None
+
+
+async def add_message(request: Request):
+    """Async POST /api/chat/sessions/<session_id>/message"""
+    user_id, _, error = await run_in_threadpool(_authorize, request)
+    if error:
+        return _json(request, error[0], error[1])
+    if not user_id:
+        return _json(request, {"error": "Authentication required"}, 401)
+
+    data, error_response = await _read_message(request, "Message content is required")
+    if error_response:
+        return error_response
+    options = data.get('options', {})
+    session_id = request.path_params['session_id']
+
+    try:
+        conversation = await run_in_threadpool(_get_session_history, request, session_id, user_id, options)
+    except ValueError:
+        conversation = None
+    if conversation is None:
+        return _json(request, {"error": "Session not found or access denied"}, 404)
+    history, summary = conversation
+
+    rag_system = await run_in_threadpool(
+        chat_service.get_rag_system, options.get('language', 'ar'), options.get('reasoning', False)
+    )
+    response_data = await rag_system.aquery(data['message'], history, summary)
+
+    payload = await run_in_threadpool(
+        _save_message, request, session_id, user_id, data['message'], response_data
+    )
+    if payload is None:
+        return _json(request, {"error": "Session not found or access denied"}, 404)
+    # The summary LLM call happens after the answer was sent
+    return _json(request, payload, 201, BackgroundTask(_refresh_summary, request, session_id, user_id, rag_system))
+
+
+async def start_new_chat(request: Request):
+    """Async POST /api/chat/sessions/new"""
+    user_id, guest_identifier, error = await run_in_threadpool(_authorize, request)
+    if error:
+        return _json(request, error[0], error[1])
+
+    data, error_response = await _read_message(request, "Initial message content is required")
+    if error_response:
+        return error_response
+    options = data.get('options', {})
+    rag_system = await run_in_threadpool(
+        chat_service.get_rag_system, options.get('language', 'ar'), options.get('reasoning', False)
+    )
+    # Only guests send their history; users start a fresh session
+    history = chat_service.guest_history(data.get('history'), rag_system) if not user_id else []
+    response_data = await rag_system.aquery(data['message'], history)
+
+    payload, status_code = await run_in_threadpool(
+        _save_new_session, request, user_id, guest_identifier, data['message'], response_data
+    )
+    return _json(request, payload, status_code)
+
+
+async def server_error(request: Request, exc: Exception):
+    """Unhandled errors of the async routes get the JSON error shape (and CORS headers) of the Flask routes"""
+    print(f"Error handling {request.url.path}: {str(exc)}")
+    return _json(request, {"error": str(exc)}, 500)
+
+
+app = Starlette(routes=[
+    Route('/api/chat/sessions/new', start_new_chat, methods=['POST']),
+    Route('/api/chat/sessions/{session_id}/message', add_message, methods=['POST']),
+    Route('/api/library/files/{file_id:path}', stream_library_file, methods=['GET', 'HEAD']),
+    Route('/api/journey/levels/{level_id}/resources/{resource_id}/content', stream_journey_resource,
+          methods=['GET', 'HEAD']),
+    Mount('/', app=WSGIMiddleware(flask_app, workers=int(os.environ.get('ASGI_WSGI_THREADS', 8)))),
+], exception_handlers={Exception: server_error})
@@ -0,0 +1,76 @@
+import re
+from typing import List
+
+# Tashkeel (harakat, tanween, shadda, sukun, superscript alef) and tatweel are dropped
+_DIACRITICS = [chr(c) for c in range(0x064B, 0x0660)] + ['ٰ', 'ـ']
+
+_CHAR_MAP = {
+    'أ': 'ا',
+    'إ': 'ا',
+    'آ': 'ا',
+    'ٱ': 'ا',
+    'ؤ': 'و',
+    'ئ': 'ي',
+    'ى': 'ي',
+    'ة': 'ه',
+}
+
+# Arabic-Indic digits are folded so "المادة ٤٦" and "المادة 46" index the same way
+_CHAR_MAP.update({chr(0x0660 + i): str(i) for i in range(10)})
+
+_TRANSLATION_TABLE = str.maketrans({
+    **{char: None for char in _DIACRITICS},
+    **_CHAR_MAP
+})
+
+# Definite article, alone or behind an attached conjunction/preposition
+_ARTICLE_PREFIXES = ('وال', 'فال', 'بال', 'كال', 'ال')
+
+_TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def normalize_arabic(text: str) -> str:
+    """
+    Fold text into the form used for indexing and matching.
+
+    Lower-cases, strips tashkeel and tatweel, and folds alef/hamza variants,
+    ta marbuta to ha and alef maqsura to ya. The mapping is character-wise,
+    so if a query is a substring of a text, the normalized query is still a
+    substring of the normalized text.
+
+    Args:
+        text (str): Raw text
+
+    Returns:
+        str: Normalized text
+    """
+    return text.lower().translate(_TRANSLATION_TABLE)
+
+
+def strip_definite_article(token: str) -> str:
+    """
+    Remove a leading "ال" (optionally preceded by و/ف/ب/ك) from a normalized token.
+    Short tokens are returned unchanged so that the article itself is not reduced to nothing.
+    """
+    for prefix in _ARTICLE_PREFIXES:
+        if token.startswith(prefix) and len(token) - len(prefix) >= 2:
+            return token[len(prefix):]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into normalized word tokens.
+
+    Args:
+        text (str): Raw text
+
+    Returns:
+        List[str]: Normalized tokens in their original order
+    """
+    return _TOKEN_PATTERN.findall(normalize_arabic(text))
+
+
+def stem_tokens(text: str) -> List[str]:
+    """Tokenize text and strip the definite article from every token."""
+    return [strip_definite_article(token) for token in tokenize(text)]
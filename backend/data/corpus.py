@@ -0,0 +1,172 @@
+import json
+import os
+import threading
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Default article files, in the order documents are numbered
+ARTICLE_FILES = {
+    'en': os.path.join(DATA_DIR, 'final_en.json'),
+    'ar': os.path.join(DATA_DIR, 'final_ar.json')
+}
+
+_corpus = None
+_corpus_mtimes = None
+_corpus_lock = threading.Lock()
+
+
+class ArticleCorpus:
+    """
+    Articles of the procurement system and its implementing regulation, loaded from
+    the per-language JSON files and partitioned into (language, type) shards.
+    Treat instances as read-only: they are shared by every service in the process
+    (see get_corpus).
+
+    Types are resolved to canonical ids once at load time ('النظام' and 'System'
+    become 'System', 'اللائحة' and 'Regulation' become 'Regulation'), so filtering
+    by type is a shard lookup rather than a per-article comparison.
+    """
+
+    # Type name (Arabic or English) -> canonical type id
+    TYPE_IDS = {
+        'النظام': 'System',
+        'System': 'System',
+        'اللائحة': 'Regulation',
+        'Regulation': 'Regulation'
+    }
+
+    # Filter value that selects every type
+    ALL_TYPES = 'Both'
+
+    def __init__(self, json_files: Dict[str, str]):
+        """
+        Args:
+            json_files (Dict[str, str]): Language code -> path of the articles JSON file
+        """
+        self.json_files = json_files
+        self.data: Dict[str, List[Dict]] = {}
+
+        # Flat list of searchable articles; positions are document ids and follow file order
+        self.documents: Tuple[Dict, ...] = ()
+        self.languages: Tuple[str, ...] = ()
+        self.type_ids: Tuple[str, ...] = ()
+
+        self.shards: Dict[Tuple[str, str], Tuple[int, ...]] = {}
+        self._ids_by_type: Dict[str, FrozenSet[int]] = {}
+        self._articles_by_number: Dict[Tuple[str, str], Dict[int, Dict]] = {}
+
+        self._load_json_files()
+        self._partition()
+
+    @classmethod
+    def canonical_type(cls, type_name: str) -> str:
+        """Canonical id of a type name; unknown names are their own id"""
+        return cls.TYPE_IDS.get(type_name, type_name)
+
+    def _load_json_files(self):
+        """Load JSON files into memory"""
+        for lang, filepath in self.json_files.items():
+            try:
+                with open(filepath, 'r', encoding='utf-8') as file:
+                    self.data[lang] = json.load(file)
+            except Exception as e:
+                print(f"Error loading {filepath}: {str(e)}")
+                self.data[lang] = []
+
+    def _partition(self):
+        """Assign document ids and build the per-language, per-type shards"""
+        documents, languages, type_ids = [], [], []
+        shards: Dict[Tuple[str, str], List[int]] = {}
+        ids_by_type: Dict[str, List[int]] = {}
+
+        for lang, dataset in self.data.items():
+            for item in dataset:
+                if not ('content' in item and item['content'] and 'type' in item):
+                    continue
+
+                doc_id = len(documents)
+                type_id = self.canonical_type(item['type'])
+                documents.append(item)
+                languages.append(lang)
+                type_ids.append(type_id)
+
+                shards.setdefault((lang, type_id), []).append(doc_id)
+                ids_by_type.setdefault(type_id, []).append(doc_id)
+
+                article_num = item.get('number')
+                if article_num:
+                    self._articles_by_number.setdefault((lang, type_id), {})[article_num] = item
+
+        # Stored as tuples/frozensets: the process-wide instance is shared between threads
+        self.documents = tuple(documents)
+        self.languages = tuple(languages)
+        self.type_ids = tuple(type_ids)
+        self.shards = {key: tuple(ids) for key, ids in shards.items()}
+        self._ids_by_type = {type_id: frozenset(ids) for type_id, ids in ids_by_type.items()}
+
+    def ids_for_type(self, doc_type: str) -> Optional[FrozenSet[int]]:
+        """
+        Document ids selected by a type filter.
+
+        Args:
+            doc_type (str): 'Both', or a type name in Arabic or English
+
+        Returns:
+            Optional[FrozenSet[int]]: Ids of the matching shards, or None when the
+            filter selects every document
+        """
+        if doc_type == self.ALL_TYPES:
+            return None
+        return self._ids_by_type.get(self.canonical_type(doc_type), frozenset())
+
+    def matches_type(self, doc_id: int, doc_type: str) -> bool:
+        """Whether a document passes a type filter"""
+        return doc_type == self.ALL_TYPES or self.type_ids[doc_id] == self.canonical_type(doc_type)
+
+    def articles_by_number(self, lang: str, doc_type: str) -> Dict[int, Dict]:
+        """
+        Articles of one shard indexed by article number.
+
+        Args:
+            lang (str): Language code ('ar' or 'en')
+            doc_type (str): Type name in Arabic or English
+
+        Returns:
+            Dict[int, Dict]: Article number -> article data
+        """
+        return self._articles_by_number.get((lang, self.canonical_type(doc_type)), {})
+
+
+def _article_files_mtimes() -> Tuple[float, ...]:
+    mtimes = []
+    for filepath in ARTICLE_FILES.values():
+        try:
+            mtimes.append(os.path.getmtime(filepath))
+        except OSError:
+            mtimes.append(0)
+    return tuple(mtimes)
+
+
+def get_corpus() -> ArticleCorpus:
+    """
+    The process-wide article corpus, loaded from ARTICLE_FILES on first use.
+
+    Search, tender mapping and the legacy app all share this instance, so the
+    JSON files are parsed once per process. With gunicorn --preload the corpus
+    is loaded before forking and its pages are shared between workers.
+
+    The files' modification times are checked on every call; when one of them
+    changes a new corpus is built. Consumers that derive structures from the
+    corpus (indexes, lookups) can compare identities to know when to rebuild.
+    """
+    global _corpus, _corpus_mtimes
+    mtimes = _article_files_mtimes()
+    if _corpus is None or mtimes != _corpus_mtimes:
+        with _corpus_lock:
+            if _corpus is None or mtimes != _corpus_mtimes:
+                if _corpus is not None:
+                    print(f"[{threading.get_ident()}] Article files changed. Reloading corpus.")
+                _corpus = ArticleCorpus(ARTICLE_FILES)
+                _corpus_mtimes = mtimes
+    return _corpus
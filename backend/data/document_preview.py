@@ -0,0 +1,68 @@
+import os
+from typing import Tuple
+
+# Extensions a thumbnail can be rendered for
+PREVIEW_EXTENSIONS = ('.pdf', '.jpg', '.jpeg', '.jfif', '.png', '.webp', '.gif')
+
+WEBP_QUALITY = 75
+
+
+def has_preview(file_name: str) -> bool:
+    return os.path.splitext(file_name)[1].lower() in PREVIEW_EXTENSIONS
+
+
+def _render_pdf(file_path: str, size: int):
+    import pypdfium2 as pdfium
+    document = pdfium.PdfDocument(file_path)
+    try:
+        page = document[0]
+        width, height = page.get_size()
+        # Render straight at thumbnail resolution instead of rendering the full page and downscaling
+        bitmap = page.render(scale=size / max(width, height, 1))
+        image = bitmap.to_pil()
+        page.close()
+        return image
+    finally:
+        document.close()
+
+
+def _load_image(file_path: str, size: int):
+    from PIL import Image, ImageOps
+    image = Image.open(file_path)
+    # Lets the JPEG decoder downscale by 2-8x while decoding
+    image.draft('RGB', (size, size))
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'transparency' in image.info or image.mode in ('LA', 'PA') else 'RGB')
+    return image
+
+
+def render_thumbnail(file_path: str, output_path: str, size: int = 256) -> Tuple[int, int]:
+    """
+    Render the first page of a PDF, or a downscaled image, as a WebP thumbnail
+    whose longest side is at most `size` pixels.
+
+    The file is written next to output_path and renamed into place, so
+    readers never see a partial thumbnail. Runs in worker processes.
+
+    Returns:
+        (width, height) of the thumbnail
+
+    Raises:
+        ValueError: For unsupported file types
+    """
+    from PIL import Image
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension == '.pdf':
+        image = _render_pdf(file_path, size)
+    elif extension in PREVIEW_EXTENSIONS:
+        image = _load_image(file_path, size)
+    else:
+        raise ValueError(f"Unsupported file type: {extension}")
+
+    image.thumbnail((size, size), Image.LANCZOS)
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    temporary_path = f"{output_path}.{os.getpid()}.tmp"
+    image.save(temporary_path, 'WEBP', quality=WEBP_QUALITY, method=4)
+    os.replace(temporary_path, output_path)
+    return image.size
@@ -0,0 +1,89 @@
+import hashlib
+import logging
+import os
+import unicodedata
+from typing import List
+
+# Extensions whose text can be extracted; .xls (BIFF) and images are not supported
+EXTRACTABLE_EXTENSIONS = ('.pdf', '.docx', '.xlsx')
+
+# DOCX files have no pages: paragraphs are grouped into pages of this size
+DOCX_PARAGRAPHS_PER_PAGE = 40
+
+
+def is_extractable(file_name: str) -> bool:
+    return os.path.splitext(file_name)[1].lower() in EXTRACTABLE_EXTENSIONS
+
+
+def file_hash(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """SHA-256 of a file's content, read in chunks"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _clean(text: str) -> str:
+    # NFKC folds Arabic presentation forms, common in PDF text layers, back to base letters
+    return unicodedata.normalize('NFKC', text or '').strip()
+
+
+def _pdf_pages(file_path: str) -> List[str]:
+    from pypdf import PdfReader
+    # pypdf logs a warning per unsupported font encoding; the text is extracted regardless
+    logging.getLogger('pypdf').setLevel(logging.ERROR)
+    reader = PdfReader(file_path)
+    return [_clean(page.extract_text()) for page in reader.pages]
+
+
+def _docx_pages(file_path: str) -> List[str]:
+    from docx import Document
+    document = Document(file_path)
+    paragraphs = [paragraph.text for paragraph in document.paragraphs if paragraph.text.strip()]
+    for table in document.tables:
+        for row in table.rows:
+            paragraphs.append(' | '.join(cell.text.strip() for cell in row.cells))
+    return [
+        _clean('\n'.join(paragraphs[start:start + DOCX_PARAGRAPHS_PER_PAGE]))
+        for start in range(0, len(paragraphs), DOCX_PARAGRAPHS_PER_PAGE)
+    ]
+
+
+def _xlsx_pages(file_path: str) -> List[str]:
+    """One page per worksheet, one line per non-empty row"""
+    from openpyxl import load_workbook
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        pages = []
+        for sheet in workbook.worksheets:
+            lines = []
+            for row in sheet.iter_rows(values_only=True):
+                cells = [str(value) for value in row if value is not None and str(value).strip()]
+                if cells:
+                    lines.append(' | '.join(cells))
+            pages.append(_clean('\n'.join([sheet.title] + lines)))
+        return pages
+    finally:
+        workbook.close()
+
+
+def extract_pages(file_path: str) -> List[str]:
+    """
+    Text of a PDF, DOCX or XLSX file, one string per page (DOCX: per group of
+    paragraphs, XLSX: per worksheet). Scanned PDFs without a text layer give
+    empty pages.
+
+    Runs in worker processes, so it only depends on the file path.
+
+    Raises:
+        ValueError: For unsupported file types
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension == '.pdf':
+        return _pdf_pages(file_path)
+    if extension == '.docx':
+        return _docx_pages(file_path)
+    if extension == '.xlsx':
+        return _xlsx_pages(file_path)
+    raise ValueError(f"Unsupported file type: {extension}")
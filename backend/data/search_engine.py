@@ -1,31 +1,39 @@
-import json
-import os
+import threading
+
+from data.corpus import ArticleCorpus, get_corpus
+from data.search_index import InvertedIndex
 
 class SearchEngine:
-    def __init__(self):
-        self.data_dir = os.path.dirname(os.path.abspath(__file__))
-        self.json_files = {
-            'en': os.path.join(self.data_dir, 'final_en.json'),
-            'ar': os.path.join(self.data_dir, 'final_ar.json')
-        }
-        self.data = {}
-        self._load_json_files()
-        
-        # Define type mappings between Arabic and English
-        self.type_mappings = {
-            'اللائحة': 'Regulation',
-            'النظام': 'System'
-        }
-    
-    def _load_json_files(self):
-        """Load JSON files into memory"""
-        for lang, filepath in self.json_files.items():
-            try:
-                with open(filepath, 'r', encoding='utf-8') as file:
-                    self.data[lang] = json.load(file)
-            except Exception as e:
-                print(f"Error loading {filepath}: {str(e)}")
-                self.data[lang] = []
+    # BM25 boost per article field used for ranking
+    FIELD_BOOSTS = {
+        'content': 1.0,
+        'summary': 1.5,
+        'keywords': 2.0
+    }
+
+    def __init__(self, corpus=None):
+        """
+        Args:
+            corpus (ArticleCorpus, optional): Corpus to search; defaults to the
+                process-wide corpus from get_corpus()
+        """
+        self.corpus = corpus or get_corpus()
+        self.json_files = self.corpus.json_files
+        self.data = self.corpus.data
+
+        # Document ids are positions in corpus.documents, so sorting ids reproduces file order
+        self.documents = self.corpus.documents
+        self.index = InvertedIndex(field_boosts=self.FIELD_BOOSTS)
+        self._build_index()
+
+    def _build_index(self):
+        """Index the ranked fields of every searchable article across all loaded files"""
+        for doc_id, item in enumerate(self.documents):
+            self.index.add(doc_id, {
+                'content': item['content'],
+                'summary': item.get('summary') or '',
+                'keywords': ' '.join(item.get('keywords') or [])
+            })
     
     def _matches_type_filter(self, item_type, filter_type):
         """
@@ -38,23 +46,15 @@ class SearchEngine:
         Returns:
             bool: True if matches, False otherwise
         """
-        if filter_type == "Both":
+        if filter_type == ArticleCorpus.ALL_TYPES:
             return True
-            
-        # Handle Arabic type filter
-        if filter_type in self.type_mappings:
-            return item_type == filter_type or item_type == self.type_mappings[filter_type]
-            
-        # Handle English type filter
-        reverse_mappings = {v: k for k, v in self.type_mappings.items()}
-        if filter_type in reverse_mappings:
-            return item_type == filter_type or item_type == reverse_mappings[filter_type]
-            
-        return item_type == filter_type
+        return ArticleCorpus.canonical_type(item_type) == ArticleCorpus.canonical_type(filter_type)
     
     def search(self, query_text, doc_type="Both"):
         """
-        Search for text in content fields across all loaded JSON files with type filtering
+        Search for text in the content, summary and keywords fields across all loaded
+        JSON files with type filtering. Terms are resolved through the inverted index, so results are a superset of a
+        plain case-insensitive substring match.
         
         Args:
             query_text (str): Text to search for
@@ -67,22 +67,75 @@ class SearchEngine:
         query_text = query_text.strip().lower()
         if not query_text:
             return []
-        
-        matches = []
-        
-        # Search in all loaded files
-        for dataset in self.data.values():
-            for item in dataset:
-                if 'content' in item and item['content'] and 'type' in item:
-                    # Check if item matches both text and type criteria
-                    if (query_text in item['content'].lower() and 
-                        self._matches_type_filter(item['type'], doc_type)):
-                        matches.append(item)
-        
-        return matches
 
-# Create a singleton instance
-search_engine = SearchEngine()
+        return [self.documents[doc_id] for doc_id in self._find(query_text, doc_type)]
+
+    def _find(self, query_text, doc_type):
+        """Ids of the documents matching a normalized query and type filter, in file order"""
+        type_ids = self.corpus.ids_for_type(doc_type)
+
+        doc_ids = self.index.lookup(query_text)
+        if doc_ids is None:
+            # Query has no indexable terms (e.g. only punctuation): exact substring scan
+            candidates = range(len(self.documents)) if type_ids is None else type_ids
+            doc_ids = {
+                doc_id for doc_id in candidates
+                if query_text in self.documents[doc_id]['content'].lower()
+            }
+        elif type_ids is not None:
+            doc_ids = doc_ids & type_ids
+
+        return sorted(doc_ids)
+
+    def search_ranked(self, query_text, doc_type="Both", page=1, page_size=10):
+        """
+        Search like `search`, but rank matches with BM25 over content, summary and
+        keywords and return a single page.
+
+        Every matching article is scored; only the top page * page_size are
+        sorted (heap-based), so deep pages do not sort the whole result set.
+
+        Args:
+            query_text (str): Text to search for
+            doc_type (str): Type of document to search for
+            page (int): 1-based page number
+            page_size (int): Number of results per page
+
+        Returns:
+            dict: {'results': [...], 'total_count': int, 'page': int, 'page_size': int};
+            each result is the article with an added 'relevance' score
+        """
+        query_text = query_text.strip().lower()
+        doc_ids = self._find(query_text, doc_type) if query_text else []
+
+        start = (page - 1) * page_size
+        ranked = self.index.top_k(query_text, doc_ids, start + page_size)[start:]
+
+        return {
+            'results': [
+                {**self.documents[doc_id], 'relevance': round(score, 4)}
+                for doc_id, score in ranked
+            ],
+            'total_count': len(doc_ids),
+            'page': page,
+            'page_size': page_size
+        }
+
+_search_engine = None
+_search_engine_lock = threading.Lock()
+
+def get_search_engine():
+    """
+    The process-wide search engine over the shared corpus, built on first use
+    and rebuilt whenever get_corpus() returns a reloaded corpus
+    """
+    global _search_engine
+    corpus = get_corpus()
+    if _search_engine is None or _search_engine.corpus is not corpus:
+        with _search_engine_lock:
+            if _search_engine is None or _search_engine.corpus is not corpus:
+                _search_engine = SearchEngine(corpus)
+    return _search_engine
 
 def search_content(query_text, doc_type="Both"):
     """
@@ -96,7 +149,7 @@ def search_content(query_text, doc_type="Both"):
     Returns:
         list: List of matching objects
     """
-    return search_engine.search(query_text, doc_type)
+    return get_search_engine().search(query_text, doc_type)
 
 if __name__ == "__main__":
     # Example usage
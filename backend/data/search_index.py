@@ -0,0 +1,193 @@
+import heapq
+import math
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from data.arabic_text import strip_definite_article, tokenize
+
+
+class InvertedIndex:
+    """
+    In-memory inverted index over normalized Arabic/English tokens with BM25 ranking.
+
+    Every token is indexed both in its normalized form and with the definite
+    article removed. A query term matches every indexed term that contains it,
+    which keeps the results a superset of a plain substring scan while only
+    touching the vocabulary instead of the documents.
+
+    Documents are made of named fields (e.g. content, summary, keywords); each
+    field keeps its own term frequencies and lengths and contributes to the
+    BM25 score with its own boost.
+    """
+
+    # Upper bound on memoized term expansions before the memo is reset
+    MAX_CACHED_EXPANSIONS = 4096
+
+    # BM25 parameters
+    K1 = 1.2
+    B = 0.75
+
+    # Weight of a query term matched inside a longer indexed term (e.g. "contract" in "contractor")
+    PARTIAL_MATCH_WEIGHT = 0.5
+
+    def __init__(self, field_boosts: Optional[Dict[str, float]] = None):
+        self.field_boosts = field_boosts or {'content': 1.0}
+        self._postings: Dict[str, Set[int]] = defaultdict(set)
+        self._term_freqs: Dict[str, Dict[str, Dict[int, int]]] = {
+            field: defaultdict(dict) for field in self.field_boosts
+        }
+        self._field_lengths: Dict[str, Dict[int, int]] = {field: {} for field in self.field_boosts}
+        self._total_field_lengths: Dict[str, int] = {field: 0 for field in self.field_boosts}
+        self._expansions: Dict[str, Tuple[List[str], Set[int]]] = {}
+        self.doc_count = 0
+
+    @staticmethod
+    def index_terms(text: str) -> List[str]:
+        """Terms stored for a piece of text: every normalized token plus its stem when different"""
+        terms = []
+        for token in tokenize(text):
+            terms.append(token)
+            stem = strip_definite_article(token)
+            if stem != token:
+                terms.append(stem)
+        return terms
+
+    @staticmethod
+    def query_terms(query: str) -> List[str]:
+        """Distinct stemmed terms of a query, in query order"""
+        terms = []
+        for token in tokenize(query):
+            term = strip_definite_article(token)
+            if term not in terms:
+                terms.append(term)
+        return terms
+
+    def add(self, doc_id: int, fields: Dict[str, str]):
+        """
+        Index a document.
+
+        Args:
+            doc_id (int): Caller-defined document identifier
+            fields (Dict[str, str]): Text per field; fields without a boost are ignored
+        """
+        for field, text in fields.items():
+            if field not in self.field_boosts or not text:
+                continue
+
+            tokens = tokenize(text)
+            self._field_lengths[field][doc_id] = len(tokens)
+            self._total_field_lengths[field] += len(tokens)
+
+            term_freqs = self._term_freqs[field]
+            for term in self.index_terms(text):
+                term_freqs[term][doc_id] = term_freqs[term].get(doc_id, 0) + 1
+                self._postings[term].add(doc_id)
+
+        self.doc_count += 1
+        self._expansions.clear()
+
+    def _expand(self, term: str) -> Tuple[List[str], Set[int]]:
+        """Indexed terms containing `term`, and the union of their posting lists"""
+        cached = self._expansions.get(term)
+        if cached is not None:
+            return cached
+
+        matched_terms = []
+        doc_ids = set()
+        for indexed_term, postings in self._postings.items():
+            if term in indexed_term:
+                matched_terms.append(indexed_term)
+                doc_ids |= postings
+
+        if len(self._expansions) >= self.MAX_CACHED_EXPANSIONS:
+            self._expansions.clear()
+        self._expansions[term] = (matched_terms, doc_ids)
+        return matched_terms, doc_ids
+
+    def lookup(self, query: str) -> Optional[Set[int]]:
+        """
+        Resolve a query to the documents containing all of its terms.
+
+        Args:
+            query (str): Raw query text
+
+        Returns:
+            Optional[Set[int]]: Matching document ids, or None when the query has
+            no indexable terms (e.g. punctuation only) and the caller should fall
+            back to a substring scan
+        """
+        terms = self.query_terms(query)
+        if not terms:
+            return None
+
+        # Intersect from the rarest term so the working set shrinks quickly
+        postings = sorted((self._expand(term)[1] for term in terms), key=len)
+        result = set(postings[0])
+        for posting in postings[1:]:
+            if not result:
+                break
+            result &= posting
+        return result
+
+    def _idf(self, term: str) -> float:
+        doc_freq = len(self._postings.get(term, ()))
+        return math.log(1 + (self.doc_count - doc_freq + 0.5) / (doc_freq + 0.5))
+
+    def score(self, query: str, doc_ids: Iterable[int]) -> Dict[int, float]:
+        """
+        BM25 score of each candidate document for a query.
+
+        For every query term, the best-scoring indexed term it expands to is used,
+        so a token and its stem are not counted twice.
+
+        Args:
+            query (str): Raw query text
+            doc_ids (Iterable[int]): Candidate documents (usually from lookup)
+
+        Returns:
+            Dict[int, float]: Score per candidate document
+        """
+        candidates = set(doc_ids)
+        scores = {doc_id: 0.0 for doc_id in candidates}
+        if not candidates:
+            return scores
+
+        avg_lengths = {
+            field: (total / len(self._field_lengths[field])) if self._field_lengths[field] else 0.0
+            for field, total in self._total_field_lengths.items()
+        }
+
+        for query_term in self.query_terms(query):
+            best: Dict[int, Dict[str, float]] = defaultdict(dict)
+            for term in self._expand(query_term)[0]:
+                weight = self._idf(term) * (1.0 if term == query_term else self.PARTIAL_MATCH_WEIGHT)
+                for field, boost in self.field_boosts.items():
+                    field_freqs = self._term_freqs[field].get(term)
+                    if not field_freqs:
+                        continue
+                    lengths = self._field_lengths[field]
+                    for doc_id in candidates.intersection(field_freqs):
+                        tf = field_freqs[doc_id]
+                        norm = 1 - self.B + self.B * lengths[doc_id] / (avg_lengths[field] or 1.0)
+                        contribution = boost * weight * tf * (self.K1 + 1) / (tf + self.K1 * norm)
+                        # Fields of the same term add up; alternative expansions keep the best
+                        best[doc_id][term] = best[doc_id].get(term, 0.0) + contribution
+            for doc_id, per_term in best.items():
+                scores[doc_id] += max(per_term.values())
+
+        return scores
+
+    def top_k(self, query: str, doc_ids: Iterable[int], k: int) -> List[Tuple[int, float]]:
+        """
+        The k best-scoring candidates, highest first (ties keep ascending doc id order).
+
+        Args:
+            query (str): Raw query text
+            doc_ids (Iterable[int]): Candidate documents
+            k (int): Number of results to keep
+
+        Returns:
+            List[Tuple[int, float]]: (doc_id, score) pairs
+        """
+        scores = self.score(query, doc_ids)
+        return heapq.nsmallest(k, scores.items(), key=lambda entry: (-entry[1], entry[0]))
@@ -0,0 +1,23 @@
+# gunicorn.conf.py
+"""
+Gunicorn settings for the ASGI app (asgi.py).
+
+Every worker builds its RAG systems (Chroma collection, embedding and LLM
+clients, QA chain) right after it is forked, before it accepts requests, so
+the first chat of each language does not pay the start-up cost. Languages are
+set with RAG_WARMUP_LANGUAGES (see src/registry.py). Each worker also starts
+its library indexes (app/services/library_service.py).
+"""
+import os
+
+bind = f":{os.environ.get('PORT', '8080')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', 1))
+worker_class = 'uvicorn_worker.UvicornWorker'
+timeout = 0
+
+
+def post_fork(server, worker):
+    from src.registry import warm_up_from_env
+    warm_up_from_env()
+    from app.api.library import library_service
+    library_service.start()
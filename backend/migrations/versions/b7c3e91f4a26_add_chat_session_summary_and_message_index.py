@@ -0,0 +1,34 @@
+"""Add chat session summary and chat message (session_id, created_at) index
+
+Revision ID: b7c3e91f4a26
+Revises: 544689ef5d46
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7c3e91f4a26'
+down_revision = '544689ef5d46'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('chat_sessions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('summary', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('summary_turns', sa.Integer(), nullable=False, server_default='0'))
+
+    with op.batch_alter_table('chat_messages', schema=None) as batch_op:
+        batch_op.create_index('ix_chat_messages_session_id_created_at', ['session_id', 'created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('chat_messages', schema=None) as batch_op:
+        batch_op.drop_index('ix_chat_messages_session_id_created_at')
+
+    with op.batch_alter_table('chat_sessions', schema=None) as batch_op:
+        batch_op.drop_column('summary_turns')
+        batch_op.drop_column('summary')
@@ -5,5 +5,7 @@ from app import create_app
 app = create_app()
 
 if __name__ == '__main__':
+    from app.api.library import library_service
+    library_service.start()
     port = int(os.environ.get('PORT', 8080))
     app.run(host='0.0.0.0', port=port, debug=False)
\ No newline at end of file
@@ -3,6 +3,8 @@ from .document_processor import DocumentProcessor
 from .vector_store import VectorStoreHandler
 from .qa_chain import QAChainHandler
 from .rag_system import ArabicRAGSystem
+from .answer_cache import SemanticAnswerCache
+from .embedding_cache import CachedEmbeddings, EmbeddingCache
 
 __all__ = [
     'RAGConfig',
@@ -10,5 +12,8 @@ __all__ = [
     'DocumentProcessor',
     'VectorStoreHandler',
     'QAChainHandler',
-    'ArabicRAGSystem'
+    'ArabicRAGSystem',
+    'SemanticAnswerCache',
+    'CachedEmbeddings',
+    'EmbeddingCache'
 ]
@@ -0,0 +1,282 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from langchain.schema import Document
+
+from data.arabic_text import stem_tokens
+
+_caches: Dict[str, "SemanticAnswerCache"] = {}
+_caches_lock = threading.Lock()
+
+# Terms that change the legal answer while barely moving the question embedding
+# (competition type, decision, deadline kind): "المنافسة العامة" and "المنافسة
+# المحدودة" questions embed above 0.95. Questions only share answers when they
+# mention the same ones (see key_terms).
+KEY_TERMS = frozenset(stem_tokens(
+    "العامة المحدودة المباشر الترسية الإلغاء التمديد الإعلان التظلم الاستبعاد الضمان الابتدائي النهائي "
+    "الغرامة التأخير الاستلام الإنهاء الإطارية المزايدة "
+    "general limited direct award cancellation extension announcement grievance exclusion "
+    "guarantee initial final penalty delay delivery termination framework auction"
+))
+
+
+def key_terms(question: str) -> List[str]:
+    """The KEY_TERMS a question mentions, sorted"""
+    return sorted(set(stem_tokens(question)) & KEY_TERMS)
+
+
+class SemanticAnswerCache:
+    """
+    Cache of RAG answers looked up by question similarity instead of exact text.
+
+    Entries are grouped by namespace (language, reasoning flag and model) and
+    store the question embedding, the answer and its source documents. A new
+    question hits an entry when the cosine similarity of the embeddings reaches
+    the threshold. Embeddings are kept in memory as one normalized float32
+    matrix per namespace, so a lookup is a single matrix-vector product.
+
+    Entries are persisted in SQLite and reloaded on start-up. They expire after
+    ttl_seconds, the least recently used ones are evicted beyond max_entries, and
+    a namespace is emptied when the fingerprint of its Chroma collection changes.
+    """
+
+    def __init__(self, db_path: str, similarity_threshold: float = 0.95,
+                 max_entries: int = 2000, ttl_seconds: float = 7 * 24 * 3600):
+        self.db_path = db_path
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS answer_cache (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                namespace TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                question TEXT NOT NULL,
+                embedding BLOB NOT NULL,
+                answer TEXT NOT NULL,
+                source_documents TEXT NOT NULL,
+                formatted_sources TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_answer_cache_namespace ON answer_cache (namespace)")
+        self._conn.commit()
+
+        # namespace -> {"ids": [...], "matrix": np.ndarray, "created": [...]}
+        self._namespaces: Dict[str, Dict[str, Any]] = {}
+        self._fingerprints: Dict[str, str] = {}
+        # entry id -> last use time, least recently used first
+        self._last_used: "OrderedDict[int, float]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+        self._load()
+
+    @staticmethod
+    def _normalize(embedding) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _load(self):
+        """Rebuild the in-memory matrices from the SQLite table"""
+        rows = self._conn.execute(
+            "SELECT id, namespace, fingerprint, embedding, created_at, last_used FROM answer_cache ORDER BY id"
+        ).fetchall()
+        for entry_id, namespace, fingerprint, embedding, created_at, last_used in rows:
+            self._fingerprints[namespace] = fingerprint
+            self._append(namespace, entry_id, np.frombuffer(embedding, dtype=np.float32), created_at)
+        for entry_id, last_used in sorted(((row[0], row[5]) for row in rows), key=lambda entry: entry[1]):
+            self._last_used[entry_id] = last_used
+
+    def _append(self, namespace: str, entry_id: int, vector: np.ndarray, created_at: float):
+        group = self._namespaces.get(namespace)
+        if group is None or group["matrix"].shape[1] != vector.shape[0]:
+            group = {"ids": [], "created": [], "matrix": np.empty((0, vector.shape[0]), dtype=np.float32)}
+            self._namespaces[namespace] = group
+        group["ids"].append(entry_id)
+        group["created"].append(created_at)
+        group["matrix"] = np.vstack([group["matrix"], vector[np.newaxis, :]])
+
+    def _delete(self, entry_ids: List[int]):
+        """Remove entries from the table and the in-memory matrices (lock held)"""
+        if not entry_ids:
+            return
+        doomed = set(entry_ids)
+        self._conn.executemany("DELETE FROM answer_cache WHERE id = ?", [(entry_id,) for entry_id in doomed])
+        self._conn.commit()
+        for namespace, group in list(self._namespaces.items()):
+            keep = [index for index, entry_id in enumerate(group["ids"]) if entry_id not in doomed]
+            if len(keep) == len(group["ids"]):
+                continue
+            group["ids"] = [group["ids"][index] for index in keep]
+            group["created"] = [group["created"][index] for index in keep]
+            group["matrix"] = group["matrix"][keep]
+            if not group["ids"]:
+                del self._namespaces[namespace]
+        for entry_id in doomed:
+            self._last_used.pop(entry_id, None)
+
+    def _check_fingerprint(self, namespace: str, fingerprint: str):
+        """Drop a namespace whose collection changed since its entries were stored (lock held)"""
+        previous = self._fingerprints.get(namespace)
+        if previous is not None and previous != fingerprint:
+            group = self._namespaces.get(namespace)
+            if group:
+                print(f"Vector collection for '{namespace}' changed. Invalidating {len(group['ids'])} cached answers.")
+                self._delete(list(group["ids"]))
+            self.invalidations += 1
+        self._fingerprints[namespace] = fingerprint
+
+    def lookup(self, namespace: str, embedding, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """
+        Find a cached answer for a question embedding.
+
+        Args:
+            namespace: Cache partition (e.g. language, reasoning flag and model)
+            embedding: Embedding of the new question
+            fingerprint: Current fingerprint of the vector collection
+
+        Returns:
+            Dict with answer, source_documents (Documents), formatted_sources and
+            similarity, or None on a miss
+        """
+        query = self._normalize(embedding)
+        now = time.time()
+        with self._lock:
+            self._check_fingerprint(namespace, fingerprint)
+            group = self._namespaces.get(namespace)
+            if not group or group["matrix"].shape[1] != query.shape[0]:
+                self.misses += 1
+                return None
+
+            # Expired entries are removed lazily
+            expired = [entry_id for entry_id, created in zip(group["ids"], group["created"])
+                       if now - created > self.ttl_seconds]
+            if expired:
+                self._delete(expired)
+                group = self._namespaces.get(namespace)
+                if not group:
+                    self.misses += 1
+                    return None
+
+            similarities = group["matrix"] @ query
+            best = int(np.argmax(similarities))
+            similarity = float(similarities[best])
+            if similarity < self.similarity_threshold:
+                self.misses += 1
+                return None
+
+            entry_id = group["ids"][best]
+            row = self._conn.execute(
+                "SELECT answer, source_documents, formatted_sources FROM answer_cache WHERE id = ?",
+                (entry_id,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._last_used[entry_id] = now
+            self._last_used.move_to_end(entry_id)
+            self._conn.execute("UPDATE answer_cache SET last_used = ? WHERE id = ?", (now, entry_id))
+            self._conn.commit()
+            self.hits += 1
+
+        answer, source_documents, formatted_sources = row
+        return {
+            "answer": answer,
+            "source_documents": [
+                Document(page_content=doc["page_content"], metadata=doc["metadata"])
+                for doc in json.loads(source_documents)
+            ],
+            "formatted_sources": json.loads(formatted_sources),
+            "similarity": similarity
+        }
+
+    def store(self, namespace: str, question: str, embedding, response: Dict[str, Any], fingerprint: str):
+        """
+        Add an answer to the cache, evicting the least recently used entries beyond max_entries.
+
+        Args:
+            namespace: Cache partition
+            question: Question text (kept for inspection)
+            embedding: Embedding of the question
+            response: Result of QAChainHandler.query
+            fingerprint: Fingerprint of the vector collection the answer was retrieved from
+        """
+        vector = self._normalize(embedding)
+        source_documents = json.dumps([
+            {"page_content": doc.page_content, "metadata": doc.metadata}
+            for doc in response.get("source_documents", [])
+        ], ensure_ascii=False)
+        formatted_sources = json.dumps(response.get("formatted_sources", []), ensure_ascii=False)
+        now = time.time()
+
+        with self._lock:
+            self._check_fingerprint(namespace, fingerprint)
+            cursor = self._conn.execute(
+                """INSERT INTO answer_cache (namespace, fingerprint, question, embedding, answer,
+                   source_documents, formatted_sources, created_at, last_used)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (namespace, fingerprint, question, vector.tobytes(), response["answer"],
+                 source_documents, formatted_sources, now, now)
+            )
+            self._conn.commit()
+            self._append(namespace, cursor.lastrowid, vector, now)
+            self._last_used[cursor.lastrowid] = now
+            self.stores += 1
+
+            overflow = len(self._last_used) - self.max_entries
+            if overflow > 0:
+                oldest = list(self._last_used)[:overflow]
+                self._delete(oldest)
+                self.evictions += len(oldest)
+
+    def clear(self):
+        """Drop every entry; counters are kept"""
+        with self._lock:
+            self._conn.execute("DELETE FROM answer_cache")
+            self._conn.commit()
+            self._namespaces.clear()
+            self._fingerprints.clear()
+            self._last_used.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Entry count and hit/miss counters since start-up"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._last_used),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "similarity_threshold": self.similarity_threshold,
+                "hits": self.hits,
+                "misses": self.misses,
+                "stores": self.stores,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+def get_answer_cache(db_path: str, **kwargs) -> SemanticAnswerCache:
+    """Process-wide cache for a database file, shared by every RAG system that uses it"""
+    with _caches_lock:
+        cache = _caches.get(db_path)
+        if cache is None:
+            cache = SemanticAnswerCache(db_path, **kwargs)
+            _caches[db_path] = cache
+        return cache
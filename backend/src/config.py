@@ -1,6 +1,6 @@
 import os
 from dataclasses import dataclass
-from typing import Literal
+from typing import Literal, Optional
 from dotenv import load_dotenv
 from pathlib import Path
 
@@ -12,11 +12,37 @@ class RAGConfig:
     """Configuration settings for the RAG system."""
     openai_api_key: str
     lang: Literal["ar", "en"] = "ar"  # Default to Arabic
-    embedding_model: str = "text-embedding-3-small"
+    # OpenAI model name, or "local:<fastembed model>" for a local CPU model (see embeddings.py)
+    embedding_model: str = "text-embedding-ada-002"
+    embedding_batch_size: int = 64
+    # Query embedding cache (see embedding_cache.py); an empty path keeps it in memory only
+    embedding_cache_enabled: bool = True
+    embedding_cache_path: str = os.path.join("app", "embedding_cache.sqlite3")
+    embedding_cache_max_entries: int = 10000
     llm_model: str = "gpt-4-turbo-preview" #gpt-4-turbo-preview   o3-mini
     chunk_size: int = 500
     chunk_overlap: int = 50
     temperature: float = 0.3 #0.3
+    # Token budget of the retrieved context; None uses the model's budget (see context_builder.py)
+    context_max_tokens: Optional[int] = None
+    # Fuse BM25 with the dense search and answer article-number questions directly (see hybrid_retriever.py)
+    hybrid_retrieval: bool = True
+    reasoning: bool = False
+    # History-aware mode (see conversation.py): follow-ups are condensed with a small model
+    # from a running summary plus the last history_window turns
+    history_aware: bool = True
+    history_window: int = 4
+    summary_max_words: int = 150
+    condense_model: str = "gpt-4o-mini"
+    # Upper bound on concurrent async LLM requests per process
+    llm_max_concurrency: int = 32
+    # Semantic answer cache (see answer_cache.py)
+    answer_cache_enabled: bool = True
+    answer_cache_path: str = os.path.join("app", "answer_cache.sqlite3")
+    # ada-002 scores reworded questions about other procedures above 0.95
+    answer_cache_threshold: float = 0.98
+    answer_cache_max_entries: int = 2000
+    answer_cache_ttl_seconds: int = 7 * 24 * 3600
 
 def load_config(language= 'ar', reasoning = False) -> RAGConfig:
     """Load configuration from environment variables."""
@@ -31,7 +57,16 @@ def load_config(language= 'ar', reasoning = False) -> RAGConfig:
     
     config = RAGConfig(
         openai_api_key=openai_api_key,
-        lang=lang
+        lang=lang,
+        reasoning=reasoning,
+        answer_cache_enabled=os.getenv("RAG_ANSWER_CACHE_ENABLED", "true").lower() == "true",
+        history_aware=os.getenv("RAG_HISTORY_AWARE", "true").lower() == "true",
+        context_max_tokens=int(os.getenv("RAG_CONTEXT_MAX_TOKENS", "0")) or None,
+        hybrid_retrieval=os.getenv("RAG_HYBRID_RETRIEVAL", "true").lower() == "true",
+        llm_max_concurrency=int(os.getenv("RAG_LLM_MAX_CONCURRENCY", "32")),
+        embedding_model=os.getenv("RAG_EMBEDDING_MODEL", RAGConfig.embedding_model),
+        embedding_cache_enabled=os.getenv("RAG_EMBEDDING_CACHE_ENABLED", "true").lower() == "true",
+        embedding_cache_path=os.getenv("RAG_EMBEDDING_CACHE_PATH", RAGConfig.embedding_cache_path)
     )
 
     if reasoning:
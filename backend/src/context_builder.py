@@ -0,0 +1,144 @@
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import tiktoken
+from langchain_core.documents import Document
+
+# Context tokens per LLM model; other models get DEFAULT_CONTEXT_TOKENS
+CONTEXT_TOKEN_BUDGETS = {
+    "gpt-4-turbo-preview": 6000,
+    "o3-mini": 6000,
+    "gpt-4o-mini": 4000,
+}
+DEFAULT_CONTEXT_TOKENS = 3000
+
+# A chunk is cut to fit the remaining budget only if at least this many tokens remain
+MIN_PARTIAL_TOKENS = 64
+
+# Longest chunk overlap looked for when merging consecutive chunks of one article
+MAX_OVERLAP_CHARS = 400
+
+# Metadata that identifies an article: the law and the regulation both have an
+# article N, and collections ingested before "type" was stored only differ in
+# their chapter and section
+ARTICLE_KEY_FIELDS = ("article_number", "type", "chapter_number", "chapter_name", "section_number", "section_name")
+
+
+class _ApproximateTokenizer:
+    """Fallback when the tiktoken encoding files cannot be loaded: about two characters per token."""
+    CHARS_PER_TOKEN = 2
+
+    def encode(self, text: str) -> List[str]:
+        return [text[start:start + self.CHARS_PER_TOKEN] for start in range(0, len(text), self.CHARS_PER_TOKEN)]
+
+    def decode(self, tokens: List[str]) -> str:
+        return "".join(tokens)
+
+
+@lru_cache(maxsize=None)
+def get_tokenizer(model_name: str):
+    """The tiktoken encoding of a model (cl100k_base for unknown models), loaded once per process"""
+    try:
+        try:
+            return tiktoken.encoding_for_model(model_name)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        print(f"Error loading tokenizer for {model_name}, estimating token counts: {str(e)}")
+        return _ApproximateTokenizer()
+
+
+def context_budget(model_name: str, override: Optional[int] = None) -> int:
+    return override or CONTEXT_TOKEN_BUDGETS.get(model_name, DEFAULT_CONTEXT_TOKENS)
+
+
+def _merge_overlapping(first: str, second: str) -> str:
+    """Join two chunks of one article, dropping the text the splitter repeated at their boundary"""
+    if second in first:
+        return first
+    for size in range(min(len(first), len(second), MAX_OVERLAP_CHARS), 0, -1):
+        if first.endswith(second[:size]):
+            return first + second[size:]
+    return first + "\n" + second
+
+
+class ContextBuilder:
+    """
+    Packs retrieved chunks into the "stuff" prompt context within a token budget.
+
+    Chunks are ordered by score (retrieval rank when no scores are given);
+    chunks of the same article are merged into one block, without the text
+    repeated by the splitter's overlap, at the position of the article's best
+    chunk. Every block starts with its article number so the answer can cite
+    it. Blocks are added until the budget is reached; the block that crosses
+    it is cut to the remaining tokens.
+    """
+
+    def __init__(self, model_name: str, max_tokens: Optional[int] = None, lang: str = "ar", tokenizer: Any = None):
+        self.max_tokens = context_budget(model_name, max_tokens)
+        self.lang = lang
+        self.tokenizer = tokenizer or get_tokenizer(model_name)
+
+    def count_tokens(self, text: str) -> int:
+        return len(self.tokenizer.encode(text))
+
+    def _header(self, metadata: Dict[str, Any]) -> str:
+        if metadata.get("article_number") is None:
+            return ""
+        if self.lang in ("ar", "sa"):
+            return f"[المادة {metadata['article_number']}]\n"
+        return f"[Article {metadata['article_number']}]\n"
+
+    def merge(self, documents: Sequence[Document], scores: Optional[Sequence[float]] = None) -> List[Document]:
+        """One document per article (or per chunk without article number), best first"""
+        order = range(len(documents))
+        if scores is not None:
+            order = sorted(order, key=lambda index: -scores[index])
+
+        merged: Dict[Any, Document] = {}
+        for index in order:
+            document = documents[index]
+            if document.metadata.get("article_number") is not None:
+                key = tuple(document.metadata.get(field) for field in ARTICLE_KEY_FIELDS)
+            else:
+                key = ("chunk", index)
+            if key in merged:
+                kept = merged[key]
+                merged[key] = Document(
+                    page_content=_merge_overlapping(kept.page_content, document.page_content),
+                    metadata=kept.metadata
+                )
+            else:
+                merged[key] = document
+        return list(merged.values())
+
+    def build(self, documents: Sequence[Document],
+              scores: Optional[Sequence[float]] = None) -> Tuple[str, List[Document]]:
+        """
+        Args:
+            documents: Retrieved chunks, best first unless scores are given
+            scores: Relevance score per chunk (higher is better)
+
+        Returns:
+            (context text, the documents it contains), the latter serving as the answer's sources
+        """
+        blocks, kept = [], []
+        remaining = self.max_tokens
+        separator_tokens = self.count_tokens("\n\n")
+
+        for document in self.merge(documents, scores):
+            block = self._header(document.metadata) + document.page_content
+            tokens = self.tokenizer.encode(block)
+            cost = len(tokens) + (separator_tokens if blocks else 0)
+            if cost <= remaining:
+                blocks.append(block)
+                kept.append(document)
+                remaining -= cost
+                continue
+            available = remaining - (separator_tokens if blocks else 0)
+            if available >= MIN_PARTIAL_TOKENS:
+                blocks.append(self.tokenizer.decode(tokens[:available]))
+                kept.append(document)
+            break
+
+        return "\n\n".join(blocks), kept
@@ -0,0 +1,89 @@
+from typing import List, Optional, Sequence, Tuple
+from langchain_core.language_models import BaseChatModel
+from .templates import get_conversation_templates
+
+# Longest answer excerpt kept per turn in condense/summary prompts
+MAX_ANSWER_CHARS = 600
+
+
+def format_turns(turns: Sequence[Tuple[str, str]], lang: str) -> str:
+    """(question, answer) turns as prompt lines; long answers are truncated."""
+    user, assistant = ("المستخدم", "المساعد") if lang in ("ar", "sa") else ("User", "Assistant")
+    lines = []
+    for question, answer in turns:
+        lines.append(f"{user}: {question}")
+        if answer:
+            excerpt = answer if len(answer) <= MAX_ANSWER_CHARS else answer[:MAX_ANSWER_CHARS] + "…"
+            lines.append(f"{assistant}: {excerpt}")
+    return "\n".join(lines)
+
+
+class ConversationCondenser:
+    """
+    Turns a follow-up question into a standalone one for retrieval, and keeps a
+    running conversation summary.
+
+    The prompt only ever holds the summary plus the last `window` turns, so its
+    size stays bounded however long the conversation grows; turns leaving the
+    window are folded into the summary.
+    """
+
+    def __init__(self, llm: BaseChatModel, lang: str, window: int = 4, summary_max_words: int = 150):
+        self.llm = llm
+        self.lang = lang
+        self.window = window
+        self.summary_max_words = summary_max_words
+        self.condense_template, self.summary_template = get_conversation_templates(lang)
+
+    def needs_condensing(self, chat_history: Optional[List[Tuple[str, str]]], summary: Optional[str]) -> bool:
+        return bool(chat_history) or bool(summary)
+
+    def _condense_prompt(self, question: str, chat_history, summary: Optional[str]) -> str:
+        return self.condense_template.format(
+            summary=summary or "-",
+            history=format_turns((chat_history or [])[-self.window:], self.lang) or "-",
+            question=question
+        )
+
+    def condense(self, question: str, chat_history: Optional[List[Tuple[str, str]]] = None,
+                 summary: Optional[str] = None) -> str:
+        """
+        Standalone version of a question. Returned unchanged, without an LLM call,
+        when there is no history or summary, or when condensing fails.
+        """
+        if not self.needs_condensing(chat_history, summary):
+            return question
+        try:
+            standalone = self.llm.invoke(self._condense_prompt(question, chat_history, summary)).content.strip()
+            return standalone or question
+        except Exception as e:
+            print(f"Error condensing question: {str(e)}")
+            return question
+
+    async def acondense(self, question: str, chat_history: Optional[List[Tuple[str, str]]] = None,
+                        summary: Optional[str] = None) -> str:
+        """Async variant of condense()."""
+        if not self.needs_condensing(chat_history, summary):
+            return question
+        try:
+            message = await self.llm.ainvoke(self._condense_prompt(question, chat_history, summary))
+            return message.content.strip() or question
+        except Exception as e:
+            print(f"Error condensing question: {str(e)}")
+            return question
+
+    def update_summary(self, summary: Optional[str], turns: Sequence[Tuple[str, str]]) -> str:
+        """
+        Fold turns that left the history window into the running summary.
+
+        Raises:
+            Exception: When the LLM call fails; the caller keeps the previous summary
+        """
+        if not turns:
+            return summary or ""
+        prompt = self.summary_template.format(
+            summary=summary or "-",
+            history=format_turns(turns, self.lang),
+            max_words=self.summary_max_words
+        )
+        return self.llm.invoke(prompt).content.strip()
@@ -1,6 +1,9 @@
+import hashlib
+import json
 from docx import Document
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-from typing import List
+from typing import Any, Dict, List
+from data.corpus import ArticleCorpus
 
 class DocumentProcessor:
     """Handles document loading and text processing."""
@@ -27,3 +30,39 @@ class DocumentProcessor:
         """Split text into chunks for processing."""
         chunks = self.text_splitter.split_text(text)
         return [chunk for chunk in chunks if len(chunk.strip()) > 50]
+
+    def split_articles(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Split articles (entries of data/final_*.json) into chunks for the vector store.
+
+        Every chunk gets a stable id from its article type, number and position
+        ("System-46-0") and a content hash over its text and metadata, so an
+        ingestion run can tell new, changed and unchanged chunks apart.
+
+        Returns:
+            List of {"id", "text", "metadata"} dicts
+        """
+        chunks = []
+        for article in articles:
+            type_id = ArticleCorpus.canonical_type(article.get('type', '')) or 'Article'
+            metadata = {
+                "article_number": article['number'],
+                "type": type_id,
+                "chapter_number": article['chapter']['number'],
+                "chapter_name": article['chapter']['name'],
+                "section_number": article['section']['number'],
+                "section_name": article['section']['name'],
+                "summary": article.get('summary', '')
+            }
+            # Short articles are kept whole (process_text drops chunks under 50 characters)
+            texts = [text for text in self.text_splitter.split_text(article['content']) if text.strip()]
+            for index, text in enumerate(texts):
+                content_hash = hashlib.sha256(
+                    json.dumps([text, metadata], ensure_ascii=False, sort_keys=True).encode('utf-8')
+                ).hexdigest()
+                chunks.append({
+                    "id": f"{type_id}-{article['number']}-{index}",
+                    "text": text,
+                    "metadata": {**metadata, "content_hash": content_hash}
+                })
+        return chunks
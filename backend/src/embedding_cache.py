@@ -0,0 +1,221 @@
+import asyncio
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+_caches: Dict[str, "EmbeddingCache"] = {}
+_caches_lock = threading.Lock()
+
+
+def normalize_text(text: str) -> str:
+    """Cache key form of a query: NFKC, case-folded, with collapsed whitespace"""
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFKC", text)).strip().casefold()
+
+
+class EmbeddingCache:
+    """
+    Bounded LRU cache of query embeddings keyed by (model name, normalized text).
+
+    Vectors are held as float32 arrays. With a db_path the entries are also
+    written to SQLite and the most recently used ones are reloaded on start-up,
+    so repeated questions are not re-embedded after a restart. A hit only
+    records its time in memory; use times are written with the next set(), or
+    after touch_flush_interval seconds, so hits do not commit to SQLite.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, max_entries: int = 10000,
+                 touch_flush_interval: float = 30):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.touch_flush_interval = touch_flush_interval
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, str], np.ndarray]" = OrderedDict()
+        self._bytes = 0
+        # Use times of hits not yet written to SQLite
+        self._touched: Dict[Tuple[str, str], float] = {}
+        self._flushed_at = time.monotonic()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._conn = None
+        if db_path:
+            self._conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS embedding_cache (
+                    model TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    embedding BLOB NOT NULL,
+                    last_used REAL NOT NULL,
+                    PRIMARY KEY (model, text)
+                )"""
+            )
+            self._conn.commit()
+            self._load()
+
+    def _load(self):
+        """Reload the most recently used entries, oldest first so the LRU order is kept"""
+        rows = self._conn.execute(
+            "SELECT model, text, embedding FROM embedding_cache ORDER BY last_used DESC LIMIT ?",
+            (self.max_entries,)
+        ).fetchall()
+        for model, text, embedding in reversed(rows):
+            vector = np.frombuffer(embedding, dtype=np.float32)
+            self._entries[(model, text)] = vector
+            self._bytes += vector.nbytes
+        self._conn.execute(
+            "DELETE FROM embedding_cache WHERE rowid NOT IN "
+            "(SELECT rowid FROM embedding_cache ORDER BY last_used DESC LIMIT ?)",
+            (self.max_entries,)
+        )
+        self._conn.commit()
+
+    def get(self, model: str, text: str) -> Optional[List[float]]:
+        """Cached embedding of a text, or None"""
+        key = (model, normalize_text(text))
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            if self._conn is not None:
+                self._touched[key] = time.time()
+                if time.monotonic() - self._flushed_at >= self.touch_flush_interval:
+                    self._flush_touched()
+                    self._conn.commit()
+        return vector.tolist()
+
+    def _flush_touched(self):
+        """Write the recorded use times of hits (lock held, caller commits)"""
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE embedding_cache SET last_used = ? WHERE model = ? AND text = ?",
+                [(last_used, *key) for key, last_used in self._touched.items()]
+            )
+            self._touched.clear()
+        self._flushed_at = time.monotonic()
+
+    def set(self, model: str, text: str, embedding) -> List[float]:
+        """
+        Store an embedding, evicting the least recently used entries when full.
+        Returns the stored (float32) vector, the value later hits return.
+        """
+        key = (model, normalize_text(text))
+        vector = np.asarray(embedding, dtype=np.float32)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.nbytes
+            self._entries[key] = vector
+            self._bytes += vector.nbytes
+
+            evicted = []
+            while len(self._entries) > self.max_entries:
+                old_key, old_vector = self._entries.popitem(last=False)
+                self._bytes -= old_vector.nbytes
+                evicted.append(old_key)
+                self._touched.pop(old_key, None)
+            self.evictions += len(evicted)
+
+            if self._conn is not None:
+                self._flush_touched()
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO embedding_cache (model, text, embedding, last_used) VALUES (?, ?, ?, ?)",
+                    (*key, vector.tobytes(), time.time())
+                )
+                self._conn.executemany("DELETE FROM embedding_cache WHERE model = ? AND text = ?", evicted)
+                self._conn.commit()
+        return vector.tolist()
+
+    def clear(self):
+        """Drop every entry; counters are kept"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._touched.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM embedding_cache")
+                self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Size, memory used by the vectors and hit/miss counters since start-up"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "bytes": self._bytes,
+                "persistent": self._conn is not None,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper answering embed_query from an EmbeddingCache.
+    Document embedding (indexing) is passed through uncached. A failing cache
+    (e.g. sqlite3.Error) is logged and bypassed, never failing the query.
+    """
+
+    def __init__(self, embeddings: Embeddings, cache: EmbeddingCache, model_name: str):
+        self.embeddings = embeddings
+        self.cache = cache
+        self.model_name = model_name
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embeddings.embed_documents(texts)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return await self.embeddings.aembed_documents(texts)
+
+    def _cached(self, text: str) -> Optional[List[float]]:
+        try:
+            return self.cache.get(self.model_name, text)
+        except Exception as e:
+            print(f"Error reading embedding cache: {str(e)}")
+            return None
+
+    def _store(self, text: str, embedding: List[float]) -> List[float]:
+        try:
+            return self.cache.set(self.model_name, text, embedding)
+        except Exception as e:
+            print(f"Error writing embedding cache: {str(e)}")
+            return embedding
+
+    def embed_query(self, text: str) -> List[float]:
+        embedding = self._cached(text)
+        if embedding is None:
+            embedding = self._store(text, self.embeddings.embed_query(text))
+        return embedding
+
+    async def aembed_query(self, text: str) -> List[float]:
+        # The cache lock and SQLite commits must not block the event loop
+        embedding = await asyncio.to_thread(self._cached, text)
+        if embedding is None:
+            embedding = await asyncio.to_thread(self._store, text, await self.embeddings.aembed_query(text))
+        return embedding
+
+
+def get_embedding_cache(db_path: Optional[str] = None, **kwargs) -> EmbeddingCache:
+    """Process-wide cache for a database file (or in memory only), shared by every RAG system"""
+    key = db_path or ""
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = EmbeddingCache(db_path or None, **kwargs)
+            _caches[key] = cache
+        return cache
@@ -0,0 +1,52 @@
+import re
+from langchain_core.embeddings import Embeddings
+from langchain_openai import OpenAIEmbeddings
+
+# Model the existing Chroma collections were built with (OpenAIEmbeddings' default)
+DEFAULT_EMBEDDING_MODEL = "text-embedding-ada-002"
+
+# Prefix selecting a local ONNX model run on CPU by fastembed
+LOCAL_PREFIX = "local:"
+
+# Multilingual (Arabic/English) model used for "local" without a model name;
+# fastembed ships it as a quantized ONNX export
+DEFAULT_LOCAL_MODEL = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+
+
+def is_local_model(embedding_model: str) -> bool:
+    """Whether an embedding_model setting selects the local backend."""
+    return embedding_model == "local" or embedding_model.startswith(LOCAL_PREFIX)
+
+
+def get_embeddings(embedding_model: str, openai_api_key: str = None, batch_size: int = 64) -> Embeddings:
+    """
+    Build the embedding backend selected by RAGConfig.embedding_model.
+
+    Args:
+        embedding_model: An OpenAI model name (e.g. "text-embedding-ada-002"), or
+            "local:<fastembed model>" / "local" for a local multilingual model
+        openai_api_key: Key for the OpenAI backend
+        batch_size: Texts embedded per batch when indexing
+
+    Returns:
+        A LangChain Embeddings instance
+    """
+    if is_local_model(embedding_model):
+        # Imported lazily: fastembed (onnxruntime) is only needed for local models
+        from langchain_community.embeddings import FastEmbedEmbeddings
+
+        model_name = embedding_model[len(LOCAL_PREFIX):] if embedding_model.startswith(LOCAL_PREFIX) else ""
+        return FastEmbedEmbeddings(model_name=model_name or DEFAULT_LOCAL_MODEL, batch_size=batch_size)
+
+    return OpenAIEmbeddings(model=embedding_model, openai_api_key=openai_api_key, chunk_size=batch_size)
+
+
+def model_directory_suffix(embedding_model: str) -> str:
+    """
+    Suffix of the Chroma directory holding vectors of a model. Vectors of
+    different models cannot share a collection; the default model keeps the
+    original directories.
+    """
+    if embedding_model == DEFAULT_EMBEDDING_MODEL:
+        return ""
+    return "_" + re.sub(r"[^A-Za-z0-9]+", "_", embedding_model).strip("_").lower()
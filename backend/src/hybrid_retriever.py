@@ -0,0 +1,193 @@
+import asyncio
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain_core.callbacks import AsyncCallbackManagerForRetrieverRun, CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from langchain_community.vectorstores import Chroma
+from pydantic import ConfigDict, PrivateAttr
+
+from data.arabic_text import normalize_arabic
+from data.corpus import ArticleCorpus
+from data.search_index import InvertedIndex
+from .vector_store import collection_fingerprint
+
+# "المادة 46", "المادة (46)", "مادة ٤٦", "Article 46" (matched on normalized text)
+ARTICLE_REFERENCE = re.compile(r"(?:ماده|article)\s*\(?\s*(\d+)")
+
+
+def cited_articles(question: str) -> List[int]:
+    """Article numbers cited in a question, in order of appearance"""
+    numbers = []
+    for match in ARTICLE_REFERENCE.finditer(normalize_arabic(question)):
+        number = int(match.group(1))
+        if number not in numbers:
+            numbers.append(number)
+    return numbers
+
+
+# Document names, matched on normalized text: "النظام" / "نظام المنافسات" and "اللائحة التنفيذية"
+DOCUMENT_REFERENCES = {
+    'System': re.compile(r"نظام|\bsystem\b"),
+    'Regulation': re.compile(r"لايحه|\bregulations?\b"),
+}
+
+
+def cited_document_type(question: str) -> Optional[str]:
+    """Canonical type (ArticleCorpus.TYPE_IDS) of the document a question names; None for neither or both"""
+    text = normalize_arabic(question)
+    named = [type_id for type_id, pattern in DOCUMENT_REFERENCES.items() if pattern.search(text)]
+    return named[0] if len(named) == 1 else None
+
+
+def reciprocal_rank_fusion(rankings: List[List[int]], k: int = 60) -> List[Tuple[int, float]]:
+    """
+    Fuse ranked lists of chunk positions: score(d) = sum over lists of 1 / (k + rank).
+
+    Returns:
+        (position, score) pairs, best first (ties keep first-seen order)
+    """
+    scores: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, position in enumerate(ranking, start=1):
+            scores[position] = scores.get(position, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda entry: -entry[1])
+
+
+class HybridRetriever(BaseRetriever):
+    """
+    Chroma dense search fused with BM25 over the same chunks.
+
+    The lexical index (data.search_index.InvertedIndex over the chunk text and
+    summary) is built from the chunks stored in the Chroma collection on first
+    use, and rebuilt when the collection fingerprint (id, size, revision) changes. Both searches return
+    candidate_k chunks; reciprocal rank fusion keeps the best k.
+
+    A question citing an article number ("المادة 46") returns the chunks of
+    that article directly, best BM25 match first, without an embedding call;
+    remaining slots are filled from the lexical ranking. Articles are looked up
+    by (type, number): a question naming the System or the Implementing
+    Regulation only gets that document's article (and chunks without a type);
+    otherwise the article of every document.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    vectorstore: Chroma
+    k: int = 3
+    candidate_k: int = 20
+    rrf_k: int = 60
+
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+    _index: Optional[InvertedIndex] = PrivateAttr(default=None)
+    _documents: List[Document] = PrivateAttr(default_factory=list)
+    _positions: Dict[str, int] = PrivateAttr(default_factory=dict)
+    _by_article: Dict[Tuple[Optional[str], int], List[int]] = PrivateAttr(default_factory=dict)
+    _article_types: Tuple[Optional[str], ...] = PrivateAttr(default=())
+    _indexed_fingerprint: Optional[str] = PrivateAttr(default=None)
+
+    def _ensure_index(self):
+        """(Re)build the lexical index when the collection changed"""
+        fingerprint = collection_fingerprint(self.vectorstore)
+        if fingerprint == self._indexed_fingerprint:
+            return
+        with self._lock:
+            if fingerprint == self._indexed_fingerprint:
+                return
+            records = self.vectorstore.get(include=["documents", "metadatas"])
+            index = InvertedIndex(field_boosts={'content': 1.0, 'summary': 0.5})
+            documents, positions, by_article = [], {}, {}
+            for text, metadata in zip(records["documents"], records["metadatas"]):
+                metadata = metadata or {}
+                position = len(documents)
+                documents.append(Document(page_content=text, metadata=metadata))
+                positions.setdefault(text, position)
+                index.add(position, {'content': text, 'summary': metadata.get('summary', '')})
+                type_id = ArticleCorpus.canonical_type(metadata['type']) if metadata.get('type') else None
+                try:
+                    by_article.setdefault((type_id, int(metadata.get('article_number'))), []).append(position)
+                except (TypeError, ValueError):
+                    pass
+            self._documents, self._positions, self._by_article = documents, positions, by_article
+            self._article_types = tuple(dict.fromkeys(type_id for type_id, _ in by_article))
+            self._index = index
+            self._indexed_fingerprint = fingerprint
+
+    def lexical_ranking(self, question: str) -> List[int]:
+        """Chunk positions ranked by BM25, best first"""
+        self._ensure_index()
+        candidates = self._index.lookup(question)
+        if candidates is None:
+            return []
+        if not candidates:
+            # No chunk has every term: rank the chunks matching any of them
+            candidates = set()
+            for term in self._index.query_terms(question):
+                candidates |= self._index.lookup(term) or set()
+        return [position for position, score in self._index.top_k(question, candidates, self.candidate_k) if score > 0]
+
+    def _article_documents(self, question: str) -> Optional[List[Document]]:
+        """Short-circuit for questions citing article numbers; None when no cited article is indexed"""
+        numbers = cited_articles(question)
+        if not numbers:
+            return None
+        self._ensure_index()
+        doc_type = cited_document_type(question)
+        types = (doc_type, None) if doc_type else self._article_types
+        cited = [position for number in numbers for type_id in types
+                 for position in self._by_article.get((type_id, number), [])]
+        if not cited:
+            return None
+
+        scores = self._index.score(question, cited)
+        selected = sorted(cited, key=lambda position: (-scores.get(position, 0.0), position))[:self.k]
+        for position in self.lexical_ranking(question):
+            if len(selected) >= self.k:
+                break
+            if position not in selected:
+                selected.append(position)
+        return [self._documents[position] for position in selected]
+
+    def _fuse(self, question: str, dense: List[Document]) -> List[Document]:
+        dense_ranking = []
+        extra: Dict[int, Document] = {}
+        for document in dense:
+            position = self._positions.get(document.page_content)
+            if position is None:
+                # Not in the index snapshot (collection changed meanwhile): keep it under a private key
+                position = -1 - len(extra)
+                extra[position] = document
+            dense_ranking.append(position)
+
+        fused = reciprocal_rank_fusion([dense_ranking, self.lexical_ranking(question)], self.rrf_k)
+        return [
+            extra[position] if position < 0 else self._documents[position]
+            for position, _ in fused[:self.k]
+        ]
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
+        documents = self._article_documents(query)
+        if documents is not None:
+            return documents
+        self._ensure_index()
+        return self._fuse(query, self.vectorstore.similarity_search(query, k=self.candidate_k))
+
+    async def aretrieve(self, question: str, embedding: Optional[List[float]] = None) -> List[Document]:
+        """
+        Async retrieval reusing a question embedding computed by the caller.
+        Index building and BM25 run in a thread so the event loop is not blocked.
+        """
+        documents = await asyncio.to_thread(self._article_documents, question)
+        if documents is not None:
+            return documents
+        await asyncio.to_thread(self._ensure_index)
+        if embedding is None:
+            embedding = await self.vectorstore.embeddings.aembed_query(question)
+        dense = await self.vectorstore.asimilarity_search_by_vector(embedding, k=self.candidate_k)
+        return await asyncio.to_thread(self._fuse, question, dense)
+
+    async def _aget_relevant_documents(self, query: str, *,
+                                       run_manager: AsyncCallbackManagerForRetrieverRun) -> List[Document]:
+        return await self.aretrieve(query)
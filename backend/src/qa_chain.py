@@ -1,32 +1,53 @@
-from typing import Dict, Any
+import asyncio
+import weakref
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from langchain_openai import ChatOpenAI
-from langchain.chains import RetrievalQA
 from langchain_community.vectorstores import Chroma
+from .context_builder import ContextBuilder
+from .hybrid_retriever import HybridRetriever
 from .templates import get_prompt_template
 
+# Number of chunks retrieved per question
+RETRIEVAL_K = 3
+
+# event loop -> semaphore limiting concurrent async LLM calls of this process
+_llm_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+def get_llm_semaphore(limit: int) -> asyncio.Semaphore:
+    """Process-wide limit on in-flight async LLM requests (one semaphore per event loop)."""
+    loop = asyncio.get_running_loop()
+    semaphore = _llm_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(limit)
+        _llm_semaphores[loop] = semaphore
+    return semaphore
+
 class QAChainHandler:
     """Handles question-answering chain operations with language support."""
     
-    def __init__(self, openai_api_key: str, model_name: str, temperature: float, lang: str):
+    def __init__(self, openai_api_key: str, model_name: str, temperature: float, lang: str,
+                 max_concurrency: int = 32, hybrid_retrieval: bool = True,
+                 context_max_tokens: Optional[int] = None):
         self.lang = lang
+        self.max_concurrency = max_concurrency
+        self.hybrid_retrieval = hybrid_retrieval
         self.llm = ChatOpenAI(
             openai_api_key=openai_api_key,
             model_name=model_name,
             temperature=temperature
         )
-        self.qa_chain = None
+        self.retriever = None
+        self.vectorstore = None
         self.prompt_template = get_prompt_template(lang)
+        self.context_builder = ContextBuilder(model_name, context_max_tokens, lang)
 
     def setup_chain(self, vectorstore: Chroma):
-        """Set up the question-answering chain."""
-        self.qa_chain = RetrievalQA.from_chain_type(
-            llm=self.llm,
-            chain_type="stuff",
-            retriever=vectorstore.as_retriever(search_kwargs={"k": 3}),
-            return_source_documents=True,
-            verbose=True , 
-            chain_type_kwargs={"prompt": self.prompt_template}
-        )
+        """Set up retrieval over the vector store."""
+        self.vectorstore = vectorstore
+        if self.hybrid_retrieval:
+            self.retriever = HybridRetriever(vectorstore=vectorstore, k=RETRIEVAL_K)
+        else:
+            self.retriever = vectorstore.as_retriever(search_kwargs={"k": RETRIEVAL_K})
 
     def format_source_document(self, doc) -> str:
         """Format source document for display with metadata based on language."""
@@ -50,18 +71,83 @@ class QAChainHandler:
 
     def query(self, question: str) -> Dict[str, Any]:
         """Process a query and return the response with sources."""
-        if not self.qa_chain:
+        if not self.retriever:
             raise ValueError("QA Chain not initialized. Please run setup_chain first.")
         
-        response = self.qa_chain({"query": question})
-        print(response.keys())
-        formatted_sources = [
-            self.format_source_document(doc)
-            for doc in response["source_documents"]
-        ]
+        prompt, source_documents = self.build_prompt(question, self.retriever.invoke(question))
+        message = self.llm.invoke(prompt)
         
         return {
-            "answer": response["result"],
-            "source_documents": response["source_documents"],
-            "formatted_sources": formatted_sources
-        }
\ No newline at end of file
+            "answer": message.content,
+            "source_documents": source_documents,
+            "formatted_sources": [self.format_source_document(doc) for doc in source_documents]
+        }
+
+    def build_prompt(self, question: str, source_documents: List) -> Tuple[str, List]:
+        """
+        "Stuff" prompt with the retrieved chunks packed by the context builder
+        (merged per article, within the model's token budget).
+
+        Returns:
+            (prompt, the documents that made it into the context)
+        """
+        context, kept_documents = self.context_builder.build(source_documents)
+        return self.prompt_template.format(context=context, question=question), kept_documents
+
+    async def aquery(self, question: str, embedding: Optional[List[float]] = None) -> Dict[str, Any]:
+        """
+        Async variant of query(): async embedding, retrieval and ChatOpenAI call.
+
+        Args:
+            question: The user question
+            embedding: Question embedding when the caller already computed it
+
+        The LLM call waits on a process-wide semaphore of max_concurrency slots,
+        so many in-flight requests do not exceed the provider's rate limits.
+        """
+        if not self.vectorstore:
+            raise ValueError("QA Chain not initialized. Please run setup_chain first.")
+
+        if self.hybrid_retrieval:
+            source_documents = await self.retriever.aretrieve(question, embedding)
+        else:
+            if embedding is None:
+                embedding = await self.vectorstore.embeddings.aembed_query(question)
+            source_documents = await self.vectorstore.asimilarity_search_by_vector(embedding, k=RETRIEVAL_K)
+
+        prompt, source_documents = self.build_prompt(question, source_documents)
+        async with get_llm_semaphore(self.max_concurrency):
+            message = await self.llm.ainvoke(prompt)
+
+        return {
+            "answer": message.content,
+            "source_documents": source_documents,
+            "formatted_sources": [self.format_source_document(doc) for doc in source_documents]
+        }
+
+    def stream(self, question: str) -> Iterator[Tuple[str, Any]]:
+        """
+        Process a query while the LLM generates, with the same retrieval and prompt as query().
+
+        Yields:
+            ("sources", source_documents) once retrieval is done, then ("token", text)
+            for every generated chunk, and finally ("done", response) with the same
+            dictionary query() returns.
+        """
+        if not self.retriever:
+            raise ValueError("QA Chain not initialized. Please run setup_chain first.")
+
+        prompt, source_documents = self.build_prompt(question, self.retriever.invoke(question))
+        yield "sources", source_documents
+
+        answer_parts = []
+        for chunk in self.llm.stream(prompt):
+            if chunk.content:
+                answer_parts.append(chunk.content)
+                yield "token", chunk.content
+
+        yield "done", {
+            "answer": "".join(answer_parts),
+            "source_documents": source_documents,
+            "formatted_sources": [self.format_source_document(doc) for doc in source_documents]
+        }
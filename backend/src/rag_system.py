@@ -1,38 +1,213 @@
-from typing import Dict, Any, Optional
+import asyncio
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from .config import RAGConfig
 from .vector_store import VectorStoreHandler
+from langchain_openai import ChatOpenAI
 from .qa_chain import QAChainHandler
+from .conversation import ConversationCondenser
+from .answer_cache import get_answer_cache, key_terms
+from .embeddings import get_embeddings
+from .embedding_cache import get_embedding_cache
+from .hybrid_retriever import cited_articles, cited_document_type
 from .templates import get_collection_name, get_persist_directory
 
+def build_vector_handler(config: RAGConfig) -> VectorStoreHandler:
+    """Chroma collection and embedding client of a configuration."""
+    embedding_cache = None
+    if config.embedding_cache_enabled:
+        embedding_cache = get_embedding_cache(
+            config.embedding_cache_path,
+            max_entries=config.embedding_cache_max_entries
+        )
+    
+    # Language- and model-specific paths and names
+    return VectorStoreHandler(
+        persist_directory=get_persist_directory(config.lang, config.embedding_model),
+        collection_name=get_collection_name(config.lang),
+        openai_api_key=config.openai_api_key,
+        lang=config.lang,
+        embeddings=get_embeddings(config.embedding_model, config.openai_api_key, config.embedding_batch_size),
+        embedding_cache=embedding_cache,
+        embedding_model=config.embedding_model
+    )
+
 class ArabicRAGSystem:
     """Main RAG system using pre-generated database with language support."""
     
-    def __init__(self, config: RAGConfig):
-        """Initialize the RAG system with configuration."""
-        self.config = config
-        
-        # Get language-specific paths and names
-        persist_directory = get_persist_directory(config.lang)
-        collection_name = get_collection_name(config.lang)
+    def __init__(self, config: RAGConfig, vector_handler: Optional[VectorStoreHandler] = None):
+        """
+        Initialize the RAG system with configuration.
         
-        # Initialize components with language support
-        self.vector_handler = VectorStoreHandler(
-            persist_directory=persist_directory,
-            collection_name=collection_name,
-            openai_api_key=config.openai_api_key,
-            lang=config.lang
-        )
+        Args:
+            config: RAG configuration
+            vector_handler: Existing handler of the same collection and embedding
+                model to share (see registry.py); built from config when omitted
+        """
+        self.config = config
+        self.vector_handler = vector_handler or build_vector_handler(config)
         
         self.qa_handler = QAChainHandler(
             openai_api_key=config.openai_api_key,
             model_name=config.llm_model,
             temperature=config.temperature,
-            lang=config.lang
+            lang=config.lang,
+            max_concurrency=config.llm_max_concurrency,
+            hybrid_retrieval=config.hybrid_retrieval,
+            context_max_tokens=config.context_max_tokens
         )
         
         # Setup QA chain with loaded vectorstore
         self.qa_handler.setup_chain(self.vector_handler.get_vectorstore())
 
-    def query(self, question: str, chat_history: Optional[list] = None) -> Dict[str, Any]:
-        """Process a query and return the response."""
-        return self.qa_handler.query(question)
\ No newline at end of file
+        # Follow-up questions are rewritten from the summary and last turns before retrieval
+        self.condenser = None
+        if config.history_aware:
+            self.condenser = ConversationCondenser(
+                ChatOpenAI(openai_api_key=config.openai_api_key, model_name=config.condense_model, temperature=0),
+                lang=config.lang,
+                window=config.history_window,
+                summary_max_words=config.summary_max_words
+            )
+
+        # Answers are shared between systems of the same language, reasoning flag, models and retrieval mode
+        self.answer_cache = None
+        self.cache_namespace = (f"{config.lang}:{int(config.reasoning)}:{config.llm_model}:{config.embedding_model}"
+                                f":{int(config.hybrid_retrieval)}")
+        if config.answer_cache_enabled:
+            self.answer_cache = get_answer_cache(
+                config.answer_cache_path,
+                similarity_threshold=config.answer_cache_threshold,
+                max_entries=config.answer_cache_max_entries,
+                ttl_seconds=config.answer_cache_ttl_seconds
+            )
+
+    def _standalone_question(self, question: str, chat_history: Optional[list], summary: Optional[str]) -> str:
+        if self.condenser is None:
+            return question
+        return self.condenser.condense(question, chat_history, summary)
+
+    def update_summary(self, summary: Optional[str], turns: List[Tuple[str, str]]) -> Optional[str]:
+        """
+        Running summary of a conversation with `turns` folded in; None when
+        history-aware mode is off or the update failed (keep the previous one).
+        """
+        if self.condenser is None:
+            return None
+        try:
+            return self.condenser.update_summary(summary, turns)
+        except Exception as e:
+            print(f"Error updating conversation summary: {str(e)}")
+            return None
+
+    def _namespace(self, question: str) -> str:
+        """
+        Answer cache partition of a question. Questions only share answers with
+        questions citing the same articles (of the same document, when named)
+        and naming the same key terms
+        (answer_cache.KEY_TERMS): "المادة 46" and "المادة 47", or general and
+        limited competitions, embed almost identically.
+        """
+        namespace = self.cache_namespace
+        articles = cited_articles(question)
+        if articles:
+            namespace += f":articles={','.join(str(number) for number in articles)}"
+            doc_type = cited_document_type(question)
+            if doc_type:
+                namespace += f":type={doc_type}"
+        terms = key_terms(question)
+        if terms:
+            namespace += f":terms={','.join(terms)}"
+        return namespace
+
+    def _cached_answer(self, question: str, chat_history: Optional[list], summary: Optional[str] = None):
+        """
+        Look a question up in the answer cache.
+
+        Returns:
+            (cached response or None, embedding, collection fingerprint); the
+            embedding is None when the cache does not apply or failed
+        """
+        if self.answer_cache is None or chat_history or summary:
+            return None, None, None
+        try:
+            embedding = self.vector_handler.embeddings.embed_query(question)
+            fingerprint = self.vector_handler.collection_fingerprint()
+            return self.answer_cache.lookup(self._namespace(question), embedding, fingerprint), embedding, fingerprint
+        except Exception as e:
+            print(f"Error reading answer cache: {str(e)}")
+            return None, None, None
+
+    def _store_answer(self, question: str, embedding, fingerprint: str, response: Dict[str, Any]):
+        if embedding is None:
+            return
+        try:
+            self.answer_cache.store(self._namespace(question), question, embedding, response, fingerprint)
+        except Exception as e:
+            print(f"Error writing answer cache: {str(e)}")
+
+    def query(self, question: str, chat_history: Optional[list] = None, summary: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Process a query and return the response.
+
+        Questions without chat history go through the semantic answer cache:
+        a close enough earlier question returns its stored answer and sources
+        without calling the LLM. Follow-up questions are first condensed into a
+        standalone question from the conversation summary and the last
+        history_window turns of chat_history.
+        """
+        cached, embedding, fingerprint = self._cached_answer(question, chat_history, summary)
+        if cached is not None:
+            return cached
+
+        response = self.qa_handler.query(self._standalone_question(question, chat_history, summary))
+        self._store_answer(question, embedding, fingerprint, response)
+        return response
+
+    def stream_query(self, question: str, chat_history: Optional[list] = None,
+                     summary: Optional[str] = None) -> Iterator[Tuple[str, Any]]:
+        """
+        Streaming variant of query(): yields ("sources", documents), then
+        ("token", text) chunks, then ("done", response). A cached answer is
+        sent as a single token.
+        """
+        cached, embedding, fingerprint = self._cached_answer(question, chat_history, summary)
+        if cached is not None:
+            yield "sources", cached["source_documents"]
+            yield "token", cached["answer"]
+            yield "done", cached
+            return
+
+        for event, data in self.qa_handler.stream(self._standalone_question(question, chat_history, summary)):
+            if event == "done":
+                self._store_answer(question, embedding, fingerprint, data)
+            yield event, data
+
+    async def aquery(self, question: str, chat_history: Optional[list] = None,
+                     summary: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Async variant of query(). The question is embedded once and the embedding
+        serves both the answer cache lookup and the Chroma search. The SQLite
+        and Chroma reads and writes of the answer cache run in worker threads.
+        """
+        if self.condenser is not None and self.condenser.needs_condensing(chat_history, summary):
+            standalone = await self.condenser.acondense(question, chat_history, summary)
+            return await self.qa_handler.aquery(standalone)
+
+        embedding = await self.vector_handler.embeddings.aembed_query(question)
+
+        use_cache = self.answer_cache is not None and not chat_history and not summary
+        fingerprint = None
+        if use_cache:
+            try:
+                fingerprint = await asyncio.to_thread(self.vector_handler.collection_fingerprint)
+                cached = await asyncio.to_thread(self.answer_cache.lookup, self._namespace(question), embedding, fingerprint)
+                if cached is not None:
+                    return cached
+            except Exception as e:
+                print(f"Error reading answer cache: {str(e)}")
+                use_cache = False
+
+        response = await self.qa_handler.aquery(question, embedding)
+        if use_cache:
+            await asyncio.to_thread(self._store_answer, question, embedding, fingerprint, response)
+        return response
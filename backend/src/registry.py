@@ -0,0 +1,97 @@
+import os
+import threading
+import time
+from typing import Dict, Iterable, Tuple
+from .config import load_config
+from .rag_system import ArabicRAGSystem, build_vector_handler
+from .templates import get_collection_name, get_persist_directory
+from .vector_store import VectorStoreHandler
+
+# Languages built by warm_up() when none are given
+DEFAULT_WARMUP_LANGUAGES = ("ar", "sa", "en")
+
+
+class RAGSystemRegistry:
+    """
+    Process-wide pool of ArabicRAGSystem instances, one per (language, reasoning).
+
+    Systems are built at most once: concurrent first requests for the same key
+    wait for the one being built instead of building duplicates, while other
+    keys are not blocked. Configurations pointing at the same Chroma collection
+    with the same embedding model ("ar" and "sa") share one VectorStoreHandler,
+    so the Chroma client, the collection and the embedding client exist once.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._key_locks: Dict[tuple, threading.Lock] = {}
+        self._systems: Dict[Tuple[str, bool], ArabicRAGSystem] = {}
+        self._vector_handlers: Dict[Tuple[str, str, str], VectorStoreHandler] = {}
+
+    def _key_lock(self, key: tuple) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _vector_handler(self, config) -> VectorStoreHandler:
+        key = (get_persist_directory(config.lang, config.embedding_model),
+               get_collection_name(config.lang), config.embedding_model)
+        with self._key_lock(key):
+            handler = self._vector_handlers.get(key)
+            if handler is None:
+                handler = build_vector_handler(config)
+                self._vector_handlers[key] = handler
+        return handler
+
+    def get(self, language: str = 'ar', reasoning: bool = False) -> ArabicRAGSystem:
+        """The RAG system of a language and reasoning flag, built on first use."""
+        key = (language, bool(reasoning))
+        system = self._systems.get(key)
+        if system is not None:
+            return system
+
+        with self._key_lock(key):
+            system = self._systems.get(key)
+            if system is None:
+                config = load_config(language, reasoning)
+                system = ArabicRAGSystem(config, vector_handler=self._vector_handler(config))
+                self._systems[key] = system
+        return system
+
+    def warm_up(self, languages: Iterable[str] = DEFAULT_WARMUP_LANGUAGES, reasoning: Iterable[bool] = (False,)):
+        """
+        Build the systems of the given languages ahead of the first request.
+        Failures are logged; the system is then built lazily on first use.
+        """
+        for language in languages:
+            for flag in reasoning:
+                started = time.perf_counter()
+                try:
+                    self.get(language, flag)
+                    print(f"RAG system '{language}' (reasoning={flag}) ready in {time.perf_counter() - started:.2f}s")
+                except Exception as e:
+                    print(f"Error warming up RAG system '{language}': {str(e)}")
+
+    def loaded(self) -> Dict[str, int]:
+        """Number of built systems and shared vector stores"""
+        with self._lock:
+            return {"systems": len(self._systems), "vector_stores": len(self._vector_handlers)}
+
+
+_registry = RAGSystemRegistry()
+
+
+def get_rag_registry() -> RAGSystemRegistry:
+    """The registry of this process."""
+    return _registry
+
+
+def warm_up_from_env():
+    """
+    Warm up the languages listed in RAG_WARMUP_LANGUAGES (comma separated,
+    default ar,sa,en; empty disables), plus reasoning systems when
+    RAG_WARMUP_REASONING is true.
+    """
+    languages = [lang.strip() for lang in os.getenv("RAG_WARMUP_LANGUAGES", ",".join(DEFAULT_WARMUP_LANGUAGES)).split(",")
+                 if lang.strip()]
+    reasoning = (False, True) if os.getenv("RAG_WARMUP_REASONING", "false").lower() == "true" else (False,)
+    _registry.warm_up(languages, reasoning)
@@ -1,8 +1,34 @@
+from typing import Tuple
 from langchain.prompts import PromptTemplate
+from .embeddings import DEFAULT_EMBEDDING_MODEL, model_directory_suffix
 
 ar_accent = ""
 sa_accent = ""
 
+# Conversation templates (see conversation.py); the Saudi dialect config condenses in standard Arabic
+AR_CONDENSE_TEMPLATE = """فيما يلي ملخص محادثة حول نظام المنافسات والمشتريات الحكومية وآخر رسائلها، ثم سؤال متابعة.
+أعد صياغة سؤال المتابعة ليصبح سؤالاً مستقلاً واضحاً يمكن فهمه دون المحادثة، مع ذكر أرقام المواد أو المصطلحات التي يشير إليها. لا تجب عن السؤال.
+
+ملخص المحادثة:
+{summary}
+
+آخر الرسائل:
+{history}
+
+سؤال المتابعة: {question}
+
+السؤال المستقل:"""
+
+AR_SUMMARY_TEMPLATE = """حدّث ملخص المحادثة التالي بإضافة الرسائل الجديدة، في {max_words} كلمة على الأكثر، مع الإبقاء على المواضيع وأرقام المواد التي نوقشت.
+
+الملخص الحالي:
+{summary}
+
+الرسائل الجديدة:
+{history}
+
+الملخص المحدث:"""
+
 TEMPLATES = {
     "ar": {
         "qa_template": """أنت مساعد متخصص في الإجابة على الأسئلة المتعلقة بنظام المنافسات والمشتريات الحكومية في المملكة العربية السعودية.
@@ -13,6 +39,8 @@ TEMPLATES = {
 السؤال: {question}
 
 قم بتقديم إجابة دقيقة ومباشرة مع ذكر رقم المادة والفصل ذي الصلة:""",
+        "condense_template": AR_CONDENSE_TEMPLATE,
+        "summary_template": AR_SUMMARY_TEMPLATE,
         "collection_name": "arabic_docs",
         "persist_directory": ".//app//chroma_db_ar_final"
     },
@@ -25,6 +53,8 @@ TEMPLATES = {
 السؤال: {question}
 
 قم بتقديم إجابة دقيقة ومباشرة مع ذكر رقم المادة والفصل ذي الصلة:""",
+        "condense_template": AR_CONDENSE_TEMPLATE,
+        "summary_template": AR_SUMMARY_TEMPLATE,
         "collection_name": "arabic_docs",
         "persist_directory": ".//app//chroma_db_ar_final"
     },
@@ -37,6 +67,27 @@ Available Information:
 Question: {question}
 
 Provide a precise and direct answer, citing the relevant article and chapter numbers:""",
+        "condense_template": """Below are the summary and the latest messages of a conversation about the Government Tenders and Procurement Law, followed by a follow-up question.
+Rephrase the follow-up question as a clear standalone question that can be understood without the conversation, naming the articles or terms it refers to. Do not answer it.
+
+Conversation summary:
+{summary}
+
+Latest messages:
+{history}
+
+Follow-up question: {question}
+
+Standalone question:""",
+        "summary_template": """Update the following conversation summary with the new messages, in at most {max_words} words, keeping the topics and article numbers discussed.
+
+Current summary:
+{summary}
+
+New messages:
+{history}
+
+Updated summary:""",
         "collection_name": "english_docs",
         "persist_directory": ".//app//chroma_db_final"
     }
@@ -52,10 +103,20 @@ def get_prompt_template(lang: str) -> PromptTemplate:
         input_variables=["context", "question"]
     )
 
+def get_conversation_templates(lang: str) -> Tuple[PromptTemplate, PromptTemplate]:
+    """Get the (condense question, update summary) templates for the specified language."""
+    if lang not in TEMPLATES:
+        raise ValueError(f"Unsupported language: {lang}. Supported languages are: {list(TEMPLATES.keys())}")
+    
+    return (
+        PromptTemplate(template=TEMPLATES[lang]["condense_template"], input_variables=["summary", "history", "question"]),
+        PromptTemplate(template=TEMPLATES[lang]["summary_template"], input_variables=["summary", "history", "max_words"])
+    )
+
 def get_collection_name(lang: str) -> str:
     """Get the appropriate collection name for the specified language."""
     return TEMPLATES[lang]["collection_name"]
 
-def get_persist_directory(lang: str) -> str:
-    """Get the appropriate persist directory for the specified language."""
-    return TEMPLATES[lang]["persist_directory"]
\ No newline at end of file
+def get_persist_directory(lang: str, embedding_model: str = DEFAULT_EMBEDDING_MODEL) -> str:
+    """Get the appropriate persist directory for the specified language and embedding model."""
+    return TEMPLATES[lang]["persist_directory"] + model_directory_suffix(embedding_model)
\ No newline at end of file
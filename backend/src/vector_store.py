@@ -1,17 +1,29 @@
+import os
+import shutil
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from langchain_core.embeddings import Embeddings
 from langchain_openai import OpenAIEmbeddings
 from langchain_community.vectorstores import Chroma
-from .templates import get_collection_name, get_persist_directory
+import chromadb
+from .embedding_cache import CachedEmbeddings, EmbeddingCache
+from .embeddings import DEFAULT_EMBEDDING_MODEL
 
 class VectorStoreHandler:
     """Handles vector storage operations with language support."""
     
-    def __init__(self, persist_directory: str, collection_name: str, openai_api_key: str, lang: str):
+    def __init__(self, persist_directory: str, collection_name: str, openai_api_key: str, lang: str,
+                 embeddings: Optional[Embeddings] = None, embedding_cache: Optional[EmbeddingCache] = None,
+                 embedding_model: str = DEFAULT_EMBEDDING_MODEL):
         self.lang = lang
-        self.embeddings = OpenAIEmbeddings(openai_api_key=openai_api_key)
+        self.embeddings = embeddings or OpenAIEmbeddings(openai_api_key=openai_api_key)
+        # Repeated questions are embedded once (also serves the answer cache lookup)
+        if embedding_cache is not None:
+            self.embeddings = CachedEmbeddings(self.embeddings, embedding_cache, embedding_model)
         
-        # Get language-specific settings
-        self.persist_directory = get_persist_directory(lang)
-        self.collection_name = get_collection_name(lang)
+        # Language- and model-specific settings (see templates.get_persist_directory)
+        self.persist_directory = persist_directory
+        self.collection_name = collection_name
         
         # Load existing collection
         self.vectorstore = Chroma(
@@ -22,4 +34,180 @@ class VectorStoreHandler:
     
     def get_vectorstore(self) -> Chroma:
         """Get the loaded vector store."""
-        return self.vectorstore
\ No newline at end of file
+        return self.vectorstore
+    
+    def collection_fingerprint(self) -> str:
+        """Identifies the collection contents: changes when it is rebuilt, documents are added/removed or re-ingested."""
+        return collection_fingerprint(self.vectorstore)
+
+
+# Seconds a collection fingerprint is reused before Chroma is asked again
+FINGERPRINT_TTL_SECONDS = 5.0
+
+# Collection id -> (monotonic time read, fingerprint)
+_fingerprints: Dict[str, Tuple[float, str]] = {}
+
+
+def collection_fingerprint(vectorstore: Chroma) -> str:
+    """
+    Collection id, size and revision of a Chroma store. The revision is read
+    from the database, as sync_collection may have bumped it in another
+    process (ingest-articles); the result is reused for FINGERPRINT_TTL_SECONDS,
+    so the retriever and the answer cache of a request share one read.
+    """
+    collection = vectorstore._collection
+    key = str(collection.id)
+    now = time.monotonic()
+    cached = _fingerprints.get(key)
+    if cached is not None and now - cached[0] < FINGERPRINT_TTL_SECONDS:
+        return cached[1]
+    
+    metadata = vectorstore._client.get_collection(collection.name).metadata or {}
+    fingerprint = f"{collection.id}:{collection.count()}:{metadata.get('revision', '')}"
+    _fingerprints[key] = (now, fingerprint)
+    return fingerprint
+
+
+def rebuild_collection(source_directory: str, target_directory: str, collection_name: str,
+                       embeddings: Embeddings, batch_size: int = 64) -> Dict[str, float]:
+    """
+    Re-embed every chunk of a Chroma collection with another embedding model.
+    
+    The chunk texts and metadata are read from the source collection (no
+    embedding calls), embedded in batches and written to a new collection in
+    "<target_directory>.building". Only when every batch succeeded is it moved
+    to target_directory, replacing an existing one; on failure the target is
+    left untouched.
+    
+    Args:
+        source_directory: Persist directory of the collection to copy
+        target_directory: Persist directory of the rebuilt collection
+        collection_name: Collection name in both directories
+        embeddings: Embedding model of the new collection
+        batch_size: Chunks embedded and written per batch
+        
+    Returns:
+        Dict with the number of chunks, elapsed seconds and chunks per second
+
+    Raises:
+        ValueError: When source and target are the same directory
+    """
+    if os.path.abspath(source_directory) == os.path.abspath(target_directory):
+        raise ValueError(f"Source and target are both {source_directory}: choose another embedding model")
+
+    # Clients are closed (public close(), refcounted) before the directories are moved
+    with chromadb.PersistentClient(path=source_directory) as source_client:
+        source = Chroma(client=source_client, collection_name=collection_name)
+        records = source.get(include=["documents", "metadatas"])
+    
+    building_directory = target_directory.rstrip(os.sep) + ".building"
+    shutil.rmtree(building_directory, ignore_errors=True)
+    
+    ids, documents, metadatas = records["ids"], records["documents"], records["metadatas"]
+    started = time.perf_counter()
+    try:
+        with chromadb.PersistentClient(path=building_directory) as building_client:
+            target = Chroma(
+                client=building_client,
+                embedding_function=embeddings,
+                collection_name=collection_name
+            )
+            for start in range(0, len(ids), batch_size):
+                end = start + batch_size
+                target.add_texts(
+                    texts=documents[start:end],
+                    metadatas=metadatas[start:end],
+                    ids=ids[start:end]
+                )
+    except Exception:
+        shutil.rmtree(building_directory, ignore_errors=True)
+        raise
+    elapsed = time.perf_counter() - started
+
+    # Swap the complete collection in
+    previous_directory = target_directory.rstrip(os.sep) + ".previous"
+    shutil.rmtree(previous_directory, ignore_errors=True)
+    if os.path.exists(target_directory):
+        os.replace(target_directory, previous_directory)
+    os.replace(building_directory, target_directory)
+    shutil.rmtree(previous_directory, ignore_errors=True)
+    
+    return {
+        "chunks": len(ids),
+        "seconds": round(elapsed, 2),
+        "chunks_per_second": round(len(ids) / elapsed, 1) if elapsed else 0.0
+    }
+
+
+def sync_collection(persist_directory: str, collection_name: str, embeddings: Embeddings,
+                    chunks: List[Dict[str, Any]], batch_size: int = 64, dry_run: bool = False) -> Dict[str, float]:
+    """
+    Incrementally bring a Chroma collection in line with a list of chunks.
+    
+    Chunks whose id is new or whose content_hash changed are embedded in
+    batches and upserted; unchanged chunks are not re-embedded; ids that are
+    no longer produced are deleted.
+    
+    Args:
+        persist_directory: Persist directory of the collection
+        collection_name: Collection name
+        embeddings: Embedding model of the collection
+        chunks: {"id", "text", "metadata"} dicts (see DocumentProcessor.split_articles);
+            metadata must carry a content_hash
+        batch_size: Chunks embedded and written per batch
+        dry_run: Only count what would change
+        
+    Returns:
+        Dict with chunk counts (total, unchanged, embedded, deleted), embedding
+        calls made and saved, elapsed seconds and embedded chunks per second
+    """
+    vectorstore = Chroma(
+        persist_directory=persist_directory,
+        embedding_function=embeddings,
+        collection_name=collection_name
+    )
+    collection = vectorstore._collection
+    existing = collection.get(include=["metadatas"])
+    existing_hashes = {
+        chunk_id: (metadata or {}).get("content_hash")
+        for chunk_id, metadata in zip(existing["ids"], existing["metadatas"])
+    }
+    
+    wanted_ids = {chunk["id"] for chunk in chunks}
+    changed = [chunk for chunk in chunks if existing_hashes.get(chunk["id"]) != chunk["metadata"]["content_hash"]]
+    stale_ids = [chunk_id for chunk_id in existing_hashes if chunk_id not in wanted_ids]
+    
+    started = time.perf_counter()
+    embedding_calls = 0
+    if not dry_run:
+        for start in range(0, len(changed), batch_size):
+            batch = changed[start:start + batch_size]
+            vectors = embeddings.embed_documents([chunk["text"] for chunk in batch])
+            embedding_calls += 1
+            collection.upsert(
+                ids=[chunk["id"] for chunk in batch],
+                embeddings=vectors,
+                documents=[chunk["text"] for chunk in batch],
+                metadatas=[chunk["metadata"] for chunk in batch]
+            )
+        for start in range(0, len(stale_ids), batch_size):
+            collection.delete(ids=stale_ids[start:start + batch_size])
+        if changed or stale_ids:
+            # Amended chunks keep the collection size: bump the revision so fingerprints change
+            metadata = {key: value for key, value in (collection.metadata or {}).items() if not key.startswith("hnsw:")}
+            collection.modify(metadata={**metadata, "revision": time.time_ns()})
+            # Seen at once in this process; other processes within FINGERPRINT_TTL_SECONDS
+            _fingerprints.pop(str(collection.id), None)
+    elapsed = time.perf_counter() - started
+    
+    unchanged = len(chunks) - len(changed)
+    return {
+        "chunks": len(chunks),
+        "unchanged": unchanged,
+        "embedded": len(changed),
+        "deleted": len(stale_ids),
+        "embedding_calls": embedding_calls,
+        "embedding_calls_saved": -(-unchanged // batch_size) if batch_size else 0,
+        "seconds": round(elapsed, 2),
+        "chunks_per_second": round(len(changed) / elapsed, 1) if elapsed and changed else 0.0
+    }
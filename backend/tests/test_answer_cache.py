@@ -0,0 +1,72 @@
+import numpy as np
+from langchain.schema import Document
+from src.answer_cache import SemanticAnswerCache
+
+RESPONSE = {
+    "answer": "مدة الإعلان ثلاثون يوما",
+    "source_documents": [Document(page_content="نص المادة", metadata={"article_number": 40})],
+    "formatted_sources": ["المادة 40"]
+}
+
+def unit(*values):
+    vector = np.array(values, dtype=float)
+    return vector / np.linalg.norm(vector)
+
+def test_similar_question_hits_and_other_namespace_misses(tmp_path):
+    cache = SemanticAnswerCache(str(tmp_path / "cache.sqlite3"), similarity_threshold=0.9)
+    cache.store("ar:0", "ما مدة الإعلان؟", unit(1, 0, 0), RESPONSE, "c1:10")
+
+    hit = cache.lookup("ar:0", unit(1, 0.1, 0), "c1:10")
+    assert hit["answer"] == RESPONSE["answer"]
+    assert hit["source_documents"][0].metadata == {"article_number": 40}
+    assert cache.lookup("ar:0", unit(0, 1, 0), "c1:10") is None
+    assert cache.lookup("en:0", unit(1, 0, 0), "c1:10") is None
+    assert cache.stats()["hit_rate"] == round(1 / 3, 4)
+
+def test_entries_persist_and_are_invalidated_by_collection_change(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    SemanticAnswerCache(path).store("ar:0", "q", unit(0, 0, 1), RESPONSE, "c1:10")
+
+    reopened = SemanticAnswerCache(path)
+    assert reopened.lookup("ar:0", unit(0, 0, 1), "c1:10") is not None
+    assert reopened.lookup("ar:0", unit(0, 0, 1), "c2:10") is None
+    assert reopened.stats()["size"] == 0
+    assert SemanticAnswerCache(path).stats()["size"] == 0
+
+def test_least_recently_used_and_expired_entries_are_dropped(tmp_path):
+    cache = SemanticAnswerCache(str(tmp_path / "cache.sqlite3"), max_entries=2)
+    cache.store("ar:0", "a", unit(1, 0, 0), RESPONSE, "c")
+    cache.store("ar:0", "b", unit(0, 1, 0), RESPONSE, "c")
+    assert cache.lookup("ar:0", unit(1, 0, 0), "c") is not None
+    cache.store("ar:0", "c", unit(0, 0, 1), RESPONSE, "c")
+    assert cache.lookup("ar:0", unit(0, 1, 0), "c") is None
+    assert cache.lookup("ar:0", unit(1, 0, 0), "c") is not None
+    assert cache.stats()["evictions"] == 1
+
+    cache.ttl_seconds = -1
+    assert cache.lookup("ar:0", unit(1, 0, 0), "c") is None
+    assert cache.stats()["size"] == 0
+
+def test_questions_citing_other_articles_do_not_share_answers(tmp_path):
+    from src.rag_system import ArabicRAGSystem
+    system = ArabicRAGSystem.__new__(ArabicRAGSystem)
+    system.cache_namespace = "ar:0"
+    cache = SemanticAnswerCache(str(tmp_path / "cache.sqlite3"), similarity_threshold=0.9)
+    cache.store(system._namespace("ما نص المادة 46؟"), "ما نص المادة 46؟", unit(1, 0, 0), RESPONSE, "c")
+
+    assert cache.lookup(system._namespace("ما نص المادة (46)؟"), unit(1, 0, 0), "c") is not None
+    assert cache.lookup(system._namespace("ما نص المادة 47؟"), unit(1, 0, 0), "c") is None
+    assert system._namespace("ما مدة العقد؟") == "ar:0"
+
+def test_near_duplicate_questions_with_different_answers_do_not_share_them(tmp_path):
+    from src.rag_system import ArabicRAGSystem
+    system = ArabicRAGSystem.__new__(ArabicRAGSystem)
+    system.cache_namespace = "ar:0"
+    cache = SemanticAnswerCache(str(tmp_path / "cache.sqlite3"), similarity_threshold=0.98)
+    general = "ما مدة الإعلان في المنافسة العامة؟"
+    limited = "ما مدة الإعلان في المنافسة المحدودة؟"
+    cache.store(system._namespace(general), general, unit(1, 0.01, 0), RESPONSE, "c")
+
+    # Same wording apart from the competition type: the embeddings are nearly identical
+    assert cache.lookup(system._namespace(limited), unit(1, 0.02, 0), "c") is None
+    assert cache.lookup(system._namespace("ما مدة الاعلان في المنافسه العامه"), unit(1, 0.02, 0), "c") is not None
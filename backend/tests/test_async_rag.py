@@ -0,0 +1,60 @@
+import asyncio
+from langchain.schema import Document
+from langchain_community.chat_models.fake import FakeListChatModel
+from src.context_builder import ContextBuilder, _ApproximateTokenizer
+from src.qa_chain import QAChainHandler
+from src.templates import get_prompt_template
+
+def metadata(article_number):
+    return dict(article_number=article_number, chapter_number=1, chapter_name="c", section_number=1,
+                section_name="s", summary="m")
+
+class FakeEmbeddings:
+    async def aembed_query(self, text):
+        await asyncio.sleep(0.01)
+        return [1.0, 0.0]
+
+class FakeVectorStore:
+    embeddings = FakeEmbeddings()
+
+    async def asimilarity_search_by_vector(self, embedding, k=4):
+        return [Document(page_content=f"نص المادة {number}", metadata=metadata(number)) for number in range(1, k + 1)]
+
+class CountingChatModel(FakeListChatModel):
+    in_flight: int = 0
+    peak: int = 0
+
+    async def ainvoke(self, *args, **kwargs):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        try:
+            return await super().ainvoke(*args, **kwargs)
+        finally:
+            self.in_flight -= 1
+
+def make_handler(max_concurrency):
+    handler = QAChainHandler.__new__(QAChainHandler)
+    handler.lang = 'ar'
+    handler.max_concurrency = max_concurrency
+    handler.hybrid_retrieval = False
+    handler.llm = CountingChatModel(responses=["جواب"])
+    handler.prompt_template = get_prompt_template('ar')
+    handler.context_builder = ContextBuilder("gpt-4-turbo-preview", lang='ar', tokenizer=_ApproximateTokenizer())
+    handler.vectorstore = FakeVectorStore()
+    return handler
+
+def test_aquery_returns_answer_and_sources():
+    response = asyncio.run(make_handler(4).aquery("ما مدة الإعلان؟"))
+    assert response["answer"] == "جواب"
+    assert len(response["source_documents"]) == 3
+    assert response["formatted_sources"][0].startswith("المادة 1")
+
+def test_aquery_limits_concurrent_llm_calls():
+    handler = make_handler(3)
+
+    async def run_many():
+        return await asyncio.gather(*(handler.aquery(f"سؤال {i}") for i in range(20)))
+
+    assert len(asyncio.run(run_many())) == 20
+    assert handler.llm.peak == 3
@@ -0,0 +1,47 @@
+from langchain.schema import Document
+from src.context_builder import ContextBuilder, _ApproximateTokenizer
+
+class WordTokenizer:
+    def encode(self, text):
+        return text.split(" ")
+
+    def decode(self, tokens):
+        return " ".join(tokens)
+
+def chunk(article_number, text):
+    return Document(page_content=text, metadata={"article_number": article_number})
+
+def test_chunks_of_one_article_are_merged_without_the_overlap():
+    builder = ContextBuilder("gpt-4-turbo-preview", max_tokens=1000, tokenizer=WordTokenizer())
+    documents = [
+        chunk(46, "أ ب ج د هـ"),
+        chunk(12, "نص آخر"),
+        chunk(46, "د هـ و ز"),
+        chunk(46, "ب ج"),
+    ]
+    context, kept = builder.build(documents)
+    assert [doc.metadata["article_number"] for doc in kept] == [46, 12]
+    assert kept[0].page_content == "أ ب ج د هـ و ز"
+    assert context == "[المادة 46]\nأ ب ج د هـ و ز\n\n[المادة 12]\nنص آخر"
+
+def test_articles_with_the_same_number_in_other_chapters_are_kept_apart():
+    builder = ContextBuilder("gpt-4-turbo-preview", max_tokens=1000, tokenizer=WordTokenizer())
+    law = {"article_number": 5, "chapter_number": 1, "chapter_name": "النظام", "section_number": 1, "section_name": "أحكام"}
+    regulation = {**law, "chapter_number": 2, "chapter_name": "اللائحة"}
+    documents = [
+        Document(page_content="نص النظام", metadata=law),
+        Document(page_content="نص اللائحة", metadata=regulation),
+    ]
+    _, kept = builder.build(documents)
+    assert [doc.page_content for doc in kept] == ["نص النظام", "نص اللائحة"]
+
+def test_scores_order_blocks_and_budget_cuts_the_last_one():
+    tokenizer = _ApproximateTokenizer()
+    builder = ContextBuilder("unknown-model", max_tokens=150, tokenizer=tokenizer)
+    documents = [chunk(1, "ا" * 100), chunk(2, "ب" * 60), chunk(3, "ج" * 400)]
+    context, kept = builder.build(documents, scores=[0.2, 0.9, 0.5])
+
+    assert [doc.metadata["article_number"] for doc in kept] == [2, 3]
+    assert context.startswith("[المادة 2]\n" + "ب" * 60)
+    assert builder.count_tokens(context) <= 150
+    assert ContextBuilder("unknown-model", tokenizer=tokenizer).max_tokens == 3000
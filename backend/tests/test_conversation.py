@@ -0,0 +1,33 @@
+from langchain_community.chat_models.fake import FakeListChatModel
+from src.conversation import ConversationCondenser
+
+class RecordingChatModel(FakeListChatModel):
+    prompts: list = []
+
+    def invoke(self, prompt, *args, **kwargs):
+        self.prompts.append(prompt)
+        return super().invoke(prompt, *args, **kwargs)
+
+def make_condenser(responses, window=2):
+    return ConversationCondenser(RecordingChatModel(responses=responses, prompts=[]), "ar", window=window)
+
+def test_first_question_is_not_condensed():
+    condenser = make_condenser(["unused"])
+    assert condenser.condense("ما مدة الإعلان؟", [], None) == "ما مدة الإعلان؟"
+    assert condenser.llm.prompts == []
+
+def test_condense_prompt_holds_summary_and_last_window_turns_only():
+    condenser = make_condenser(["ما مدة تمديد الإعلان في المنافسة العامة؟"])
+    history = [(f"سؤال {i}", f"جواب {i}") for i in range(10)]
+    standalone = condenser.condense("وكم يمكن تمديدها؟", history, "نوقشت المادة 40")
+
+    assert standalone == "ما مدة تمديد الإعلان في المنافسة العامة؟"
+    prompt = condenser.llm.prompts[0]
+    assert "نوقشت المادة 40" in prompt and "سؤال 9" in prompt and "سؤال 8" in prompt
+    assert "سؤال 7" not in prompt
+
+def test_update_summary_folds_turns():
+    condenser = make_condenser(["ملخص جديد"])
+    assert condenser.update_summary("ملخص قديم", [("سؤال", "جواب")]) == "ملخص جديد"
+    assert "ملخص قديم" in condenser.llm.prompts[0] and "جواب" in condenser.llm.prompts[0]
+    assert condenser.update_summary("ملخص قديم", []) == "ملخص قديم"
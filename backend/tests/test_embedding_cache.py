@@ -0,0 +1,84 @@
+import asyncio
+import sqlite3
+import numpy as np
+from langchain_community.embeddings import DeterministicFakeEmbedding
+from src.embedding_cache import CachedEmbeddings, EmbeddingCache
+
+class CountingEmbeddings(DeterministicFakeEmbedding):
+    calls: int = 0
+
+    def embed_query(self, text):
+        self.calls += 1
+        return super().embed_query(text)
+
+def test_repeated_query_is_embedded_once_per_model():
+    cache = EmbeddingCache(max_entries=10)
+    inner = CountingEmbeddings(size=8)
+    embeddings = CachedEmbeddings(inner, cache, "model-a")
+
+    first = embeddings.embed_query("ما مدة  الإعلان؟")
+    assert embeddings.embed_query(" ما مدة الإعلان؟ ") == first
+    assert asyncio.run(embeddings.aembed_query("ما مدة الإعلان؟")) == first
+    assert inner.calls == 1
+    np.testing.assert_allclose(first, inner.embed_query("ما مدة  الإعلان؟"), rtol=1e-6)
+
+    CachedEmbeddings(inner, cache, "model-b").embed_query("ما مدة الإعلان؟")
+    stats = cache.stats()
+    assert stats["size"] == 2 and stats["bytes"] == 2 * 8 * 4
+    assert stats["hits"] == 2 and stats["misses"] == 2
+
+def test_lru_bound_and_persistence(tmp_path):
+    path = str(tmp_path / "embeddings.sqlite3")
+    cache = EmbeddingCache(path, max_entries=2)
+    cache.set("m", "a", [1.0, 0.0])
+    cache.set("m", "b", [0.0, 1.0])
+    assert cache.get("m", "a") is not None
+    cache.set("m", "c", [1.0, 1.0])
+    assert cache.get("m", "b") is None
+    assert cache.stats()["evictions"] == 1
+
+    reopened = EmbeddingCache(path, max_entries=2)
+    assert reopened.stats()["size"] == 2
+    assert reopened.get("m", "A") == [1.0, 0.0]
+    assert reopened.get("m", "b") is None
+
+def test_hits_do_not_write_until_the_next_store(tmp_path):
+    path = str(tmp_path / "embeddings.sqlite3")
+    cache = EmbeddingCache(path, max_entries=10)
+    cache.set("m", "a", [1.0, 0.0])
+    stored = sqlite3.connect(path).execute("SELECT last_used FROM embedding_cache").fetchone()[0]
+
+    cache.get("m", "a")
+    assert sqlite3.connect(path).execute("SELECT last_used FROM embedding_cache").fetchone()[0] == stored
+    cache.set("m", "b", [0.0, 1.0])
+    assert sqlite3.connect(path).execute(
+        "SELECT last_used FROM embedding_cache WHERE text = 'a'").fetchone()[0] > stored
+
+def test_failing_cache_falls_back_to_the_wrapped_embeddings():
+    class BrokenCache(EmbeddingCache):
+        def get(self, model, text):
+            raise sqlite3.OperationalError("database is locked")
+
+        def set(self, model, text, embedding):
+            raise sqlite3.OperationalError("database is locked")
+
+    inner = CountingEmbeddings(size=8)
+    embeddings = CachedEmbeddings(inner, BrokenCache(), "m")
+    assert embeddings.embed_query("سؤال") == inner.embed_query("سؤال")
+    assert asyncio.run(embeddings.aembed_query("سؤال")) == inner.embed_query("سؤال")
+
+def test_async_queries_use_the_cache_off_the_event_loop():
+    import threading
+    threads = []
+
+    class RecordingCache(EmbeddingCache):
+        def get(self, model, text):
+            threads.append(threading.current_thread())
+            return super().get(model, text)
+
+    inner = CountingEmbeddings(size=8)
+    embeddings = CachedEmbeddings(inner, RecordingCache(), "m")
+    first = asyncio.run(embeddings.aembed_query("سؤال"))
+    assert asyncio.run(embeddings.aembed_query("سؤال")) == first
+    assert inner.calls == 1
+    assert threading.main_thread() not in threads
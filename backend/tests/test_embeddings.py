@@ -0,0 +1,78 @@
+import pytest
+from langchain_community.embeddings import DeterministicFakeEmbedding
+from langchain_community.vectorstores import Chroma
+from langchain_openai import OpenAIEmbeddings
+from src.embeddings import DEFAULT_EMBEDDING_MODEL, get_embeddings, is_local_model
+from src.templates import get_persist_directory
+from src.document_processor import DocumentProcessor
+from src.vector_store import rebuild_collection, sync_collection
+
+def test_default_model_keeps_original_directories():
+    assert get_persist_directory('ar') == get_persist_directory('ar', DEFAULT_EMBEDDING_MODEL)
+    assert get_persist_directory('ar', 'local:intfloat/multilingual-e5-large') == \
+        get_persist_directory('ar') + "_local_intfloat_multilingual_e5_large"
+    assert isinstance(get_embeddings(DEFAULT_EMBEDDING_MODEL, openai_api_key="test"), OpenAIEmbeddings)
+    assert is_local_model("local") and is_local_model("local:BAAI/bge-m3")
+    assert not is_local_model("text-embedding-3-small")
+
+def test_rebuild_collection_copies_chunks_with_new_embeddings(tmp_path):
+    texts = [f"المادة {number}: نص المادة" for number in range(1, 11)]
+    metadatas = [{"article_number": number} for number in range(1, 11)]
+    source = Chroma.from_texts(
+        texts, DeterministicFakeEmbedding(size=8), metadatas=metadatas,
+        persist_directory=str(tmp_path / "source"), collection_name="arabic_docs"
+    )
+    source_ids = sorted(source.get()["ids"])
+
+    new_embeddings = DeterministicFakeEmbedding(size=16)
+    stats = rebuild_collection(str(tmp_path / "source"), str(tmp_path / "target"), "arabic_docs",
+                               new_embeddings, batch_size=3)
+    assert stats["chunks"] == 10
+
+    target = Chroma(persist_directory=str(tmp_path / "target"), embedding_function=new_embeddings,
+                    collection_name="arabic_docs")
+    assert sorted(target.get()["ids"]) == source_ids
+    assert target.similarity_search(texts[4], k=1)[0].metadata == {"article_number": 5}
+
+class FailingEmbeddings(DeterministicFakeEmbedding):
+    def embed_documents(self, texts):
+        raise RuntimeError("API unavailable")
+
+def test_failed_rebuild_leaves_the_target_untouched(tmp_path):
+    texts = [f"المادة {number}" for number in range(1, 6)]
+    Chroma.from_texts(texts, DeterministicFakeEmbedding(size=8), persist_directory=str(tmp_path / "source"),
+                      collection_name="arabic_docs")
+    rebuild_collection(str(tmp_path / "source"), str(tmp_path / "target"), "arabic_docs",
+                       DeterministicFakeEmbedding(size=16), batch_size=2)
+
+    with pytest.raises(RuntimeError):
+        rebuild_collection(str(tmp_path / "source"), str(tmp_path / "target"), "arabic_docs",
+                           FailingEmbeddings(size=16), batch_size=2)
+    with pytest.raises(ValueError):
+        rebuild_collection(str(tmp_path / "source"), str(tmp_path / "source"), "arabic_docs",
+                           DeterministicFakeEmbedding(size=8))
+
+    target = Chroma(persist_directory=str(tmp_path / "target"), collection_name="arabic_docs")
+    assert len(target.get()["ids"]) == 5
+    assert not (tmp_path / "target.building").exists()
+
+def test_sync_collection_embeds_only_new_or_changed_chunks(tmp_path):
+    processor = DocumentProcessor(chunk_size=500, chunk_overlap=50)
+    articles = [
+        {"number": number, "type": "النظام", "content": f"نص المادة رقم {number}", "summary": "",
+         "chapter": {"number": 1, "name": "فصل"}, "section": {"number": 1, "name": "قسم"}}
+        for number in range(1, 6)
+    ]
+    embeddings = DeterministicFakeEmbedding(size=8)
+    first = sync_collection(str(tmp_path), "arabic_docs", embeddings, processor.split_articles(articles), batch_size=2)
+    assert (first["embedded"], first["embedding_calls"], first["deleted"]) == (5, 3, 0)
+
+    articles[1]["content"] = "نص معدل للمادة 2"
+    del articles[4]
+    second = sync_collection(str(tmp_path), "arabic_docs", embeddings, processor.split_articles(articles), batch_size=2)
+    assert (second["embedded"], second["unchanged"], second["deleted"]) == (1, 3, 1)
+    assert second["embedding_calls"] == 1 and second["embedding_calls_saved"] == 2
+
+    stored = Chroma(persist_directory=str(tmp_path), embedding_function=embeddings, collection_name="arabic_docs").get()
+    assert sorted(stored["ids"]) == ["System-1-0", "System-2-0", "System-3-0", "System-4-0"]
+    assert "نص معدل للمادة 2" in stored["documents"]
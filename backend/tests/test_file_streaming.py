@@ -0,0 +1,72 @@
+from flask import Flask
+from app.LocalDriveLibrary import LocalDriveLibrary
+from app.utils.file_streaming import file_response, stream_file
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+def make_client(library):
+    app = Flask(__name__)
+
+    @app.route('/files/<path:file_id>')
+    def view(file_id):
+        file_path = library.resolve_file(file_id)
+        if file_path is None:
+            return {'error': 'File not found'}, 404
+        return stream_file(file_path)
+
+    return app.test_client()
+
+def test_range_and_conditional_requests(tmp_path):
+    (tmp_path / 'docs').mkdir()
+    (tmp_path / 'docs' / 'guide.pdf').write_bytes(b'%PDF-' + bytes(range(256)) * 4)
+    client = make_client(LocalDriveLibrary(str(tmp_path)))
+
+    full = client.get('/files/docs/guide.pdf')
+    assert full.status_code == 200 and full.mimetype == 'application/pdf'
+    assert full.headers['Accept-Ranges'] == 'bytes'
+    assert full.headers['Content-Disposition'].startswith('inline')
+    assert full.headers['Content-Length'] == str(5 + 1024)
+
+    part = client.get('/files/docs/guide.pdf', headers={'Range': 'bytes=5-9'})
+    assert part.status_code == 206
+    assert part.data == bytes(range(5))
+    assert part.headers['Content-Range'] == 'bytes 5-9/1029'
+
+    assert client.get('/files/docs/guide.pdf', headers={'If-None-Match': full.headers['ETag']}).status_code == 304
+    full.close()
+    part.close()
+
+def test_paths_outside_the_library_are_not_served(tmp_path):
+    (tmp_path / 'library').mkdir()
+    (tmp_path / 'secret.txt').write_text('secret')
+    library = LocalDriveLibrary(str(tmp_path / 'library'))
+
+    assert library.resolve_file('../secret.txt') is None
+    assert library.resolve_file('') is None
+    assert make_client(library).get('/files/..%2Fsecret.txt').status_code == 404
+
+def test_asgi_file_response_supports_range_and_etag(tmp_path):
+    (tmp_path / 'docs').mkdir()
+    (tmp_path / 'docs' / 'دليل.pdf').write_bytes(b'%PDF-' + bytes(range(256)) * 4)
+    library = LocalDriveLibrary(str(tmp_path))
+
+    async def view(request):
+        file_path = library.resolve_file(request.path_params['file_id'])
+        if file_path is None:
+            return JSONResponse({'error': 'File not found'}, 404)
+        return file_response(request, file_path)
+
+    client = TestClient(Starlette(routes=[Route('/files/{file_id:path}', view)]))
+    full = client.get('/files/docs/دليل.pdf')
+    assert full.status_code == 200 and full.headers['content-type'] == 'application/pdf'
+    assert full.headers['content-disposition'].startswith('inline')
+    assert full.headers['cache-control'] == 'private, no-cache'
+
+    part = client.get('/files/docs/دليل.pdf', headers={'Range': 'bytes=5-9'})
+    assert part.status_code == 206 and part.content == bytes(range(5))
+
+    cached = client.get('/files/docs/دليل.pdf', headers={'If-None-Match': full.headers['etag']})
+    assert cached.status_code == 304 and cached.content == b''
+    assert client.get('/files/../outside.pdf').status_code == 404
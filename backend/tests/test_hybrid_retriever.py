@@ -0,0 +1,71 @@
+import asyncio
+from langchain_community.embeddings import DeterministicFakeEmbedding
+from langchain_community.vectorstores import Chroma
+from src import vector_store
+from src.hybrid_retriever import HybridRetriever, cited_articles, cited_document_type, reciprocal_rank_fusion
+
+CHUNKS = [
+    (45, "تقدم العروض في الموعد المحدد في إعلان المنافسة"),
+    (46, "يجوز للجهة الحكومية تمديد فترة تلقي العروض إذا دعت الحاجة"),
+    (47, "يقدم الضمان الابتدائي بنسبة من قيمة العرض"),
+    (48, "تفتح المظاريف في حضور المتنافسين أو مندوبيهم"),
+    (60, "يجوز التعاقد بأسلوب الشراء المباشر في حالات الطوارئ"),
+]
+
+def make_retriever(tmp_path, k=2):
+    vectorstore = Chroma.from_texts(
+        [text for _, text in CHUNKS], DeterministicFakeEmbedding(size=16),
+        metadatas=[{"article_number": number, "summary": ""} for number, _ in CHUNKS],
+        persist_directory=str(tmp_path), collection_name="arabic_docs"
+    )
+    return HybridRetriever(vectorstore=vectorstore, k=k, candidate_k=5)
+
+def test_cited_articles_and_fusion():
+    assert cited_articles("ما نص المادة ٤٦ و المادة (47)؟") == [46, 47]
+    assert cited_articles("What does Article 46 say?") == [46]
+    assert cited_articles("ما مدة الإعلان؟") == []
+    fused = reciprocal_rank_fusion([[1, 2, 3], [3, 1]], k=60)
+    assert [position for position, _ in fused] == [1, 3, 2]
+
+def test_article_number_short_circuits_dense_search(tmp_path):
+    retriever = make_retriever(tmp_path)
+    documents = retriever.invoke("ماذا تنص المادة 46 بشأن تمديد العروض؟")
+    assert documents[0].metadata["article_number"] == 46
+    assert len(documents) == 2
+    assert [doc.metadata["article_number"] for doc in asyncio.run(retriever.aretrieve("المادة 60"))][0] == 60
+
+def test_cited_article_is_looked_up_in_the_named_document(tmp_path):
+    texts = ["مدة الإعلان عشرة أيام", "مدة الإعلان خمسة أيام"]
+    vectorstore = Chroma.from_texts(
+        texts, DeterministicFakeEmbedding(size=16),
+        metadatas=[{"article_number": 30, "type": "System"}, {"article_number": 30, "type": "Regulation"}],
+        persist_directory=str(tmp_path), collection_name="arabic_docs"
+    )
+    retriever = HybridRetriever(vectorstore=vectorstore, k=1, candidate_k=5)
+    assert cited_document_type("ما نص المادة 30 من نظام المنافسات؟") == "System"
+    assert cited_document_type("Article 30 of the Implementing Regulation") == "Regulation"
+    assert cited_document_type("المادة 30 من النظام واللائحة") is None
+    assert [doc.metadata["type"] for doc in retriever.invoke("المادة 30 من النظام")] == ["System"]
+    assert [doc.metadata["type"] for doc in retriever.invoke("المادة 30 من اللائحة التنفيذية")] == ["Regulation"]
+    retriever.k = 2
+    assert sorted(doc.metadata["type"] for doc in retriever.invoke("المادة 30")) == ["Regulation", "System"]
+
+def test_lexical_match_is_fused_into_dense_results(tmp_path):
+    retriever = make_retriever(tmp_path, k=3)
+    numbers = [doc.metadata["article_number"] for doc in retriever.invoke("الشراء المباشر في الطوارئ")]
+    assert 60 in numbers and len(numbers) == 3
+
+def test_amended_chunks_are_reindexed_when_the_revision_changes(tmp_path, monkeypatch):
+    retriever = make_retriever(tmp_path)
+    assert retriever.lexical_ranking("الإلكترونية") == []
+
+    collection = retriever.vectorstore._collection
+    chunk_id = collection.get(where={"article_number": 48})["ids"][0]
+    text = "تفتح المظاريف عبر البوابة الإلكترونية"
+    collection.update(ids=[chunk_id], documents=[text], embeddings=DeterministicFakeEmbedding(size=16).embed_documents([text]))
+    collection.modify(metadata={"revision": 1})
+    # The fingerprint is reused for a short interval
+    assert retriever.lexical_ranking("الإلكترونية") == []
+    monkeypatch.setattr(vector_store, "FINGERPRINT_TTL_SECONDS", 0)
+    assert [retriever._documents[position].metadata["article_number"]
+            for position in retriever.lexical_ranking("الإلكترونية")] == [48]
@@ -0,0 +1,72 @@
+import os
+from docx import Document
+from openpyxl import Workbook
+from app.LibraryContentIndex import LibraryContentIndex, highlight_snippet
+from app.LibraryIndex import LibraryIndex
+from app.LocalDriveLibrary import LocalDriveLibrary
+
+def make_library(root):
+    (root / 'أدلة').mkdir()
+    document = Document()
+    document.add_paragraph('يجب على المتعاقد تقديم الضمان النهائي خلال خمسة عشر يوماً.')
+    document.add_paragraph('تُحسب غرامة التأخير وفق المادة الثانية والسبعين.')
+    document.save(str(root / 'أدلة' / 'دليل العقود.docx'))
+    workbook = Workbook()
+    workbook.active.title = 'الأسعار'
+    workbook.active.append(['البند', 'السعر'])
+    workbook.active.append(['توريد أجهزة', 1500])
+    workbook.save(str(root / 'جدول.xlsx'))
+    (root / 'صورة.png').write_bytes(b'not extracted')
+
+def make_index(root, db_path):
+    library_index = LibraryIndex(str(root), poll_interval=0)
+    library_index.start()
+    return library_index, LibraryContentIndex(library_index, db_path, workers=1)
+
+def test_content_search_with_snippets(tmp_path):
+    library = tmp_path / 'library'
+    library.mkdir()
+    make_library(library)
+    library_index, content_index = make_index(library, str(tmp_path / 'text.sqlite3'))
+    content_index.sync()
+
+    results = content_index.search('الضمان النهائي')
+    assert [r['id'] for r in results] == [os.path.join('أدلة', 'دليل العقود.docx')]
+    match = results[0]['matches'][0]
+    assert match['page'] == 1
+    start, end = match['highlights'][0]
+    assert match['text'][start:end] == 'الضمان'
+
+    assert [r['id'] for r in content_index.search('اجهزه')] == ['جدول.xlsx']
+    assert content_index.search('اجهزه', folder_id='أدلة') == []
+
+    drive = LocalDriveLibrary(str(library), index=library_index, content_index=content_index)
+    found = drive.search_files('غرامة التأخير', content=True)
+    assert found[0]['name'] == 'دليل العقود.docx' and found[0]['matches']
+    assert drive.search_files('غرامة', content=True, file_type='pdf') == []
+
+def test_extraction_is_incremental_by_hash(tmp_path):
+    library = tmp_path / 'library'
+    library.mkdir()
+    make_library(library)
+    db_path = str(tmp_path / 'text.sqlite3')
+    library_index, content_index = make_index(library, db_path)
+    content_index.sync()
+    assert content_index.extracted == 2
+
+    # A moved file keeps its hash: nothing is extracted again, by this or a new process
+    os.rename(library / 'جدول.xlsx', library / 'أدلة' / 'جدول.xlsx')
+    library_index.refresh()
+    content_index.sync()
+    restarted = make_index(library, db_path)[1]
+    restarted.sync()
+    assert content_index.extracted == 2 and restarted.extracted == 0
+    assert [r['id'] for r in restarted.search('اجهزه')] == [os.path.join('أدلة', 'جدول.xlsx')]
+    assert restarted.stats()['documents'] == 2
+
+def test_highlight_snippet_maps_normalized_matches_back():
+    text = 'نص طويل ' * 30 + 'تُلغى المنافسة إذا تبيّن أنّ العروض مخالفة.'
+    snippet = highlight_snippet(text, ['منافسه', 'عروض'], width=60)
+    words = [snippet['text'][start:end] for start, end in snippet['highlights']]
+    assert words == ['المنافسة', 'العروض']
+    assert len(snippet['text']) <= 60
@@ -0,0 +1,91 @@
+import os
+import pytest
+from app.LibraryIndex import LibraryIndex
+from app.LocalDriveLibrary import LocalDriveLibrary
+
+def make_tree(root):
+    (root / 'أدلة إرشادية').mkdir()
+    (root / 'أدلة إرشادية' / 'الدليل الإجرائي للمنافسات.pdf').write_bytes(b'x' * 300)
+    (root / 'أدلة إرشادية' / 'نموذج عقد.docx').write_bytes(b'x' * 20)
+    (root / 'لائحة المشتريات.pdf').write_bytes(b'x' * 5)
+
+def test_listing_and_search_match_the_filesystem(tmp_path):
+    make_tree(tmp_path)
+    index = LibraryIndex(str(tmp_path), poll_interval=0)
+    index.start()
+    indexed = LocalDriveLibrary(str(tmp_path), index=index)
+    plain = LocalDriveLibrary(str(tmp_path))
+
+    assert indexed.list_folder_contents() == plain.list_folder_contents()
+    assert indexed.list_folder_contents('أدلة إرشادية', 'size', 'desc') == \
+        plain.list_folder_contents('أدلة إرشادية', 'size', 'desc')
+    assert sorted(f['id'] for f in indexed.search_files('عقد')) == \
+        sorted(f['id'] for f in plain.search_files('عقد'))
+    assert [f['name'] for f in indexed.search_files('pdf', min_size=100)] == ['الدليل الإجرائي للمنافسات.pdf']
+
+def test_search_normalizes_arabic_and_matches_token_prefixes(tmp_path):
+    make_tree(tmp_path)
+    index = LibraryIndex(str(tmp_path), poll_interval=0)
+    index.start()
+
+    # Hamza and definite article folded: "ادله" finds "أدلة", "اجرائي" finds "الإجرائي"
+    assert [r['id'] for r in index.search('ادله')] == ['أدلة إرشادية']
+    assert [r['name'] for r in index.search('دليل اجرا')] == ['الدليل الإجرائي للمنافسات.pdf']
+    assert index.search('عقد', folder_id='أدلة إرشادية', recursive=False)[0]['name'] == 'نموذج عقد.docx'
+    assert index.search('عقد', folder_id='', recursive=False) == []
+
+def test_refresh_picks_up_changes_and_sqlite_snapshot_is_reused(tmp_path):
+    library = tmp_path / 'library'
+    library.mkdir()
+    make_tree(library)
+    db_path = str(tmp_path / 'index.sqlite3')
+    index = LibraryIndex(str(library), poll_interval=0, db_path=db_path)
+    index.start()
+
+    assert index.refresh() is False
+    (library / 'تعميم جديد.pdf').write_bytes(b'x')
+    os.remove(library / 'لائحة المشتريات.pdf')
+    assert index.refresh() is True
+    assert sorted(r['name'] for r in index.list_folder()) == ['أدلة إرشادية', 'تعميم جديد.pdf']
+
+    restarted = LibraryIndex(str(library), poll_interval=0, db_path=db_path)
+    assert restarted._load() is True
+    assert restarted.stats()['entries'] == index.stats()['entries'] == 4
+
+def collect_pages(index, **kwargs):
+    ids, cursor = [], None
+    while True:
+        records, cursor, total = index.page(cursor=cursor, **kwargs)
+        ids.extend(record['id'] for record in records)
+        if cursor is None:
+            return ids, total
+
+def test_cursor_pages_use_typed_sort_keys(tmp_path):
+    for name, size in (('a.pdf', 9), ('b.pdf', 10), ('c.pdf', 100), ('d.pdf', 10)):
+        (tmp_path / name).write_bytes(b'x' * size)
+    index = LibraryIndex(str(tmp_path), poll_interval=0)
+    index.start()
+
+    # Numeric order (the string sizes would give 10 < 100 < 9), ties by id
+    assert collect_pages(index, sort_by='size', limit=3) == (['a.pdf', 'b.pdf', 'd.pdf', 'c.pdf'], 4)
+    assert collect_pages(index, sort_by='size', sort_order='desc', limit=3)[0] == ['c.pdf', 'd.pdf', 'b.pdf', 'a.pdf']
+    assert [f['name'] for f in LocalDriveLibrary(str(tmp_path)).list_folder_contents(sort_by='size')] == \
+        ['a.pdf', 'b.pdf', 'd.pdf', 'c.pdf']
+
+def test_cursor_is_stable_across_changes(tmp_path):
+    for name in ('b', 'd', 'f', 'h'):
+        (tmp_path / f'{name}.pdf').write_bytes(b'x')
+    index = LibraryIndex(str(tmp_path), poll_interval=0)
+    index.start()
+
+    first, cursor, _ = index.page(limit=2)
+    assert [r['id'] for r in first] == ['b.pdf', 'd.pdf']
+    (tmp_path / 'a.pdf').write_bytes(b'x')
+    (tmp_path / 'e.pdf').write_bytes(b'x')
+    os.remove(tmp_path / 'd.pdf')
+    index.refresh()
+    rest, cursor, total = index.page(limit=10, cursor=cursor)
+    assert [r['id'] for r in rest] == ['e.pdf', 'f.pdf', 'h.pdf'] and cursor is None and total == 5
+
+    with pytest.raises(ValueError):
+        index.page(sort_by='size', cursor=index.page(limit=1)[1])
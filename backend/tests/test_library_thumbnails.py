@@ -0,0 +1,59 @@
+import os
+import time
+import pytest
+from PIL import Image
+from app.LibraryThumbnails import LibraryThumbnails, ThumbnailNotReady
+
+def make_library(root):
+    Image.new('RGB', (1200, 800), 'navy').save(root / 'صورة.jpg')
+    Image.new('RGB', (600, 850), 'white').save(root / 'تعميم.pdf')
+    (root / 'جدول.xlsx').write_bytes(b'no preview')
+
+def test_thumbnails_are_rendered_once_as_small_webp(tmp_path):
+    library = tmp_path / 'library'
+    library.mkdir()
+    make_library(library)
+    thumbnails = LibraryThumbnails(str(library), str(tmp_path / 'cache'), size=128, workers=1)
+
+    for file_id, landscape in (('صورة.jpg', True), ('تعميم.pdf', False)):
+        path = thumbnails.get_thumbnail(file_id)
+        with Image.open(path) as image:
+            assert image.format == 'WEBP' and max(image.size) == 128
+            assert (image.width > image.height) == landscape
+        assert thumbnails.get_thumbnail(file_id) == path
+    assert thumbnails.stats()['rendered'] == 2
+
+def test_changed_missing_and_unsupported_files(tmp_path):
+    library = tmp_path / 'library'
+    library.mkdir()
+    make_library(library)
+    (tmp_path / 'outside.png').write_bytes(b'')
+    thumbnails = LibraryThumbnails(str(library), str(tmp_path / 'cache'), size=64, workers=1)
+
+    first = thumbnails.get_thumbnail('صورة.jpg')
+    stats = os.stat(library / 'صورة.jpg')
+    os.utime(library / 'صورة.jpg', ns=(stats.st_atime_ns, stats.st_mtime_ns + 10 ** 9))
+    assert thumbnails.get_thumbnail('صورة.jpg') != first
+
+    assert thumbnails.get_thumbnail('جدول.xlsx') is None
+    assert thumbnails.get_thumbnail('missing.pdf') is None
+    assert thumbnails.get_thumbnail('../outside.png') is None
+
+    (library / 'broken.png').write_bytes(b'not an image')
+    assert thumbnails.get_thumbnail('broken.png') is None
+    assert thumbnails.get_thumbnail('broken.png') is None
+    assert thumbnails.stats()['failed'] == 1
+
+def test_requests_do_not_wait_past_the_timeout(tmp_path):
+    library = tmp_path / 'library'
+    library.mkdir()
+    make_library(library)
+    thumbnails = LibraryThumbnails(str(library), str(tmp_path / 'cache'), size=64, workers=1, timeout=0)
+
+    with pytest.raises(ThumbnailNotReady):
+        thumbnails.get_thumbnail('تعميم.pdf')
+    # The render goes on without a waiting request
+    deadline = time.time() + 30
+    while thumbnails.stats()['pending'] and time.time() < deadline:
+        time.sleep(0.05)
+    assert thumbnails.get_thumbnail('تعميم.pdf').endswith('.webp')
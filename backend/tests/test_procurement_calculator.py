@@ -0,0 +1,162 @@
+import dataclasses
+import datetime
+import random
+import pytest
+import json
+import os
+from app.ProcurementCalculator import (
+    DateCalculator, ProcurementCalculator, ProcurementConfig, ProcurementInput,
+    ProcurementSystem, ProcurementType, StageRules, WorkingDayCalendar, WorkType
+)
+
+def walk_working_days(start_date, days, holidays):
+    """Reference implementation: step one day at a time over a Friday/Saturday weekend"""
+    current_date = start_date
+    added = 0
+    while added < days:
+        current_date += datetime.timedelta(days=1)
+        if current_date.weekday() not in (4, 5) and current_date not in holidays:
+            added += 1
+    return current_date
+
+def test_calendar_skips_friday_and_saturday():
+    calendar = WorkingDayCalendar(start_year=2024, end_year=2025)
+    thursday = datetime.date(2024, 6, 6)
+    assert calendar.add_working_days(thursday, 1) == datetime.date(2024, 6, 9)  # Sunday
+    assert not calendar.is_working_day(datetime.date(2024, 6, 7))
+    assert not calendar.is_working_day(datetime.date(2024, 6, 8))
+
+def test_calendar_matches_day_by_day_walk():
+    rng = random.Random(7)
+    standard = [datetime.date(2024, 2, 22), datetime.date(2024, 9, 23)]
+    calendar = WorkingDayCalendar(standard, start_year=2023, end_year=2026)
+    for _ in range(300):
+        start = datetime.date(2024, 1, 1) + datetime.timedelta(days=rng.randrange(500))
+        extra = [start + datetime.timedelta(days=rng.randrange(60)) for _ in range(rng.randrange(4))]
+        days = rng.randrange(0, 40)
+        overlay = calendar.holiday_overlay(extra + standard)
+        expected = walk_working_days(start, days, set(standard) | set(extra))
+        assert calendar.add_working_days(start, days, overlay) == expected
+
+def test_calendar_returns_none_outside_range():
+    calendar = WorkingDayCalendar(start_year=2024, end_year=2024)
+    assert calendar.add_working_days(datetime.date(2024, 12, 30), 10) is None
+    assert calendar.add_working_days(datetime.date(2030, 1, 1), 1) is None
+
+def test_date_calculator_falls_back_outside_calendar_range():
+    start = datetime.date(2070, 1, 1)
+    assert DateCalculator.add_working_days(start, 10, []) == walk_working_days(start, 10, set())
+
+def test_date_calculator_fallback_skips_standard_holidays():
+    # Starts before the calendar range and ends after the 2022-2024 standard holidays
+    start = datetime.date(1989, 12, 1)
+    extra = [datetime.date(2023, 6, 1)]
+    expected = walk_working_days(start, 9000, set(ProcurementConfig.STANDARD_HOLIDAYS) | set(extra))
+    assert expected > datetime.date(2024, 2, 2)
+    assert DateCalculator.add_working_days(start, 9000, extra) == expected
+
+def test_timeline_stages_end_on_working_days():
+    result = ProcurementSystem().process_input(
+        work_type=WorkType.GENERAL_WORK.value, budget=750000,
+        start_date="2024-06-02", project_duration=6, holidays=["2024-06-30"]
+    )
+    for stage in result['stages']:
+        end_date = datetime.date.fromisoformat(stage['end_date'])
+        if stage['is_working_days'] and stage['duration'] > 0:
+            assert end_date.weekday() not in (4, 5)
+            assert end_date != datetime.date(2024, 6, 30)
+
+def test_shared_holiday_overlay_matches_per_input_overlay():
+    system = ProcurementSystem()
+    holidays = ["2024-06-30", "2024-07-07"]
+    overlay = system.holiday_overlay(holidays)
+    for budget in (50000, 750000, 50000000):
+        kwargs = dict(work_type=WorkType.GENERAL_WORK.value, budget=budget,
+                      start_date="2024-06-02", project_duration=6, holidays=holidays)
+        assert system.process_input(holiday_overlay=overlay, **kwargs) == system.process_input(**kwargs)
+
+def test_scenario_sweep_matches_single_calculations():
+    system = ProcurementSystem()
+    budgets = [50000, 100000, 100001, 750000, 5000000, 200000000]
+    start_dates = ["2024-06-06", "2024-06-07", "2024-06-20", "2025-02-27"]
+    holidays = ["2024-06-30"]
+    for work_type in (WorkType.GENERAL_WORK, WorkType.UNDEFINED_SPECS):
+        table = system.process_sweep(work_type.value, budgets, start_dates, 18, holidays)
+        assert len(table['rows']) == len(budgets) * len(start_dates)
+        for budget, start_date, plan, end_date, total_duration, stage_end_dates in table['rows']:
+            expected = system.process_input(work_type.value, budget, start_date, 18, holidays)
+            assert table['plans'][plan]['procurement_type'] == expected['procurement_type']
+            assert stage_end_dates == [stage['end_date'] for stage in expected['stages']]
+            assert end_date == expected['stages'][-1]['end_date']
+            assert total_duration == expected['total_duration']
+
+def test_stage_conditions_skip_apply_and_reduce():
+    calculator = ProcurementCalculator()
+    input_data = ProcurementInput(WorkType.GENERAL_WORK, 50000, datetime.date(2024, 6, 2), 6, [])
+    result = dataclasses.replace(
+        calculator.calculate(input_data),
+        procurement_type=ProcurementType.LIMITED_COMPETITION,
+        announcement_period="10 أيام", review_period=0, final_guarantee="5%"
+    )
+    limited = [ProcurementType.LIMITED_COMPETITION.name]
+    assert calculator.check_stage_conditions(
+        {"name": "s", "skip_conditions": [{"key": "procurement_type", "values": limited}]}, result, input_data
+    )[0] is False
+    assert calculator.check_stage_conditions(
+        {"name": "s", "apply_conditions": [{"key": "procurement_type", "values": ["DIRECT_PURCHASE"]}]}, result, input_data
+    )[0] is False
+    assert calculator.check_stage_conditions(
+        {"name": "s", "duration_key": "review_period", "fallback_key": "announcement_period"}, result, input_data
+    ) == (True, 10, "")
+    assert calculator.check_stage_conditions({"name": "s", "duration": 20, "reduce_conditions": [
+        {"key": "budget", "condition": "less_than", "value": 100000, "reduce_to": 5, "notes": "budget"},
+        {"key": "procurement_type", "values": limited, "reduce_by": 2, "notes": "type"},
+        {"key": "final_guarantee", "values": ["10%"], "reduce_to": 1},
+    ]}, result, input_data) == (True, 3, "type")
+
+def test_compiled_stage_rules_match_stage_by_stage_checks():
+    calculator = ProcurementCalculator()
+    rules = StageRules(ProcurementConfig.STANDARD_STAGES)
+    for work_type in WorkType:
+        for budget in (50000, 299999, 300000, 750000, 30000000):
+            input_data = ProcurementInput(work_type, budget, datetime.date(2024, 6, 2), 6, [])
+            result = calculator.calculate(input_data)
+            expected = []
+            for stage_info in ProcurementConfig.STANDARD_STAGES:
+                include, duration, notes = calculator.check_stage_conditions(stage_info, result, input_data)
+                if include:
+                    expected.append((stage_info["name"], duration, notes))
+            assert [(stage.name, stage.duration) for stage in result.stages] == [(name, duration) for name, duration, _ in expected]
+            assert [(stage.name,) + stage.duration(result, input_data)
+                    for stage in rules.table[result.procurement_type]] == expected
+
+def load_json(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def test_stage_rules_file_matches_standard_stages():
+    assert load_json(ProcurementConfig.STAGE_RULES_FILE) == StageRules(ProcurementConfig.STANDARD_STAGES).to_json()
+
+def test_stage_rules_reload_when_file_changes(tmp_path):
+    rules_file = tmp_path / "stage_rules.json"
+    stages = load_json(ProcurementConfig.STAGE_RULES_FILE)
+    rules_file.write_text(json.dumps(stages), encoding='utf-8')
+
+    config = ProcurementConfig()
+    config.STAGE_RULES_FILE = str(rules_file)
+    calculator = ProcurementCalculator(config)
+    rules = calculator.stage_rules()
+    assert calculator.stage_rules() is rules
+
+    stages[2]["duration"] = 11
+    rules_file.write_text(json.dumps(stages), encoding='utf-8')
+    os.utime(rules_file, (rules.version + 10, rules.version + 10))
+    reloaded = calculator.stage_rules()
+    assert reloaded is not rules
+    evaluation = {stage.name: stage for stage in reloaded.table[ProcurementType.GENERAL_COMPETITION]}[stages[2]["name"]]
+    assert evaluation.duration(None, None) == (11, "")
+
+    # An invalid file keeps the last good rules
+    rules_file.write_text('[{"name": "x", "skip_conditions": [{"key": "procurement_type", "values": ["NOPE"]}]}]')
+    os.utime(rules_file, (rules.version + 20, rules.version + 20))
+    assert calculator.stage_rules() is reloaded
@@ -0,0 +1,35 @@
+import threading
+import time
+import src.registry as registry_module
+from src.registry import RAGSystemRegistry
+
+class FakeRAGSystem:
+    built = 0
+
+    def __init__(self, config, vector_handler=None):
+        time.sleep(0.05)
+        FakeRAGSystem.built += 1
+        self.config = config
+        self.vector_handler = vector_handler
+
+def test_concurrent_first_requests_build_once_and_share_the_collection(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    handlers = []
+    monkeypatch.setattr(registry_module, "ArabicRAGSystem", FakeRAGSystem)
+    monkeypatch.setattr(registry_module, "build_vector_handler", lambda config: handlers.append(config.lang) or object())
+    registry = RAGSystemRegistry()
+
+    results = []
+    threads = [threading.Thread(target=lambda lang=lang: results.append(registry.get(lang)))
+               for lang in ["ar", "sa", "en"] * 5]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert FakeRAGSystem.built == 3
+    assert len({id(system) for system in results}) == 3
+    assert registry.get("ar").vector_handler is registry.get("sa").vector_handler
+    assert registry.get("en").vector_handler is not registry.get("ar").vector_handler
+    assert sorted(handlers) in (["ar", "en"], ["en", "sa"])
+    assert registry.loaded() == {"systems": 3, "vector_stores": 2}
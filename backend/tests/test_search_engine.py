@@ -0,0 +1,78 @@
+import pytest
+from data.corpus import ArticleCorpus
+from data.arabic_text import normalize_arabic, strip_definite_article, tokenize
+from data.search_index import InvertedIndex
+from data.search_engine import SearchEngine
+
+@pytest.fixture(scope="module")
+def engine():
+    return SearchEngine()
+
+def test_normalize_arabic_folds_variants():
+    assert normalize_arabic("أإآٱ") == "اااا"
+    assert normalize_arabic("المنافسة") == "المنافسه"
+    assert normalize_arabic("مستشفى") == "مستشفي"
+    assert normalize_arabic("الْمُنَافَسَـــة") == "المنافسه"
+    assert normalize_arabic("المادة ٤٦") == "الماده 46"
+
+def test_strip_definite_article():
+    assert strip_definite_article("المنافسه") == "منافسه"
+    assert strip_definite_article("والمنافسه") == "منافسه"
+    assert strip_definite_article("ال") == "ال"
+    assert tokenize("Tender, Documents!") == ["tender", "documents"]
+
+def test_inverted_index_intersects_postings():
+    index = InvertedIndex()
+    index.add(0, {'content': "وثائق المنافسة العامة"})
+    index.add(1, {'content': "المنافسة المحدودة"})
+    index.add(2, {'content': "tender documents"})
+    assert index.lookup("منافسة") == {0, 1}
+    assert index.lookup("المنافسة العامة") == {0}
+    assert index.lookup("document") == {2}
+    assert index.lookup("...") is None
+
+@pytest.mark.parametrize("query", ["المنافسة", "tender documents", "contract", "ضمان", "(1)", "-"])
+@pytest.mark.parametrize("doc_type", ["Both", "System", "اللائحة"])
+def test_search_is_superset_of_substring_match(engine, query, doc_type):
+    expected = [
+        item for item in engine.documents
+        if query.lower() in item['content'].lower()
+        and engine._matches_type_filter(item['type'], doc_type)
+    ]
+    found = {id(item) for item in engine.search(query, doc_type)}
+    assert all(id(item) in found for item in expected)
+
+def test_bm25_field_boosts_rank_keyword_matches_first():
+    index = InvertedIndex(field_boosts={'content': 1.0, 'keywords': 2.0})
+    index.add(0, {'content': "ضمان بنكي", 'keywords': ""})
+    index.add(1, {'content': "ضمان بنكي", 'keywords': "ضمان"})
+    index.add(2, {'content': "عقد", 'keywords': ""})
+    ranked = index.top_k("الضمان", index.lookup("الضمان"), 10)
+    assert [doc_id for doc_id, _ in ranked] == [1, 0]
+
+def test_search_ranked_pages_cover_all_matches(engine):
+    matches = engine.search("المنافسة")
+    first = engine.search_ranked("المنافسة", page=1, page_size=10)
+    assert first['total_count'] == len(matches)
+    assert len(first['results']) == 10
+    scores = [result['relevance'] for result in first['results']]
+    assert scores == sorted(scores, reverse=True)
+
+    seen = []
+    page = 1
+    while True:
+        result = engine.search_ranked("المنافسة", page=page, page_size=25)
+        if not result['results']:
+            break
+        seen.extend((item['number'], item['type']) for item in result['results'])
+        page += 1
+    assert sorted(seen, key=str) == sorted(((item['number'], item['type']) for item in matches), key=str)
+
+def test_corpus_shards_resolve_arabic_and_english_types(engine):
+    corpus = engine.corpus
+    assert corpus.ids_for_type("Both") is None
+    assert corpus.ids_for_type("اللائحة") == corpus.ids_for_type("Regulation")
+    assert corpus.ids_for_type("Unknown") == frozenset()
+    regulation_ids = corpus.ids_for_type("Regulation")
+    assert all(ArticleCorpus.canonical_type(engine.documents[i]['type']) == "Regulation" for i in regulation_ids)
+    assert all(a['type'] == "اللائحة" for a in corpus.articles_by_number('ar', 'Regulation').values())
@@ -412,6 +412,9 @@ export const ar = {
     references: 'المراجع',
     searching: 'جاري البحث...',
     loadingMore: 'جاري تحميل المزيد من النتائج...',
+    previousPage: 'السابق',
+    nextPage: 'التالي',
+    pageOf: 'الصفحة {page} من {total}',
     filters: {
       title: 'عوامل التصفية',
       clearAll: 'مسح جميع عوامل التصفية',
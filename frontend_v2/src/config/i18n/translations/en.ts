@@ -300,6 +300,9 @@ export const en = {
     references: 'References',
     searching: 'Searching...',
     loadingMore: 'Loading more results...',
+    previousPage: 'Previous',
+    nextPage: 'Next',
+    pageOf: 'Page {page} of {total}',
     filters: {
       title: 'Search Filters',
       clearAll: 'Clear all filters',
@@ -7,10 +7,9 @@ import { JourneyResource } from '@/types/journey';
 import { Card, CardContent } from '@/components/ui/card';
 import { Button } from '@/components/ui/button';
 import { 
-  useResourceView, 
   useResourceDownload,
   downloadResource,
-  openResourceInNewTab
+  getResourceViewUrl
 } from '@/hooks/api/useJourney';
 import LoadingSpinner from '@/components/ui/loading-spinner';
 
@@ -23,10 +22,8 @@ interface ResourceCardProps {
 
 export function ResourceCard({ resource, levelId, isExpanded, onToggle }: ResourceCardProps) {
   const { t, direction } = useLanguage();
-  const [isViewing, setIsViewing] = useState(false);
   const [isDownloading, setIsDownloading] = useState(false);
   
-  const viewMutation = useResourceView();
   const downloadMutation = useResourceDownload();
 
   const formatFileSize = (bytes: number) => {
@@ -44,24 +41,9 @@ export function ResourceCard({ resource, levelId, isExpanded, onToggle }: Resour
     });
   };
 
-  const handleView = async () => {
-    try {
-      setIsViewing(true);
-      const result = await viewMutation.mutateAsync({ levelId, resourceId: resource.id });
-      
-      // If the response contains base64 content and mimetype, display it
-      if (result.content && result.mimeType) {
-        const blob = new Blob(
-          [Uint8Array.from(atob(result.content), c => c.charCodeAt(0))], 
-          { type: result.mimeType }
-        );
-        openResourceInNewTab(blob, result.mimeType);
-      }
-    } catch (error) {
-      console.error('Error viewing resource:', error);
-    } finally {
-      setIsViewing(false);
-    }
+  const handleView = () => {
+    // Open the streamed resource directly instead of downloading it into a blob first
+    window.open(getResourceViewUrl(levelId, resource.id), '_blank');
   };
 
   const handleDownload = async () => {
@@ -148,13 +130,8 @@ export function ResourceCard({ resource, levelId, isExpanded, onToggle }: Resour
                     variant="outline"
                     size="sm"
                     onClick={handleView}
-                    disabled={isViewing}
                   >
-                    {isViewing ? (
-                      <LoadingSpinner size="sm" className="mr-2" />
-                    ) : (
-                      <Eye className="w-4 h-4 mr-2" />
-                    )}
+                    <Eye className="w-4 h-4 mr-2" />
                     {t('journey.viewResource')}
                   </Button>
                   <Button
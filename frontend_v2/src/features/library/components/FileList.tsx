@@ -1,9 +1,11 @@
 // src/features/library/components/FileList.tsx
+import { useState } from "react";
 import { Folder, File, Download, Eye } from "lucide-react";
 import { useLanguage } from "@/hooks/useLanguage";
 import { Card } from "@/components/ui/card";
 import { Button } from "@/components/ui/button";
 import { FileOrFolder } from "@/types";
+import { getThumbnailUrl } from "@/hooks/api/useLibrary";
 
 interface FileListProps {
   items: FileOrFolder[];
@@ -11,7 +13,6 @@ interface FileListProps {
   onFileDownload: (file: FileOrFolder) => void;
   onFileView: (file: FileOrFolder) => void;
   downloadingFiles: Set<string>;
-  viewingFiles: Set<string>;
 }
 
 export function FileList({
@@ -20,9 +21,10 @@ export function FileList({
   onFileDownload,
   onFileView,
   downloadingFiles,
-  viewingFiles,
 }: FileListProps) {
   const { t } = useLanguage();
+  // Thumbnails that failed or are still rendering (503) fall back to the file icon
+  const [failedThumbnails, setFailedThumbnails] = useState<Set<string>>(new Set());
   
   console.log('FileList items:', items); // Debug log
 
@@ -47,6 +49,14 @@ export function FileList({
               <div className="flex items-center gap-3">
                 {isFolder(item) ? (
                   <Folder className="flex-shrink-0 text-yellow-400" size={24} />
+                ) : item.thumbnailUrl && !failedThumbnails.has(item.id) ? (
+                  <img
+                    src={getThumbnailUrl(item)}
+                    alt=""
+                    loading="lazy"
+                    onError={() => setFailedThumbnails((prev) => new Set(prev).add(item.id))}
+                    className="flex-shrink-0 w-12 h-16 object-cover rounded bg-slate-700"
+                  />
                 ) : (
                   <File className="flex-shrink-0 text-blue-400" size={24} />
                 )}
@@ -85,13 +95,8 @@ export function FileList({
                     <Button
                       variant="outline"
                       onClick={() => onFileView(item)}
-                      disabled={viewingFiles.has(item.id)}
                     >
-                      {viewingFiles.has(item.id) ? (
-                        <span>{t('library.loading')}</span>
-                      ) : (
-                        <span>{t('library.openButton')}</span>
-                      )}
+                      <span>{t('library.openButton')}</span>
                     </Button>
                   </>
                 )}
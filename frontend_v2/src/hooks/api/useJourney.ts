@@ -26,14 +26,9 @@ export function useJourneyLevelResources(levelId: string) {
   });
 }
 
-// View resource
-export function useResourceView() {
-  return useMutation({
-    mutationFn: async ({ levelId, resourceId }: { levelId: string, resourceId: string }) => {
-      const response = await api.get(`/journey/levels/${levelId}/resources/${resourceId}/view`);
-      return response.data;
-    },
-  });
+// URL streaming a resource's bytes for inline viewing
+export function getResourceViewUrl(levelId: string, resourceId: string): string {
+  return `${api.defaults.baseURL}/journey/levels/${encodeURIComponent(levelId)}/resources/${encodeURIComponent(resourceId)}/content`;
 }
 
 // Download resource
@@ -60,12 +55,3 @@ export function downloadResource(blob: Blob, filename: string) {
   document.body.removeChild(link);
   URL.revokeObjectURL(url);
 }
-
-// Helper for opening in new tab
-export function openResourceInNewTab(blob: Blob, mimeType: string) {
-  const url = URL.createObjectURL(blob);
-  const newWindow = window.open(url, '_blank');
-  if (newWindow) {
-    newWindow.onload = () => URL.revokeObjectURL(url);
-  }
-}
\ No newline at end of file
@@ -3,11 +3,6 @@ import { useQuery, useMutation } from '@tanstack/react-query';
 import { api } from '@/lib/axios';
 import { FileOrFolder } from '@/types';
 
-interface ViewFileResponse {
-  content: string;
-  mimeType: string;
-}
-
 // List folder contents
 export function useLibrary(folderId: string) {
   return useQuery({
@@ -48,40 +43,17 @@ export function useFileDownload() {
   });
 }
 
-// View file
-export function useFileView() {
-  return useMutation({
-    mutationFn: async (fileId: string) => {
-      const response = await api.post<ViewFileResponse>('/library/view-file', {
-        file_id: fileId
-      });
-      return response.data;
-    },
-  });
-}
-
-// Helper function to convert base64 to blob
-export function base64ToBlob(base64Content: string, mimeType: string): Blob {
-  const binaryContent = atob(base64Content);
-  const bytes = new Uint8Array(binaryContent.length);
-  
-  for (let i = 0; i < binaryContent.length; i++) {
-    bytes[i] = binaryContent.charCodeAt(i);
-  }
-  
-  return new Blob([bytes], { type: mimeType });
+// URL streaming a file's bytes; viewers fetch it directly (with Range requests for PDFs)
+export function getFileViewUrl(fileId: string): string {
+  const path = fileId.split(/[\\/]/).map(encodeURIComponent).join('/');
+  return `${api.defaults.baseURL}/library/files/${path}`;
 }
 
-// Helper function to open file in new tab
-export function openFileInNewTab(blob: Blob): void {
-  const blobUrl = URL.createObjectURL(blob);
-  const viewerWindow = window.open(blobUrl, '_blank');
-  
-  if (viewerWindow) {
-    viewerWindow.onload = () => {
-      URL.revokeObjectURL(blobUrl);
-    };
-  }
+// URL of a file's WebP thumbnail, on the API origin like getFileViewUrl; the version
+// parameter lets the browser cache it until the file changes
+export function getThumbnailUrl(file: FileOrFolder): string {
+  const path = file.id.split(/[\\/]/).map(encodeURIComponent).join('/');
+  return `${api.defaults.baseURL}/library/thumbnails/${path}?v=${encodeURIComponent(file.modifiedTime)}`;
 }
 
 // Helper function for handling file downloads
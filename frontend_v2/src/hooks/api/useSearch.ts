@@ -1,20 +1,24 @@
 // src/hooks/api/useSearch.ts
 import { useQuery } from '@tanstack/react-query';
 import { api } from '@/lib/axios';
-import { ResourceType, SearchResource } from '@/types';
+import { ResourceType, SearchResponse } from '@/types';
 
-export function useSearch(query: string, type?: ResourceType) {
+export const SEARCH_PAGE_SIZE = 10;
+
+export function useSearch(query: string, type?: ResourceType, page = 1) {
   return useQuery({
-    queryKey: ['search', query, type],
+    queryKey: ['search', query, type, page],
     queryFn: async () => {
-      const response = await api.get('/search', {
+      const response = await api.get<SearchResponse>('/search', {
         params: {
           query: query.trim(),
-          type: type !== 'Both' ? type : undefined
+          type: type !== 'Both' ? type : undefined,
+          page,
+          page_size: SEARCH_PAGE_SIZE
         }
       });
       return response.data;
     },
-    enabled: false,
+    enabled: !!query.trim(),
   });
-}
\ No newline at end of file
+}
@@ -13,10 +13,8 @@ import {
     useLibrary, 
     useLibrarySearch, 
     useFileDownload, 
-    useFileView,
     downloadFile ,
-    base64ToBlob,
-  openFileInNewTab
+    getFileViewUrl
   } from '@/hooks/api/useLibrary';
 
 export default function LibraryPage() {
@@ -25,7 +23,6 @@ export default function LibraryPage() {
   const [query, setQuery] = useState('');
   const [isDeepSearch, setIsDeepSearch] = useState(false);
   const [downloadingFiles, setDownloadingFiles] = useState<Set<string>>(new Set());
-  const [viewingFiles, setViewingFiles] = useState<Set<string>>(new Set());
   const [breadcrumbs, setBreadcrumbs] = useState([
     { id: "", name: t('library.root') }
   ]);
@@ -47,7 +44,6 @@ export default function LibraryPage() {
   } = useLibrarySearch(query, isDeepSearch);
 
   const fileDownload = useFileDownload();
-  const fileView = useFileView();
 
   // Update items when folder data changes
   useEffect(() => {
@@ -98,25 +94,11 @@ export default function LibraryPage() {
     }
   };
 
-  const handleFileView = async (file: FileOrFolder) => {
-    try {
-      setViewingFiles(prev => new Set(prev).add(file.id));
-      const data = await fileView.mutateAsync(file.id);
-      
-      // Convert base64 to blob with correct mime type
-      const blob = base64ToBlob(data.content, data.mimeType);
-      
-      // Open in new tab
-      openFileInNewTab(blob);
-    } catch (error) {
-      console.error('View error:', error);
+  const handleFileView = (file: FileOrFolder) => {
+    // Open the streamed file directly instead of downloading it into a blob first
+    const viewerWindow = window.open(getFileViewUrl(file.id), '_blank');
+    if (!viewerWindow) {
       alert(t('library.viewError'));
-    } finally {
-      setViewingFiles(prev => {
-        const newSet = new Set(prev);
-        newSet.delete(file.id);
-        return newSet;
-      });
     }
   };
 
@@ -164,7 +146,6 @@ export default function LibraryPage() {
               onFileDownload={handleFileDownload}
               onFileView={handleFileView}
               downloadingFiles={downloadingFiles}
-              viewingFiles={viewingFiles}
             />
           ) : (
             <div className="text-center py-12 text-gray-400">
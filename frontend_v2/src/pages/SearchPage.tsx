@@ -3,10 +3,11 @@
 
 import { useState } from 'react';
 import { useLanguage } from '@/hooks/useLanguage';
-import { useSearch } from '@/hooks/api/useSearch';
+import { useSearch, SEARCH_PAGE_SIZE } from '@/hooks/api/useSearch';
 import { SearchResults } from '@/features/search/components/SearchResults';
 import { ResourceType } from '@/types';
 import { Alert, AlertDescription } from '@/components/ui/alert';
+import { Button } from '@/components/ui/button';
 import { AlertCircle } from 'lucide-react';
 import LoadingSpinner from '@/components/ui/loading-spinner';
 import { SearchTopBar } from '@/features/search/components/SearchTopBar';
@@ -16,6 +17,7 @@ export default function SearchPage() {
   const { t } = useLanguage();
   
   const [searchParams, setSearchParams] = useState({ query: '', type: 'Both' as ResourceType });
+  const [page, setPage] = useState(1);
   
   const {
     data: results,
@@ -23,14 +25,24 @@ export default function SearchPage() {
     error,
     refetch,
     isFetching,
-  } = useSearch(searchParams.query, searchParams.type);
+  } = useSearch(searchParams.query, searchParams.type, page);
+
+  const totalPages = results ? Math.ceil(results.total_count / SEARCH_PAGE_SIZE) : 0;
 
   const handleSearch = (newQuery: string, newType: ResourceType) => {
-    setSearchParams({ query: newQuery, type: newType });
     trackEvent({ event: 'search', search_term: newQuery });
-    setTimeout(() => {
-        refetch();
-    }, 0);
+    if (newQuery === searchParams.query && newType === searchParams.type && page === 1) {
+      // Same query key: a new search has to refetch explicitly
+      refetch();
+      return;
+    }
+    setSearchParams({ query: newQuery, type: newType });
+    setPage(1);
+  };
+
+  const goToPage = (newPage: number) => {
+    setPage(newPage);
+    document.querySelector('main')?.scrollTo({ top: 0 });
   };
 
   return (
@@ -50,10 +62,25 @@ export default function SearchPage() {
               <AlertDescription>{error?.message || t('common.error')}</AlertDescription>
             </Alert>
           ) : results?.data && results.data.length > 0 ? (
-            <SearchResults
-              results={results.data}
-              searchQuery={searchParams.query}
-            />
+            <>
+              <SearchResults
+                results={results.data}
+                searchQuery={searchParams.query}
+              />
+              {totalPages > 1 && (
+                <div className="flex items-center justify-center gap-4 mt-8">
+                  <Button variant="outline" onClick={() => goToPage(page - 1)} disabled={page <= 1}>
+                    {t('search.previousPage')}
+                  </Button>
+                  <span className="text-sm text-gray-500">
+                    {t('search.pageOf', { page: String(page), total: String(totalPages) })}
+                  </span>
+                  <Button variant="outline" onClick={() => goToPage(page + 1)} disabled={page >= totalPages}>
+                    {t('search.nextPage')}
+                  </Button>
+                </div>
+              )}
+            </>
           ) : searchParams.query ? (
             <div className="text-center py-20 text-gray-500">
               <h3 className="text-lg font-semibold">{t('search.noResults')}</h3>
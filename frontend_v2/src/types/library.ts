@@ -5,4 +5,5 @@ export interface FileOrFolder {
     name: string;
     createdTime: string;
     modifiedTime: string;
+    thumbnailUrl?: string;
   }
\ No newline at end of file
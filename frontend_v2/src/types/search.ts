@@ -28,4 +28,7 @@ export interface SearchParams {
 
 export interface SearchResponse {
   data: SearchResource[];
+  total_count: number;
+  page: number;
+  page_size: number;
 }
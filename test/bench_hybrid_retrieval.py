@@ -0,0 +1,109 @@
+"""
+Retrieval benchmark: dense-only Chroma search vs. the hybrid BM25 + dense
+retriever used by QAChainHandler.
+
+Every question of a fixed set has the article number that answers it. For
+both retrievers the script reports hit rate@k (the article is among the k
+retrieved chunks), MRR and the per-question latency.
+
+The configured Arabic collection is used. When it is empty, a temporary
+collection with one chunk per article of data/final_ar.json is built first
+with the configured embeddings (OPENAI_API_KEY / RAG_EMBEDDING_MODEL).
+--fake-embeddings uses deterministic random vectors instead, which exercises
+the code paths without an API key (dense quality is then meaningless).
+
+Run from the repository root:
+    python test/bench_hybrid_retrieval.py [--fake-embeddings]
+"""
+
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+sys.path.insert(0, BACKEND_DIR)
+os.chdir(BACKEND_DIR)
+
+from langchain_community.vectorstores import Chroma
+from data.corpus import ARTICLE_FILES
+from src.embeddings import get_embeddings
+from src.hybrid_retriever import HybridRetriever
+from src.qa_chain import RETRIEVAL_K
+from src.templates import get_collection_name, get_persist_directory
+
+# (question, article number that answers it)
+QUESTIONS = [
+    ("ما نص المادة 46؟", 46),
+    ("ماذا تقول المادة (72) عن التأخير؟", 72),
+    ("المادة ٥١ من النظام", 51),
+    ("ما هي إجراءات فحص العروض واستبعاد العروض المخالفة؟", 46),
+    ("متى تلغى المنافسة؟", 51),
+    ("هل يجوز تعديل الأسعار بعد تقديم العرض؟", 40),
+    ("هل يجوز تجزئة المشتريات للوصول إلى صلاحيات الشراء المباشر؟", 26),
+    ("ما هي غرامة التأخير في تنفيذ العقد؟", 72),
+    ("متى يجب عرض العقود على الوزارة قبل التوقيع؟", 60),
+    ("كيف يتم بيع المنقولات بالمزايدة العامة؟", 80),
+    ("من ينظر في التظلمات من قرارات الجهة الحكومية؟", 86),
+    ("هل يمكن مراعاة احتياجات ذوي الإعاقة في المواصفات الفنية؟", 22),
+]
+
+
+def build_temporary_collection(embeddings) -> Chroma:
+    with open(ARTICLE_FILES['ar'], encoding='utf-8') as f:
+        articles = json.load(f)
+    texts, metadatas = [], []
+    for article in articles:
+        texts.append(article['content'])
+        metadatas.append({
+            "article_number": article['number'],
+            "chapter_number": article['chapter']['number'],
+            "chapter_name": article['chapter']['name'],
+            "section_number": article['section']['number'],
+            "section_name": article['section']['name'],
+            "summary": article['summary']
+        })
+    print(f"Embedding {len(texts)} articles into a temporary collection...")
+    return Chroma.from_texts(texts, embeddings, metadatas=metadatas, persist_directory=tempfile.mkdtemp(),
+                             collection_name=get_collection_name('ar'))
+
+
+def evaluate(name, retrieve):
+    retrieve(QUESTIONS[0][0])  # warm-up (builds the lexical index once)
+    hits, reciprocal_ranks, timings = 0, [], []
+    for question, article_number in QUESTIONS:
+        start = time.perf_counter()
+        documents = retrieve(question)
+        timings.append((time.perf_counter() - start) * 1000)
+        numbers = [int(doc.metadata.get('article_number', -1)) for doc in documents]
+        if article_number in numbers:
+            hits += 1
+            reciprocal_ranks.append(1 / (numbers.index(article_number) + 1))
+        else:
+            reciprocal_ranks.append(0.0)
+    timings.sort()
+    print(f"{name:<8} hit@{RETRIEVAL_K} {hits / len(QUESTIONS):5.2f}   MRR {statistics.mean(reciprocal_ranks):5.2f}   "
+          f"latency mean {statistics.mean(timings):8.2f} ms   p95 {timings[int(len(timings) * 0.95)]:8.2f} ms")
+
+
+if __name__ == "__main__":
+    if '--fake-embeddings' in sys.argv:
+        from langchain_community.embeddings import DeterministicFakeEmbedding
+        vectorstore = build_temporary_collection(DeterministicFakeEmbedding(size=256))
+    else:
+        from src.config import load_config
+        config = load_config('ar')
+        embeddings = get_embeddings(config.embedding_model, config.openai_api_key)
+        vectorstore = Chroma(
+            persist_directory=get_persist_directory('ar', config.embedding_model),
+            embedding_function=embeddings,
+            collection_name=get_collection_name('ar')
+        )
+        if vectorstore._collection.count() == 0:
+            vectorstore = build_temporary_collection(embeddings)
+
+    hybrid = HybridRetriever(vectorstore=vectorstore, k=RETRIEVAL_K)
+    evaluate("dense", lambda question: vectorstore.similarity_search(question, k=RETRIEVAL_K))
+    evaluate("hybrid", hybrid.invoke)
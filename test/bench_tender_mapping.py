@@ -0,0 +1,65 @@
+"""
+Microbenchmark for the tender-mapping calculation path.
+
+Compares the per-request latency of building a new ProcurementSystem (and
+re-parsing the articles JSON) on every call with the shared, cached system
+used by TenderMappingService.
+
+Run from the repository root:
+    python test/bench_tender_mapping.py
+"""
+
+import os
+import sys
+import time
+import statistics
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+sys.path.insert(0, BACKEND_DIR)
+os.chdir(BACKEND_DIR)
+
+from app.ProcurementCalculator import ProcurementSystem, WorkType
+from app.services.tender_mapping_service import TenderMappingService
+from data.corpus import ARTICLE_FILES
+
+ITERATIONS = 200
+
+REQUEST = {
+    "work_type": WorkType.EXCLUSIVE_WORK.value,
+    "budget": 750000,
+    "start_date": "2025-01-05",
+    "project_duration": 12,
+    "holidays": ["2025-01-12"]
+}
+
+
+def per_request_system(data):
+    """Previous behaviour: a new ProcurementSystem parses the articles file on every call"""
+    system = ProcurementSystem(articles_file=ARTICLE_FILES['ar'])
+    return system.process_input(
+        work_type=data["work_type"],
+        budget=float(data["budget"]),
+        start_date=data["start_date"],
+        project_duration=int(data["project_duration"]),
+        holidays=data["holidays"]
+    )
+
+
+def measure(name, fn):
+    fn(REQUEST)  # warm-up (builds the shared corpus / system once)
+    timings = []
+    for _ in range(ITERATIONS):
+        start = time.perf_counter()
+        fn(REQUEST)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    print(f"{name:<28} mean {statistics.mean(timings):8.3f} ms   "
+          f"p50 {timings[len(timings) // 2]:8.3f} ms   p95 {timings[int(len(timings) * 0.95)]:8.3f} ms")
+    return statistics.mean(timings)
+
+
+if __name__ == "__main__":
+    service = TenderMappingService()
+    before = measure("per-request ProcurementSystem", per_request_system)
+    after = measure("cached ProcurementSystem", service.calculate_procurement)
+    print(f"speed-up: {before / after:.1f}x over {ITERATIONS} requests")